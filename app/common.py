@@ -0,0 +1,263 @@
+# common.py
+# 서버/스크립트 공용 설정과 클라이언트 (임베딩/LLM/Qdrant)
+#  - emb / llm 은 동기(embed_query, invoke)·비동기(aembed_query, ainvoke) 모두 지원
+#  - Qdrant 는 동기 qdr / 비동기 aqdr
+#  - 클라이언트는 처음 사용할 때 생성 (get_emb/get_llm/get_qdrant/get_async_qdrant)
+#    import 시점에는 무거운 라이브러리 로드나 네트워크 호출이 없음
+#  - 기존 이름(from app.common import emb 등)도 그대로 동작 (접근 시 생성)
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient, AsyncQdrantClient
+
+load_dotenv()
+log = logging.getLogger(__name__)
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-4o-mini")
+QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+# 1이면 gRPC(6334) 사용: 벡터를 JSON 대신 protobuf로 주고받음
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "0") == "1"
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "32"))
+COLLECTION_NAME = os.getenv("COLLECTION_NAME", "questions")
+ROOT = Path(__file__).resolve().parents[1]
+
+# 임베딩 캐시 (EMBED_CACHE_PATH="" 이면 메모리만 사용)
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", str(ROOT / ".cache" / "embeddings.sqlite3"))
+EMBED_CACHE_MEMORY_ITEMS = int(os.getenv("EMBED_CACHE_MEMORY_ITEMS", "10000"))
+EMBED_CACHE_MAX_MB = int(os.getenv("EMBED_CACHE_MAX_MB", "512"))
+
+# 동시 질의 임베딩 묶음 처리 (EMBED_BATCH_MAX_WAIT_MS=0 이면 끔)
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "64"))
+
+# text-embedding-3-small = 1536차원
+EMBED_DIM = 1536
+
+# questions 컬렉션 저장 옵션 (생성 시 적용, 기존 컬렉션은 설정이 다르면 update_collection)
+#  - 양자화: none | scalar(int8, 원본의 1/4) | product(PQ, QDRANT_PQ_COMPRESSION 배 압축)
+#  - QDRANT_VECTORS_ON_DISK=1: 원본 float32 벡터는 디스크(mmap), RAM에는 양자화 벡터만
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "none")
+QDRANT_SCALAR_QUANTILE = float(os.getenv("QDRANT_SCALAR_QUANTILE", "0.99"))
+QDRANT_PQ_COMPRESSION = os.getenv("QDRANT_PQ_COMPRESSION", "x16")
+QDRANT_QUANT_ALWAYS_RAM = os.getenv("QDRANT_QUANT_ALWAYS_RAM", "1") == "1"
+QDRANT_VECTORS_ON_DISK = os.getenv("QDRANT_VECTORS_ON_DISK", "0") == "1"
+QDRANT_HNSW_M = int(os.getenv("QDRANT_HNSW_M", "16"))
+QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "100"))
+# 검색 시 양자화 점수로 limit*oversampling 개 후보를 고른 뒤 원본 벡터로 재채점(rescore)
+QDRANT_RESCORE = os.getenv("QDRANT_RESCORE", "1") == "1"
+QDRANT_OVERSAMPLING = float(os.getenv("QDRANT_OVERSAMPLING", "2.0"))
+# 위 컬렉션 설정은 생성 시에만 적용. 1이면 기존 컬렉션도 설정이 다를 때 갱신 (ingest_questions --reconfigure)
+QDRANT_RECONFIGURE = os.getenv("QDRANT_RECONFIGURE", "0") == "1"
+
+# 테스트/벤치마크에서 set_clients 로 교체한 클라이언트
+_overrides = {}
+
+
+def set_clients(**clients):
+    """
+    공용 클라이언트 교체 (가짜 임베딩/LLM, 인메모리 Qdrant 등)
+    예: set_clients(emb=FakeEmb(), qdr=QdrantClient(":memory:"))  /  set_clients(emb=None) → 기본값 복원
+    """
+    for name, client in clients.items():
+        if name not in _GETTERS:
+            raise TypeError(f"unknown client: {name}")
+        if client is None:
+            _overrides.pop(name, None)
+        else:
+            _overrides[name] = client
+
+
+@lru_cache(maxsize=None)
+def _default_emb():
+    from langchain_openai import OpenAIEmbeddings
+    from .embedding_cache import CachedEmbeddings, EmbeddingCache
+    inner = OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=OPENAI_API_KEY)
+    if EMBED_BATCH_MAX_WAIT_MS > 0:
+        from .embed_batcher import EmbedBatcher
+        # 캐시 미스인 질의만 짧은 시간 모아 한 번에 요청
+        inner = EmbedBatcher(inner, max_batch=EMBED_BATCH_MAX_SIZE, max_wait_ms=EMBED_BATCH_MAX_WAIT_MS)
+    return CachedEmbeddings(
+        inner,
+        model=EMBEDDING_MODEL,
+        cache=EmbeddingCache(
+            path=Path(EMBED_CACHE_PATH) if EMBED_CACHE_PATH else None,
+            max_memory_items=EMBED_CACHE_MEMORY_ITEMS,
+            max_disk_bytes=EMBED_CACHE_MAX_MB * 1024 * 1024,
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def _default_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=CHAT_MODEL, temperature=0, api_key=OPENAI_API_KEY)
+
+
+def get_emb():
+    return _overrides["emb"] if "emb" in _overrides else _default_emb()
+
+
+def get_llm():
+    return _overrides["llm"] if "llm" in _overrides else _default_llm()
+
+
+def _qdrant_kwargs(prefer_grpc: bool) -> dict:
+    import httpx
+    return dict(
+        host=QDRANT_HOST, port=QDRANT_PORT, grpc_port=QDRANT_GRPC_PORT, prefer_grpc=prefer_grpc,
+        # qdrant-client는 localhost 접속 시 keep-alive를 끄므로 커넥션 풀을 명시
+        limits=httpx.Limits(max_connections=QDRANT_POOL_SIZE,
+                            max_keepalive_connections=QDRANT_POOL_SIZE, keepalive_expiry=30),
+        grpc_options={"grpc.keepalive_time_ms": 30_000, "grpc.keepalive_timeout_ms": 10_000,
+                      "grpc.keepalive_permit_without_calls": 1},
+    )
+
+
+@lru_cache(maxsize=None)
+def _qdrant(prefer_grpc: bool) -> "QdrantClient":
+    from qdrant_client import QdrantClient
+    return QdrantClient(**_qdrant_kwargs(prefer_grpc))
+
+
+@lru_cache(maxsize=None)
+def _async_qdrant(prefer_grpc: bool) -> "AsyncQdrantClient":
+    from qdrant_client import AsyncQdrantClient
+    return AsyncQdrantClient(**_qdrant_kwargs(prefer_grpc))
+
+
+def get_qdrant(prefer_grpc: bool = None) -> "QdrantClient":
+    """프로세스 공용 Qdrant 클라이언트 (전송 방식별 1개, 커넥션 재사용)"""
+    if prefer_grpc is None and "qdr" in _overrides:
+        return _overrides["qdr"]
+    return _qdrant(QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc)
+
+
+def get_async_qdrant(prefer_grpc: bool = None) -> "AsyncQdrantClient":
+    """비동기 경로(/query 등)용: 이벤트 루프 하나로 다수 요청을 동시에 처리"""
+    if prefer_grpc is None and "aqdr" in _overrides:
+        return _overrides["aqdr"]
+    return _async_qdrant(QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc)
+
+
+_GETTERS = {"emb": get_emb, "llm": get_llm, "qdr": get_qdrant, "aqdr": get_async_qdrant}
+
+
+def __getattr__(name):
+    # 기존 모듈 속성(common.emb, common.qdr ...) 호환: 접근 시점에 생성
+    if name in _GETTERS:
+        return _GETTERS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def ensure_payload_indexes(client: "QdrantClient", collection: str = COLLECTION_NAME):
+    """필터에 쓰는 payload 필드 색인 (category: keyword). 이미 있으면 건너뜀"""
+    from qdrant_client.http import models as qm
+    schema = client.get_collection(collection).payload_schema or {}
+    if "category" not in schema:
+        client.create_payload_index(collection, field_name="category",
+                                    field_schema=qm.PayloadSchemaType.KEYWORD)
+
+
+def quantization_config(kind: str = None, quantile: float = None, compression: str = None, always_ram: bool = None):
+    """양자화 설정 (kind: none | scalar | product). none 이면 None"""
+    from qdrant_client.http import models as qm
+    kind = QDRANT_QUANTIZATION if kind is None else kind
+    always_ram = QDRANT_QUANT_ALWAYS_RAM if always_ram is None else always_ram
+    if kind == "none":
+        return None
+    if kind == "scalar":
+        return qm.ScalarQuantization(scalar=qm.ScalarQuantizationConfig(
+            type=qm.ScalarType.INT8, quantile=quantile or QDRANT_SCALAR_QUANTILE, always_ram=always_ram))
+    if kind == "product":
+        return qm.ProductQuantization(product=qm.ProductQuantizationConfig(
+            compression=qm.CompressionRatio(compression or QDRANT_PQ_COMPRESSION), always_ram=always_ram))
+    raise ValueError(f"unknown quantization: {kind} (none | scalar | product)")
+
+
+def collection_config(dim: int = EMBED_DIM, quantization: str = None, on_disk: bool = None,
+                      m: int = None, ef_construct: int = None, **quant_opts) -> dict:
+    """create_collection 인자 (값을 안 주면 QDRANT_* 환경 변수)"""
+    from qdrant_client.http import models as qm
+    return {
+        "vectors_config": qm.VectorParams(size=dim, distance=qm.Distance.COSINE,
+                                          on_disk=QDRANT_VECTORS_ON_DISK if on_disk is None else on_disk),
+        "hnsw_config": qm.HnswConfigDiff(m=QDRANT_HNSW_M if m is None else m,
+                                         ef_construct=QDRANT_HNSW_EF_CONSTRUCT if ef_construct is None else ef_construct),
+        "quantization_config": quantization_config(quantization, **quant_opts),
+    }
+
+
+def search_params(ef: int = 128, rescore: bool = None, oversampling: float = None):
+    """검색 파라미터 (양자화 컬렉션이면 재채점, 아니면 Qdrant가 양자화 옵션을 무시)"""
+    from qdrant_client.http import models as qm
+    return qm.SearchParams(hnsw_ef=ef, quantization=qm.QuantizationSearchParams(
+        rescore=QDRANT_RESCORE if rescore is None else rescore,
+        oversampling=oversampling or QDRANT_OVERSAMPLING))
+
+
+def collection_diff(client: "QdrantClient", collection: str, want: dict) -> dict:
+    """
+    기존 컬렉션의 HNSW / on_disk / 양자화 설정과 원하는 값의 차이
+    반환: {update_collection 인자 이름: (현재 값, 원하는 값, 인자 값)}. 같으면 {}
+    """
+    from qdrant_client.http import models as qm
+    cfg = client.get_collection(collection).config
+    diff = {}
+    hnsw = want["hnsw_config"]
+    if (cfg.hnsw_config.m, cfg.hnsw_config.ef_construct) != (hnsw.m, hnsw.ef_construct):
+        diff["hnsw_config"] = (f"m={cfg.hnsw_config.m}, ef_construct={cfg.hnsw_config.ef_construct}",
+                               f"m={hnsw.m}, ef_construct={hnsw.ef_construct}", hnsw)
+    vectors, on_disk = cfg.params.vectors, want["vectors_config"].on_disk
+    if isinstance(vectors, qm.VectorParams) and bool(vectors.on_disk) != bool(on_disk):
+        diff["vectors_config"] = (f"on_disk={bool(vectors.on_disk)}", f"on_disk={bool(on_disk)}",
+                                  {"": qm.VectorParamsDiff(on_disk=on_disk)})
+    quant = want["quantization_config"]
+    if quant != cfg.quantization_config:
+        diff["quantization_config"] = (cfg.quantization_config, quant,
+                                       quant if quant is not None else qm.Disabled.DISABLED)
+    return diff
+
+
+def ensure_collection(client: "QdrantClient" = None, reconfigure: bool = None):
+    """
+    컬렉션이 없으면 QDRANT_* 설정으로 생성. 이미 있으면 설정을 바꾸지 않고 차이만 로그로 남김
+    reconfigure=True (기본값 QDRANT_RECONFIGURE) 일 때만 기존 컬렉션 설정을 갱신
+    """
+    client = client or get_qdrant()
+    names = [c.name for c in client.get_collections().collections]
+    want = collection_config()
+    if COLLECTION_NAME not in names:
+        client.create_collection(collection_name=COLLECTION_NAME, **want)
+    else:
+        diff = collection_diff(client, COLLECTION_NAME, want)
+        reconfigure = QDRANT_RECONFIGURE if reconfigure is None else reconfigure
+        for name, (current, wanted, _) in diff.items():
+            log.warning("collection %s %s: %s -> %s%s", COLLECTION_NAME, name, current, wanted,
+                        "" if reconfigure else " (not applied; set QDRANT_RECONFIGURE=1 to update)")
+        if diff and reconfigure:
+            client.update_collection(COLLECTION_NAME, **{name: arg for name, (_, _, arg) in diff.items()})
+    ensure_payload_indexes(client)
+
+
+def normalize_categories(categories):
+    """카테고리 목록 정규화 (순서/중복/공백 무시) → 정렬된 tuple. 비어 있으면 None"""
+    return tuple(sorted({c.strip() for c in categories or () if c and c.strip()})) or None
+
+
+def category_filter(categories):
+    """카테고리 목록 → Qdrant 필터 (category ∈ categories). 비어 있으면 None"""
+    cats = normalize_categories(categories)
+    if not cats:
+        return None
+    from qdrant_client.http import models as qm
+    return qm.Filter(must=[qm.FieldCondition(key="category", match=qm.MatchAny(any=list(cats)))])
@@ -0,0 +1,84 @@
+# embed_batcher.py
+# 동시 aembed_query 요청 묶음 처리 (micro-batching)
+#  - max_wait_ms 동안 들어온 질의 텍스트를 모아 aembed_documents 1회로 요청
+#  - max_batch 개가 차면 기다리지 않고 바로 요청
+#  - 결과는 요청별 Future 로 돌려줌 (같은 텍스트는 배치 안에서 한 번만 임베딩)
+#  - 사용: CachedEmbeddings(EmbedBatcher(OpenAIEmbeddings(...)), ...) → 캐시 미스만 배치로 모임
+import asyncio
+import time
+from typing import List, Set, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from .metrics import COUNT_BUCKETS, counter, histogram
+
+BATCH_SIZE = histogram("qa_embed_batch_size", "Query texts per coalesced embedding request", buckets=COUNT_BUCKETS)
+QUEUE_DELAY = histogram("qa_embed_queue_delay_seconds", "Time a query waited for its embedding batch to be sent",
+                        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+BATCH_REQUESTS = counter("qa_embed_batch_requests_total", "Coalesced embedding requests by result", ("result",))
+
+
+class EmbedBatcher(Embeddings):
+    """
+    aembed_query 만 묶고, 나머지(embed_documents/embed_query/aembed_documents)는 inner 로 바로 전달합니다.
+    이벤트 루프 하나(서버 워커)에서 사용하는 것을 전제로 합니다.
+    """
+
+    def __init__(self, inner: Embeddings, max_batch: int = 64, max_wait_ms: float = 5.0):
+        self.inner = inner
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._timer = None
+        # 전송 중인 태스크 (이벤트 루프는 약한 참조만 가지므로 끝날 때까지 보관)
+        self._tasks: Set[asyncio.Task] = set()
+
+    # ---- 그대로 전달 ----
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.inner.aembed_documents(texts)
+
+    # ---- 묶음 처리 ----
+    async def aembed_query(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((text, fut, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        now = time.perf_counter()
+        for _, _, queued_at in batch:
+            QUEUE_DELAY.observe(now - queued_at)
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        BATCH_SIZE.observe(len(texts))
+        try:
+            vectors = dict(zip(texts, await self.inner.aembed_documents(texts)))
+        except Exception as e:
+            BATCH_REQUESTS.inc(result="error")
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        BATCH_REQUESTS.inc(result="ok")
+        for text, fut, _ in batch:
+            if not fut.done():  # 요청이 취소(클라이언트 연결 끊김)됐으면 건너뜀
+                fut.set_result(vectors[text])
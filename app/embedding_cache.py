@@ -0,0 +1,238 @@
+# embedding_cache.py
+# 임베딩 캐시: (모델, 정규화 텍스트 해시) → 벡터
+#  - 1단계: 프로세스 메모리 LRU
+#  - 2단계: SQLite 디스크 캐시 (float32 BLOB, 용량 초과 시 오래된 항목부터 제거)
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .common import EMBED_CACHE_PATH
+
+DEFAULT_CACHE_PATH = Path(EMBED_CACHE_PATH) if EMBED_CACHE_PATH else None
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 정규화: NFC + 앞뒤 공백 제거 + 연속 공백 1칸"""
+    return _WS.sub(" ", unicodedata.normalize("NFC", str(text))).strip()
+
+
+def cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """메모리 LRU + SQLite 2단 캐시. 스레드 안전."""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 max_memory_items: int = 10_000, max_disk_bytes: int = 512 * 1024 * 1024):
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        self._disk_bytes = 0
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vec BLOB NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)")
+            self._disk_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+
+    # ---------- 메모리 단계 ----------
+    def _mem_put(self, key: str, vec: np.ndarray):
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_memory_items:
+            self._mem.popitem(last=False)
+
+    # ---------- 조회/저장 ----------
+    def get_memory(self, keys: Sequence[str]):
+        """메모리 단계만 조회 → (찾은 벡터, 디스크에서 찾아야 할 키 목록)"""
+        found: Dict[str, np.ndarray] = {}
+        pending = []
+        with self._lock:
+            for k in keys:
+                vec = self._mem.get(k)
+                if vec is not None:
+                    self._mem.move_to_end(k)
+                    found[k] = vec
+                    self.stats["memory_hits"] += 1
+                else:
+                    pending.append(k)
+        return found, pending
+
+    def get_disk(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """디스크 단계 조회 (찾은 항목은 메모리에도 올림). 블로킹 I/O"""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            if keys and self._db is not None:
+                now = time.time()
+                for i in range(0, len(keys), 500):
+                    part = keys[i:i + 500]
+                    marks = ",".join("?" * len(part))
+                    rows = self._db.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", part).fetchall()
+                    for k, blob in rows:
+                        vec = np.frombuffer(blob, dtype=np.float32)
+                        found[k] = vec
+                        self._mem_put(k, vec)
+                    if rows:
+                        self._db.executemany("UPDATE embeddings SET last_access=? WHERE key=?",
+                                             [(now, k) for k, _ in rows])
+                self._db.commit()
+                self.stats["disk_hits"] += sum(1 for k in keys if k in found)
+            self.stats["misses"] += sum(1 for k in keys if k not in found)
+        return found
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found, pending = self.get_memory(keys)
+        if pending:
+            found.update(self.get_disk(pending))
+        return found
+
+    def put_memory(self, items: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+        """메모리 단계에만 저장. 반환값을 put_disk()에 넘김"""
+        vecs = {k: np.asarray(v, dtype=np.float32) for k, v in items.items()}
+        with self._lock:
+            for k, vec in vecs.items():
+                self._mem_put(k, vec)
+        return vecs
+
+    def put_disk(self, vecs: Dict[str, np.ndarray]):
+        """디스크 단계 저장. 블로킹 I/O"""
+        if not vecs or self._db is None:
+            return
+        with self._lock:
+            now = time.time()
+            rows = [(k, vec.shape[0], vec.tobytes(), now) for k, vec in vecs.items()]
+            # 이미 있던 키는 교체되므로 기존 크기를 빼고 더함
+            keys, replaced = list(vecs), 0
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                marks = ",".join("?" * len(part))
+                replaced += self._db.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings WHERE key IN ({marks})",
+                    part).fetchone()[0]
+            self._db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._disk_bytes += sum(len(r[2]) for r in rows) - replaced
+            self._evict()
+            self._db.commit()
+
+    def put_many(self, items: Dict[str, Sequence[float]]):
+        if items:
+            self.put_disk(self.put_memory(items))
+
+    def _evict(self):
+        """디스크 용량 초과 시 last_access가 오래된 항목부터 10%씩 여유 있게 제거"""
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        self._disk_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+        target = int(self.max_disk_bytes * 0.9)
+        freed, victims = 0, []
+        for k, size in self._db.execute(
+                "SELECT key, LENGTH(vec) FROM embeddings ORDER BY last_access"):
+            if self._disk_bytes - freed <= target:
+                break
+            victims.append((k,))
+            freed += size
+        self._db.executemany("DELETE FROM embeddings WHERE key=?", victims)
+        self._disk_bytes -= freed
+        self.stats["evictions"] += len(victims)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = total - self.stats["misses"]
+            return {**self.stats, "hit_rate": hits / total if total else 0.0,
+                    "memory_items": len(self._mem), "disk_bytes": self._disk_bytes}
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    기존 임베딩 객체(OpenAIEmbeddings 등)를 감싸 캐시를 적용합니다.
+    emb 자리에 그대로 바꿔 끼울 수 있습니다 (embed_query / embed_documents / a* 버전).
+    """
+
+    def __init__(self, inner: Embeddings, model: str, cache: Optional[EmbeddingCache] = None):
+        self.inner = inner
+        self.model = model
+        self.cache = cache if cache is not None else EmbeddingCache()
+
+    def _keys(self, texts: List[str]):
+        return [cache_key(self.model, t) for t in texts]
+
+    @staticmethod
+    def _missing(keys, texts, found) -> Dict[str, str]:
+        # 배치 내 중복 텍스트는 한 번만 요청
+        missing: Dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in found and k not in missing:
+                missing[k] = t
+        return missing
+
+    def _lookup(self, texts: List[str]):
+        keys = self._keys(texts)
+        found = self.cache.get_many(keys)
+        return keys, found, self._missing(keys, texts, found)
+
+    async def _alookup(self, texts: List[str]):
+        # 메모리 LRU는 바로 조회하고, SQLite 조회만 스레드에서 실행 (이벤트 루프 블로킹 방지)
+        keys = self._keys(texts)
+        found, pending = self.cache.get_memory(keys)
+        if pending:
+            found.update(await asyncio.to_thread(self.cache.get_disk, pending))
+        return keys, found, self._missing(keys, texts, found)
+
+    def _finish(self, keys, found, missing, vectors) -> List[List[float]]:
+        new = dict(zip(missing.keys(), vectors))
+        self.cache.put_many(new)
+        found.update({k: np.asarray(v, dtype=np.float32) for k, v in new.items()})
+        return [found[k].tolist() for k in keys]
+
+    async def _afinish(self, keys, found, missing, vectors) -> List[List[float]]:
+        new = self.cache.put_memory(dict(zip(missing.keys(), vectors)))
+        if new:
+            await asyncio.to_thread(self.cache.put_disk, new)
+        found.update(new)
+        return [found[k].tolist() for k in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._lookup(list(texts))
+        vectors = self.inner.embed_documents(list(missing.values())) if missing else []
+        return self._finish(keys, found, missing, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._lookup([text])
+        vectors = [self.inner.embed_query(text)] if missing else []
+        return self._finish(keys, found, missing, vectors)[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = await self._alookup(list(texts))
+        vectors = await self.inner.aembed_documents(list(missing.values())) if missing else []
+        return await self._afinish(keys, found, missing, vectors)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, found, missing = await self._alookup([text])
+        vectors = [await self.inner.aembed_query(text)] if missing else []
+        return (await self._afinish(keys, found, missing, vectors))[0]
@@ -0,0 +1,87 @@
+# ingest.py
+# 질문 적재 공용 유틸 (CLI 적재 스크립트 / API 서버에서 함께 사용)
+#  - 포인트 ID는 (카테고리, 정규화 질문) 해시로 결정 → 재적재해도 중복이 생기지 않음
+#  - 이미 있는 ID는 임베딩을 생략 (payload만 다르면 payload만 갱신)
+import uuid
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+import pandas as pd
+
+from .embedding_cache import normalize_text
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+
+REQUIRED_COLUMNS = {"question", "category"}
+
+# 고정 네임스페이스 (바꾸면 기존 포인트와 ID가 달라짐)
+POINT_ID_NAMESPACE = uuid.UUID("6f1c1f4e-8a53-4c1e-9d0b-5b7a3f2e4c10")
+
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """전처리(공백 제거, 결측 제거). 컬럼: question, category"""
+    df = df.copy()
+    df["question"] = df["question"].astype(str).str.strip()
+    df["category"] = df["category"].astype(str).str.strip()
+    return df[df["question"] != ""].dropna(subset=["question"])
+
+
+def point_id(question: str, category: str) -> str:
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{normalize_text(category)}\x1f{normalize_text(question)}"))
+
+
+def _stage(timer, name: str):
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+def upsert_questions(client: "QdrantClient", collection: str, questions: Sequence[str],
+                     cats: Sequence[str], emb, timer=None) -> Dict[str, int]:
+    """
+    질문 배치를 멱등하게 적재합니다.
+    반환: {"inserted": 신규(임베딩함), "updated": payload만 갱신, "skipped": 변경 없음/배치 내 중복}
+    timer: app.metrics.StageTimer (lookup / embed / upsert 단계 시간 기록, 선택)
+    """
+    from qdrant_client.http import models as qm  # import 비용이 커서 실제 적재 시점에 로드
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    batch: Dict[str, dict] = {}
+    for q, c in zip(questions, cats):
+        pid = point_id(q, c)
+        if pid in batch:
+            counts["skipped"] += 1
+            continue
+        batch[pid] = {"question": q, "category": c}
+    if not batch:
+        return counts
+
+    with _stage(timer, "lookup"):
+        existing = {
+            str(p.id): p.payload
+            for p in client.retrieve(collection_name=collection, ids=list(batch),
+                                     with_payload=True, with_vectors=False)
+        }
+
+    changed: List[qm.SetPayloadOperation] = []
+    new_ids = []
+    for pid, payload in batch.items():
+        if pid not in existing:
+            new_ids.append(pid)
+        elif existing[pid] != payload:
+            changed.append(qm.SetPayloadOperation(set_payload=qm.SetPayload(payload=payload, points=[pid])))
+        else:
+            counts["skipped"] += 1
+
+    if changed:
+        with _stage(timer, "upsert"):
+            client.batch_update_points(collection_name=collection, update_operations=changed)
+        counts["updated"] = len(changed)
+    if new_ids:
+        with _stage(timer, "embed"):
+            vectors = emb.embed_documents([batch[pid]["question"] for pid in new_ids])
+        with _stage(timer, "upsert"):
+            client.upsert(collection_name=collection, points=[
+                qm.PointStruct(id=pid, vector=vec, payload=batch[pid])
+                for pid, vec in zip(new_ids, vectors)
+            ])
+        counts["inserted"] = len(new_ids)
+    return counts
@@ -1,71 +1,130 @@
 # ingest_questions.py
-import os, uuid
-import pandas as pd
+# 실행: 레포 루트에서 python -m app.ingest_questions [--batch-size 256 --concurrency 4 --restart]
+#  - CSV를 batch-size 행씩 스트리밍으로 읽고
+#  - 배치 단위 embed_documents 요청을 최대 concurrency개까지 동시에 보내며
+#  - 완료된 배치부터 Qdrant에 upsert, 연속으로 커밋된 마지막 배치를 체크포인트로 기록
+#  - 포인트 ID가 질문 내용으로 결정되므로 같은 파일을 다시 적재해도 중복/재임베딩 없음
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from qdrant_client.http import models as qm
-from langchain_openai import OpenAIEmbeddings
-
-load_dotenv()
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
-COLLECTION_NAME = os.getenv("COLLECTION_NAME", "questions")
-ROOT = Path(__file__).resolve().parents[1]
+
+import pandas as pd
+
+from app.common import get_emb, get_qdrant, ensure_collection, COLLECTION_NAME, ROOT
+from app.ingest import REQUIRED_COLUMNS, clean_frame, upsert_questions
+
 CSV_PATH = ROOT / "question.csv"
+STATE_DIR = ROOT / ".cache" / "ingest"
+
+
+class Checkpoint:
+    """연속 커밋된 배치 수(watermark)를 JSON 파일로 관리. CSV가 바뀌면 무효."""
+
+    def __init__(self, csv_path: Path, batch_size: int):
+        st = csv_path.stat()
+        self.path = STATE_DIR / f"{COLLECTION_NAME}__{csv_path.stem}.json"
+        self.ident = {"csv": str(csv_path), "size": st.st_size, "mtime": st.st_mtime,
+                      "batch_size": batch_size, "collection": COLLECTION_NAME}
+        self.committed = 0
+        self.counts = {"inserted": 0, "updated": 0, "skipped": 0}  # committed 이하 배치만 합산
+        self._done = {}  # watermark 너머에서 먼저 끝난 배치 → counts
+
+    def load(self):
+        if self.path.exists():
+            saved = json.loads(self.path.read_text(encoding="utf-8"))
+            if saved.get("ident") == self.ident:
+                self.committed = saved["committed"]
+                self.counts = saved.get("counts", self.counts)
+
+    @property
+    def processed(self) -> int:
+        return sum(self.counts.values())
+
+    def mark(self, batch_no: int, counts: dict):
+        self._done[batch_no] = counts
+        while self.committed in self._done:
+            for k, v in self._done.pop(self.committed).items():
+                self.counts[k] += v
+            self.committed += 1
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"ident": self.ident, "committed": self.committed,
+                                   "counts": self.counts}), encoding="utf-8")
+        tmp.replace(self.path)
 
-# text-embedding-3-small = 1536차원
-EMBED_DIM = 1536
-
-def ensure_collection(qdr: QdrantClient):
-    names = [c.name for c in qdr.get_collections().collections]
-    if COLLECTION_NAME not in names:
-        qdr.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=qm.VectorParams(size=EMBED_DIM, distance=qm.Distance.COSINE),
-        )
-
-def main():
-    # CSV 읽기 (컬럼: question, category)
-    df = pd.read_csv(CSV_PATH)
-    if not {"question", "category"}.issubset(set(df.columns)):
-        raise ValueError("CSV must have columns: question, category")
-
-    # 전처리(공백 제거, 결측 제거)
-    df["question"] = df["question"].astype(str).str.strip()
-    df["category"] = df["category"].astype(str).str.strip()
-    df = df[df["question"] != ""].dropna(subset=["question"])
-
-    qdr = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-    ensure_collection(qdr)
-
-    emb = OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=OPENAI_API_KEY)
-
-    points = []
-    for _, row in df.iterrows():
-        q = row["question"]
-        cat = row["category"]
-        vec = emb.embed_query(q)
-
-        points.append(
-            qm.PointStruct(
-                id=str(uuid.uuid4()),
-                vector=vec,
-                payload={
-                    "question": q,
-                    "category": cat,
-                }
-            )
-        )
-
-    if points:
-        qdr.upsert(collection_name=COLLECTION_NAME, points=points)
-        print(f"Upserted {len(points)} questions into '{COLLECTION_NAME}'")
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+
+def _embed_and_upsert(df: pd.DataFrame) -> dict:
+    return upsert_questions(get_qdrant(), COLLECTION_NAME, df["question"].tolist(), df["category"].tolist(), get_emb())
+
+
+def main(csv_path: Path = CSV_PATH, batch_size=256, concurrency=4, restart=False, reconfigure=False):
+    csv_path = Path(csv_path)
+    ensure_collection(reconfigure=reconfigure or None)
+
+    ckpt = Checkpoint(csv_path, batch_size)
+    if restart:
+        ckpt.clear()
+    else:
+        ckpt.load()
+    if ckpt.committed:
+        print(f"Resuming after batch {ckpt.committed} ({ckpt.processed} rows already processed)")
+
+    t0 = time.perf_counter()
+    rows_done, inflight = 0, {}
+
+    def drain(block_until):
+        nonlocal rows_done
+        while len(inflight) > block_until:
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                batch_no = inflight.pop(fut)
+                counts = fut.result()
+                rows_done += sum(counts.values())
+                ckpt.mark(batch_no, counts)
+                rate = rows_done / max(time.perf_counter() - t0, 1e-9)
+                print(f"  batch {batch_no} {counts} | total {ckpt.processed} | {rate:.0f} rows/s")
+
+    # CSV 읽기 (컬럼: question, category) - batch_size 행씩
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        reader = pd.read_csv(csv_path, chunksize=batch_size)
+        for batch_no, chunk in enumerate(reader):
+            if batch_no == 0 and not REQUIRED_COLUMNS.issubset(set(chunk.columns)):
+                raise ValueError("CSV must have columns: question, category")
+            if batch_no < ckpt.committed:
+                continue
+            chunk = clean_frame(chunk)
+            if chunk.empty:
+                ckpt.mark(batch_no, {})
+                continue
+            # 동시 요청 수 제한: 자리가 날 때까지 대기
+            drain(concurrency - 1)
+            inflight[pool.submit(_embed_and_upsert, chunk)] = batch_no
+        drain(0)
+
+    if ckpt.processed:
+        c = ckpt.counts
+        print(f"'{COLLECTION_NAME}': inserted {c['inserted']}, updated {c['updated']}, "
+              f"skipped {c['skipped']} ({time.perf_counter() - t0:.1f}s)")
     else:
         print("No valid rows to upsert.")
 
+
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description="question.csv → Qdrant 적재")
+    ap.add_argument("--csv", type=Path, default=CSV_PATH)
+    ap.add_argument("--batch-size", type=int, default=256, help="임베딩/업서트 배치 크기(행)")
+    ap.add_argument("--concurrency", type=int, default=4, help="동시 임베딩 요청 수")
+    ap.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 적재")
+    ap.add_argument("--reconfigure", action="store_true",
+                    help="기존 컬렉션의 HNSW/on_disk/양자화 설정이 QDRANT_* 와 다르면 갱신")
+    args = ap.parse_args()
+    main(args.csv, batch_size=args.batch_size, concurrency=args.concurrency, restart=args.restart,
+         reconfigure=args.reconfigure)
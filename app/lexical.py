@@ -0,0 +1,149 @@
+# lexical.py
+# 프로세스 내 어휘(lexical) 검색: 문자 n-gram BM25 + 벡터 검색과의 하이브리드 결합
+#  - 한국어는 띄어쓰기/조사 변형이 많아 단어 대신 문자 2·3-gram을 색인
+#  - 영문/숫자 토큰('5G', 'LTE')은 통째로도 색인
+#  - 어휘 매칭 신뢰도가 높으면 임베딩 호출 없이 바로 결과 반환 (fast path)
+import math
+import re
+import unicodedata
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r"[0-9A-Za-z]+|[^\s0-9A-Za-z]+")
+
+
+def char_ngrams(text: str, ns=(2, 3)) -> List[str]:
+    text = unicodedata.normalize("NFC", str(text)).lower()
+    grams = []
+    for tok in _TOKEN.findall(text):
+        if tok.isascii():
+            grams.append(tok)               # 5g, lte, 요금제명 속 영문 단어
+            continue
+        if len(tok) < min(ns):
+            grams.append(tok)
+        for n in ns:
+            grams.extend(tok[i:i + n] for i in range(len(tok) - n + 1))
+    return grams
+
+
+class BM25Index:
+    """문자 n-gram BM25 역색인 (numpy 배열 기반)"""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.2, b: float = 0.75, ns=(2, 3)):
+        self.k1, self.b, self.ns = k1, b, ns
+        self.n_docs = len(texts)
+        postings: Dict[str, Dict[int, int]] = {}
+        lengths = np.zeros(self.n_docs, dtype=np.float32)
+        for i, text in enumerate(texts):
+            grams = char_ngrams(text, ns)
+            lengths[i] = len(grams)
+            for g in grams:
+                d = postings.setdefault(g, {})
+                d[i] = d.get(i, 0) + 1
+        avgdl = float(lengths.mean()) if self.n_docs else 0.0
+        norm = self.k1 * (1 - self.b + self.b * lengths / (avgdl or 1.0))
+
+        # 용어별 (문서 ID 배열, BM25 가중치 배열)을 미리 계산
+        self.idf: Dict[str, float] = {}
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for g, d in postings.items():
+            ids = np.fromiter(d.keys(), dtype=np.int64, count=len(d))
+            tf = np.fromiter(d.values(), dtype=np.float32, count=len(d))
+            idf = math.log(1 + (self.n_docs - len(d) + 0.5) / (len(d) + 0.5))
+            self.idf[g] = idf
+            self.postings[g] = (ids, (idf * tf * (self.k1 + 1) / (tf + norm[ids])).astype(np.float32))
+
+    def scores(self, query: str) -> np.ndarray:
+        out = np.zeros(self.n_docs, dtype=np.float32)
+        for g in set(char_ngrams(query, self.ns)):
+            p = self.postings.get(g)
+            if p is not None:
+                out[p[0]] += p[1]
+        return out
+
+    def search(self, query: str, k: int = 5, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(문서 인덱스, 점수) 상위 k개 (점수 0인 문서 제외). mask: False인 문서는 제외"""
+        s = self.scores(query)
+        if mask is not None:
+            s[~mask] = 0
+        if not self.n_docs:
+            return np.empty(0, dtype=np.int64), s
+        k = min(k, self.n_docs)
+        top = np.argpartition(-s, k - 1)[:k]
+        top = top[np.argsort(-s[top])]
+        top = top[s[top] > 0]
+        return top, s[top]
+
+    def coverage(self, query: str, docs) -> np.ndarray:
+        """docs 각각에 대해, 쿼리 n-gram idf 합 중 문서에 들어있는 비율 (0~1)
+        색인에 없는 n-gram('추천해줘' 등)은 최대 idf로 계산해 커버리지를 낮춤"""
+        docs = np.asarray(docs, dtype=np.int64)
+        unseen = math.log(1 + (self.n_docs + 0.5) / 0.5)
+        total, hit = 0.0, np.zeros(len(docs), dtype=np.float64)
+        for g in set(char_ngrams(query, self.ns)):
+            p = self.postings.get(g)
+            if p is None:
+                total += unseen
+                continue
+            total += self.idf[g]
+            ids = p[0]                      # 문서 번호 오름차순
+            pos = np.minimum(np.searchsorted(ids, docs), len(ids) - 1)
+            hit += self.idf[g] * (ids[pos] == docs)
+        return hit / total if total else hit
+
+    def confident(self, query: str, idx: np.ndarray, scores: np.ndarray,
+                  min_coverage: float = 0.8, margin: float = 1.2) -> bool:
+        """
+        어휘 결과만으로 충분한지 판단
+        - 1순위 문서가 쿼리를 min_coverage 이상 덮고,
+        - 2순위보다 margin배 이상 앞서거나(요금제명 등 정확 매칭) 상위 결과 전부가 쿼리를 덮는 경우(태그 검색 등)
+        """
+        if not len(idx):
+            return False
+        cov = self.coverage(query, idx)
+        if cov[0] < min_coverage:
+            return False
+        return len(scores) == 1 or scores[0] >= margin * scores[1] or bool(np.all(cov >= min_coverage))
+
+
+def rrf(rankings: Sequence[Sequence], k: int = 60) -> List[Tuple[object, float]]:
+    """Reciprocal Rank Fusion: 여러 순위 목록을 하나로 결합"""
+    fused: Dict[object, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda kv: -kv[1])
+
+
+class HybridSearcher:
+    """
+    어휘 검색 + 벡터 검색 결합
+    - 어휘 결과가 충분히 확실하면(BM25Index.confident) → 어휘 결과만 사용 (임베딩 생략)
+    - 그 외에는 vector_search(query, k)를 호출해 RRF로 결합
+    vector_search는 문서 키(keys의 원소) 목록을 순위대로 반환해야 합니다.
+    """
+
+    def __init__(self, texts: Sequence[str], keys: Sequence, vector_search: Optional[Callable] = None,
+                 min_coverage: float = 0.8, margin: float = 1.2):
+        self.index = BM25Index(texts)
+        self.keys = list(keys)
+        self.vector_search = vector_search
+        self.min_coverage = min_coverage
+        self.margin = margin
+        self.stats = {"lexical": 0, "hybrid": 0, "vector": 0}
+
+    def search(self, query: str, k: int = 5, mode: str = "hybrid") -> Tuple[List, str]:
+        """(문서 키 목록, 사용 경로 'lexical' | 'hybrid' | 'vector') 반환"""
+        if mode == "vector":
+            self.stats["vector"] += 1
+            return list(self.vector_search(query, k)), "vector"
+        idx, scores = self.index.search(query, k)
+        lexical = [self.keys[i] for i in idx]
+        if mode == "lexical" or self.vector_search is None or \
+                self.index.confident(query, idx, scores, self.min_coverage, self.margin):
+            self.stats["lexical"] += 1
+            return lexical, "lexical"
+        self.stats["hybrid"] += 1
+        fused = rrf([lexical, list(self.vector_search(query, k))])
+        return [key for key, _ in fused[:k]], "hybrid"
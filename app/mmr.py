@@ -0,0 +1,70 @@
+# mmr.py
+# MMR(Maximal Marginal Relevance) 재정렬 공용 모듈
+import numpy as np
+from typing import List, Sequence
+
+_EPS = 1e-12
+
+
+def normalize_rows(mat) -> np.ndarray:
+    """행 단위 L2 정규화 (float32). 0벡터는 0으로 유지."""
+    m = np.asarray(mat, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=-1, keepdims=True)
+    return m / (norms + _EPS)
+
+
+def mmr_select(qvec, cand_vecs, k=5, lam=0.5) -> List[int]:
+    """
+    후보 벡터(n, d) 중 MMR 순서로 최대 k개 인덱스를 반환합니다.
+    - 후보 행렬은 한 번만 정규화하고, 쿼리 유사도는 행렬-벡터 곱 한 번으로 계산
+    - '선택 집합과의 최대 유사도' 벡터를 선택할 때마다 갱신 (O(k·n·d))
+    """
+    return mmr_select_batch(np.asarray(qvec)[None, :], np.asarray(cand_vecs)[None, ...], k=k, lam=lam)[0]
+
+
+def mmr_select_batch(qvecs, cand_vecs, k=5, lam=0.5) -> List[List[int]]:
+    """
+    여러 쿼리를 한 번에 처리하는 MMR.
+    - qvecs: (B, d)
+    - cand_vecs: (n, d) 공용 후보 또는 (B, n, d) 쿼리별 후보
+    반환: 쿼리별 선택 인덱스 리스트
+    """
+    Q = normalize_rows(qvecs)
+    C = normalize_rows(cand_vecs)
+    B = Q.shape[0]
+    shared = C.ndim == 2
+    n = C.shape[-2]
+    k = min(k, n)
+    if k <= 0:
+        return [[] for _ in range(B)]
+
+    rows = np.arange(B)
+    # 쿼리 관련도 (B, n): 공용 후보면 GEMM 한 번
+    rel = Q @ C.T if shared else np.einsum("bnd,bd->bn", C, Q)
+    max_sim = np.full((B, n), -np.inf, dtype=np.float32)  # 선택 집합과의 최대 유사도
+    taken = np.zeros((B, n), dtype=bool)
+    picks = np.empty((B, k), dtype=np.int64)
+
+    # 첫 후보: 쿼리와 가장 유사
+    j = rel.argmax(axis=1)
+    for step in range(k):
+        if step > 0:
+            score = lam * rel - (1 - lam) * max_sim
+            score[taken] = -np.inf
+            j = score.argmax(axis=1)
+        picks[:, step] = j
+        taken[rows, j] = True
+        if step == k - 1:
+            break
+        # 새로 뽑힌 벡터와의 유사도로 max_sim 갱신
+        sim = (C[j] @ C.T) if shared else np.einsum("bnd,bd->bn", C, C[rows, j])
+        np.maximum(max_sim, sim, out=max_sim)
+    return picks.tolist()
+
+
+def mmr(qvec, hits: Sequence, k=5, lam=0.5):
+    """Qdrant ScoredPoint 리스트(with_vectors=True)를 MMR로 재정렬합니다."""
+    if not hits or hits[0].vector is None:
+        return list(hits[:k])
+    vecs = np.asarray([h.vector for h in hits], dtype=np.float32)
+    return [hits[i] for i in mmr_select(qvec, vecs, k=k, lam=lam)]
@@ -1,55 +1,51 @@
 # query_questions.py
-import os
+# 실행: 레포 루트에서 python -m app.query_questions
+# 클라이언트(임베딩/LLM/Qdrant)는 app.common 에서 처음 호출할 때 생성
 import numpy as np
-from pathlib import Path
-from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from qdrant_client.http import models as qm
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 
-load_dotenv()
+from app.common import get_emb, get_llm, get_qdrant, category_filter, search_params, COLLECTION_NAME
+from app.mmr import mmr
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
-CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-4o-mini")
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
-COLLECTION_NAME = os.getenv("COLLECTION_NAME", "questions")
-ROOT = Path(__file__).resolve().parents[1]
-CSV_PATH = ROOT / "question.csv"
-
-emb = OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=OPENAI_API_KEY)
-llm = ChatOpenAI(model=CHAT_MODEL, temperature=0, api_key=OPENAI_API_KEY)
-
-def search(query: str, top_k=8, ef=128, with_vectors=True):
-    qvec = emb.embed_query(query)
-    client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-    res = client.search(
+def search(query: str, top_k=8, ef=128, with_vectors=True, prefer_grpc=None, categories=None):
+    """categories: 이 카테고리들 안에서만 검색 (category payload 색인 사용)"""
+    qvec = get_emb().embed_query(query)
+    res = get_qdrant(prefer_grpc).search(
         collection_name=COLLECTION_NAME,
         query_vector=qvec,
+        query_filter=category_filter(categories),
         limit=top_k,
         with_payload=True,
         with_vectors=with_vectors,
-        search_params=qm.SearchParams(hnsw_ef=ef),
+        search_params=search_params(ef),
     )
     return np.array(qvec), res
 
-def mmr(qvec, hits, k=5, lam=0.5):
-    if not hits or hits[0].vector is None:
-        return hits[:k]
-    vecs = np.stack([np.array(h.vector, dtype=float) for h in hits], axis=0)
-    def cos(a,b): return float(np.dot(a,b)/(np.linalg.norm(a)*np.linalg.norm(b)+1e-12))
-    selected, S, rest = [], [], list(range(len(hits)))
-    first = max(rest, key=lambda i: cos(qvec, vecs[i]))
-    selected.append(hits[first]); S.append(first); rest.remove(first)
-    while len(selected) < min(k, len(hits)) and rest:
-        def score(i):
-            rel = cos(qvec, vecs[i])
-            div = max(cos(vecs[i], vecs[j]) for j in S) if S else 0.0
-            return lam*rel - (1-lam)*div
-        j = max(rest, key=score)
-        selected.append(hits[j]); S.append(j); rest.remove(j)
-    return selected
+def search_batch(queries, top_k=8, ef=128, with_vectors=True, prefer_grpc=None, categories=None):
+    """
+    여러 질문을 한 번에 검색 (오프라인 평가/리포트용)
+    - 임베딩: embed_documents 1회
+    - 검색: Qdrant search_batch 1회
+    categories: 모든 질문에 같은 카테고리 필터 적용
+    반환: (쿼리 벡터 (B, d), 쿼리별 hits 리스트)
+    """
+    from qdrant_client.http import models as qm
+    qvecs = get_emb().embed_documents(list(queries))
+    flt = category_filter(categories)
+    res = get_qdrant(prefer_grpc).search_batch(
+        collection_name=COLLECTION_NAME,
+        requests=[
+            qm.SearchRequest(
+                vector=v,
+                filter=flt,
+                limit=top_k,
+                with_payload=True,
+                with_vector=with_vectors,
+                params=search_params(ef),
+            )
+            for v in qvecs
+        ],
+    )
+    return np.array(qvecs), res
 
 def build_context(hits):
     lines = []
@@ -69,7 +65,7 @@ def summarize_answer(user_q, context):
 [유사 질문들]
 {context}
 """
-    return llm.invoke(prompt).content
+    return get_llm().invoke(prompt).content
 
 if __name__ == "__main__":
     user_q = input("질문: ").strip()
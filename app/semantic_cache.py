@@ -0,0 +1,151 @@
+# semantic_cache.py
+# 쿼리 벡터 유사도 기반 답변 캐시 (프로세스 내 인덱스)
+#  - 코사인 유사도 threshold 이상인 기존 질의가 있으면 저장된 응답을 재사용
+#  - max_entries 는 캐시 전체 상한: 가득 차면 만료 항목 → 가장 오래 안 쓴(LRU) 항목 순으로 제거
+#  - 파라미터 묶음(bucket)별 버퍼는 필요한 만큼만 늘리고, 비면 버킷째 삭제
+#  - max_buckets 초과 시 가장 오래 안 쓴 항목이 속한 버킷을 통째로 제거
+#  - 컬렉션 적재 시 invalidate()로 전체 무효화
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from .mmr import normalize_rows
+
+
+class _Bucket:
+    """같은 요청 파라미터(top_k 등)를 공유하는 항목 묶음. 삭제는 마지막 칸을 빈자리로 옮김"""
+
+    def __init__(self, dim: int, capacity: int = 1):
+        self.vecs = np.empty((capacity, dim), dtype=np.float32)
+        self.expires = np.empty(capacity, dtype=np.float64)
+        self.values = []
+        self.ids = []
+        self.slot = {}  # 항목 id → 칸 번호
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def add(self, entry_id: int, vec, expires: float, value):
+        n = self.size
+        if n == len(self.vecs):
+            grow = max(1, n)  # 두 배씩 늘림
+            self.vecs = np.concatenate([self.vecs, np.empty((grow, self.vecs.shape[1]), dtype=np.float32)])
+            self.expires = np.concatenate([self.expires, np.empty(grow, dtype=np.float64)])
+        self.vecs[n] = vec
+        self.expires[n] = expires
+        self.values.append(value)
+        self.ids.append(entry_id)
+        self.slot[entry_id] = n
+
+    def remove(self, entry_id: int):
+        i, last = self.slot.pop(entry_id), self.size - 1
+        if i != last:
+            self.vecs[i] = self.vecs[last]
+            self.expires[i] = self.expires[last]
+            self.values[i] = self.values[last]
+            self.ids[i] = self.ids[last]
+            self.slot[self.ids[i]] = i
+        self.values.pop()
+        self.ids.pop()
+        # 크게 줄었으면 버퍼도 줄임
+        if len(self.vecs) > 32 and self.size * 4 <= len(self.vecs):
+            keep = max(1, self.size * 2)
+            self.vecs = self.vecs[:keep].copy()
+            self.expires = self.expires[:keep].copy()
+
+    def expired(self, now: float):
+        return [self.ids[i] for i in np.flatnonzero(self.expires[:self.size] <= now)]
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = 0.95, ttl_sec: float = 3600, max_entries: int = 5000,
+                 max_buckets: int = 256):
+        self.threshold = threshold
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.max_buckets = max_buckets
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        # 전체 항목의 사용 순서 (앞쪽이 가장 오래 안 쓴 항목): id → params
+        self._lru: "OrderedDict[int, Hashable]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.stats = {"hits": 0, "misses": 0, "puts": 0, "invalidations": 0, "evictions": 0}
+
+    def lookup(self, qvec, params: Hashable) -> Tuple[Optional[Any], int]:
+        """(캐시된 값 또는 None, 현재 generation) 반환. generation은 put()에 그대로 넘김"""
+        q = normalize_rows(qvec)
+        now = time.time()
+        with self._lock:
+            gen = self.generation
+            b = self._buckets.get(params)
+            if b is not None and b.size:
+                sims = b.vecs[:b.size] @ q
+                sims[b.expires[:b.size] <= now] = -np.inf
+                i = int(sims.argmax())
+                if sims[i] >= self.threshold:
+                    self._lru.move_to_end(b.ids[i])
+                    self.stats["hits"] += 1
+                    return b.values[i], gen
+            self.stats["misses"] += 1
+            return None, gen
+
+    def _remove(self, entry_id: int):
+        params = self._lru.pop(entry_id)
+        b = self._buckets[params]
+        b.remove(entry_id)
+        if not b.size:
+            del self._buckets[params]
+
+    def _make_room(self, now: float, params: Hashable):
+        """가득 찼으면 만료 항목부터, 그래도 부족하면 LRU 항목(새 버킷이 넘치면 LRU 버킷) 제거"""
+        if params not in self._buckets:
+            while len(self._buckets) >= self.max_buckets:
+                victim = self._buckets[self._lru[next(iter(self._lru))]]
+                for entry_id in list(victim.ids):
+                    self._remove(entry_id)
+                    self.stats["evictions"] += 1
+        if len(self._lru) < self.max_entries:
+            return
+        for b in list(self._buckets.values()):
+            for entry_id in b.expired(now):
+                self._remove(entry_id)
+        while len(self._lru) >= self.max_entries:
+            self._remove(next(iter(self._lru)))
+            self.stats["evictions"] += 1
+
+    def put(self, qvec, params: Hashable, value: Any, generation: int):
+        if self.max_entries <= 0 or self.max_buckets <= 0:
+            return
+        q = normalize_rows(qvec)
+        now = time.time()
+        with self._lock:
+            # 조회 이후 적재가 있었다면 오래된 결과이므로 저장하지 않음
+            if generation != self.generation:
+                return
+            self._make_room(now, params)
+            b = self._buckets.get(params)
+            if b is None:
+                b = self._buckets[params] = _Bucket(q.shape[0])
+            entry_id, self._next_id = self._next_id, self._next_id + 1
+            b.add(entry_id, q, now + self.ttl_sec, value)
+            self._lru[entry_id] = params
+            self.stats["puts"] += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._buckets.clear()
+            self._lru.clear()
+            self.generation += 1
+            self.stats["invalidations"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {**self.stats, "hit_rate": self.stats["hits"] / total if total else 0.0,
+                    "entries": len(self._lru), "buckets": len(self._buckets),
+                    "threshold": self.threshold, "ttl_sec": self.ttl_sec}
@@ -1,22 +1,79 @@
-import io
+import asyncio
+import json
+import logging
 import os
-import uuid
+import time
 import numpy as np
 import pandas as pd
-from typing import List, Optional
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
+from fastapi import FastAPI, UploadFile, File, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from qdrant_client.http import models as qm
 from dotenv import load_dotenv
 
 # 기존 공용 (임베딩/LLM/Qdrant/설정)
-from .common import emb, llm, qdr, ensure_collection, COLLECTION_NAME
+from .common import (get_emb, get_llm, get_qdrant, get_async_qdrant, ensure_collection, category_filter,
+                     normalize_categories, search_params, COLLECTION_NAME)
+from .ingest import REQUIRED_COLUMNS, clean_frame, upsert_questions
+from .lexical import BM25Index, rrf
+from .metrics import REGISTRY, CONTENT_TYPE, COUNT_BUCKETS, SIZE_BUCKETS, StageTimer, counter, histogram
+from .mmr import mmr
+from .semantic_cache import SemanticCache
 
 load_dotenv()
-ensure_collection()  # 서버 기동 시 컬렉션 준비
+log = logging.getLogger(__name__)
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", "500"))  # /ingest/csv 청크 크기(행)
+# 1이면 기동 시 임베딩/LLM 클라이언트 생성 + Qdrant 커넥션을 미리 열어 첫 요청 지연을 줄임
+SERVER_WARMUP = os.getenv("SERVER_WARMUP", "1") == "1"
 
-app = FastAPI(title="Qdrant-only QA API", version="1.0.0")
+# 의미 기반 답변 캐시 (SEMANTIC_CACHE_THRESHOLD 이상 유사한 질의는 LLM 호출 생략)
+# 다른 프로세스(ingest_questions CLI)의 적재는 감지하지 못하므로 TTL로 만료
+answer_cache = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    ttl_sec=float(os.getenv("SEMANTIC_CACHE_TTL_SEC", "3600")),
+    max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000")),
+    # 카테고리 조합마다 버킷이 생기므로 개수도 제한
+    max_buckets=int(os.getenv("SEMANTIC_CACHE_MAX_BUCKETS", "256")),
+)
+
+# 질문 payload 어휘(BM25) 색인: retrieval='hybrid' 요청에서 처음 필요할 때 생성
+# 이 프로세스의 적재 시 재생성, 다른 프로세스 적재는 TTL로 반영
+# 재생성은 백그라운드에서 하고 끝나면 교체 (그동안은 이전 색인으로 응답)
+LEXICAL_MIN_COVERAGE = float(os.getenv("LEXICAL_MIN_COVERAGE", "0.8"))
+LEXICAL_INDEX_TTL_SEC = float(os.getenv("LEXICAL_INDEX_TTL_SEC", "3600"))
+# version: 적재마다 증가, built_version: 현재 색인이 반영한 version
+_lexical = {"index": None, "points": [], "categories": None, "built_at": 0.0,
+            "version": 0, "built_version": 0, "task": None}
+_lexical_lock = asyncio.Lock()
+
+# ---------- 지표 (GET /metrics) ----------
+STAGE_SECONDS = histogram("qa_stage_seconds", "Per-stage latency of API requests", ("route", "stage"))
+SEARCH_CANDIDATES = histogram("qa_search_candidates", "Candidates returned by the Qdrant search", buckets=COUNT_BUCKETS)
+VECTOR_BYTES = histogram("qa_search_vector_bytes", "Vector payload returned by the Qdrant search (float32)",
+                         buckets=SIZE_BUCKETS)
+PROMPT_CHARS = histogram("qa_prompt_chars", "LLM prompt length in characters", buckets=SIZE_BUCKETS)
+INGEST_ITEMS = counter("qa_ingest_items_total", "Ingested items by result", ("route", "result"))
+ANSWER_CACHE = counter("qa_answer_cache_total", "Semantic answer cache lookups", ("result",))
+RETRIEVAL_PATH = counter("qa_retrieval_path_total", "Retrieval path taken by /query", ("path",))
+
+async def _warm_up():
+    await run_in_threadpool(get_emb)
+    await run_in_threadpool(get_llm)
+    await get_async_qdrant().get_collection(COLLECTION_NAME)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # import 시점이 아니라 서버 기동 시 컬렉션 준비 (워커 부팅/테스트 수집 시 네트워크 호출 없음)
+    await run_in_threadpool(ensure_collection)
+    if SERVER_WARMUP:
+        await _warm_up()
+    yield
+
+app = FastAPI(title="Qdrant-only QA API", version="1.0.0", lifespan=lifespan)
 
 # (선택) 로컬/프론트 테스트용 CORS
 app.add_middleware(
@@ -37,130 +94,353 @@ class QueryRequest(BaseModel):
     top_k: int = Field(5, ge=1, le=50)
     use_mmr: bool = True
     with_sources: bool = True
+    # hybrid: 어휘 결과가 확실하면 임베딩 없이 바로 사용, 아니면 벡터 결과와 RRF 결합
+    retrieval: Literal["vector", "hybrid"] = "vector"
+    # 이 카테고리들 안에서만 검색 (Qdrant category payload 색인 필터). 없으면 전체
+    categories: Optional[List[str]] = Field(None, max_length=50)
 
 class Hit(BaseModel):
-    score: float
+    score: float  # 검색 점수 (벡터: 코사인 유사도, 어휘 전용: BM25)
     question: str
     category: str
+    fused_score: Optional[float] = None  # hybrid RRF 결합 점수 (결합했을 때만)
 
 class QueryResponse(BaseModel):
     answer: str
     hits: Optional[List[Hit]] = None
 
 # ---------- 유틸 ----------
-def _mmr(qvec: np.ndarray, hits, k=5, lam=0.5):
-    if not hits or hits[0].vector is None:
-        return hits[:k]
-    vecs = np.stack([np.array(h.vector, dtype=float) for h in hits], axis=0)
-
-    def cos(a, b): return float(np.dot(a, b) / (np.linalg.norm(a)*np.linalg.norm(b)+1e-12))
-    selected, S, rest = [], [], list(range(len(hits)))
-
-    # 첫 후보: 쿼리와 가장 유사
-    first = max(rest, key=lambda i: cos(qvec, vecs[i]))
-    selected.append(hits[first]); S.append(first); rest.remove(first)
-
-    # 이후: MMR 점수 최대
-    while len(selected) < min(k, len(hits)) and rest:
-        def score(i):
-            rel = cos(qvec, vecs[i])
-            div = max(cos(vecs[i], vecs[j]) for j in S) if S else 0.0
-            return lam*rel - (1-lam)*div
-        j = max(rest, key=score)
-        selected.append(hits[j]); S.append(j); rest.remove(j)
-    return selected
-
 def _build_context(hits) -> str:
     lines = [f"[{h.payload.get('category','')}] {h.payload.get('question','')}" for h in hits]
     return "\n".join(lines)
 
+def _build_prompt(query: str, ctx: str) -> str:
+    return f"""아래 유사 질문 목록을 참고해 사용자 질문에 간결히 답하세요. 
+모르면 모른다고 하세요.
+
+[사용자 질문]
+{query}
+
+[유사 질문들]
+{ctx}
+"""
+
+def _invalidate():
+    """적재로 데이터가 바뀌었을 때: 답변 캐시 무효화 + 어휘 색인 재생성 예약"""
+    answer_cache.invalidate()
+    _lexical["version"] += 1
+
+class _CsvReadError(Exception):
+    """CSV 리더(디코딩/파싱) 오류. 임베딩/Qdrant 오류와 구분하기 위해 감쌈"""
+
+def _ingest_csv_stream(f, read_opts: dict, summary: dict, timer: StageTimer):
+    """업로드 파일을 CSV_CHUNK_ROWS 행씩 읽어 (파싱 → 임베딩 → 업서트) 반복"""
+    reader = None
+    while True:
+        with timer.stage("parse"):
+            try:
+                # 리더 생성 시 헤더를 읽으므로 생성도 같은 오류 처리 안에서
+                reader = reader or pd.read_csv(f, chunksize=CSV_CHUNK_ROWS, **read_opts)
+                chunk = next(reader, None)
+            except (UnicodeDecodeError, pd.errors.ParserError) as e:
+                raise _CsvReadError(e) from e
+        if chunk is None:
+            break
+        if not REQUIRED_COLUMNS.issubset(chunk.columns):
+            raise HTTPException(400, f"CSV must have columns: {REQUIRED_COLUMNS}")
+        raw_rows = len(chunk)
+        with timer.stage("clean"):
+            chunk = clean_frame(chunk)
+        if not chunk.empty:
+            # 청크 단위 배치 임베딩 (이미 있는 질문은 임베딩 생략). 실패하면 그대로 전파(5xx)
+            counts = upsert_questions(get_qdrant(), COLLECTION_NAME, chunk["question"].tolist(),
+                                      chunk["category"].tolist(), get_emb(), timer=timer)
+            for k, v in counts.items():
+                summary[k] += v
+            summary["upserted"] += counts["inserted"] + counts["updated"]
+        # 업서트가 끝난 청크만 처리된 것으로 집계
+        summary["rows_read"] += raw_rows
+        summary["invalid_rows"] += raw_rows - len(chunk)
+        summary["chunks"] += 1
+
+
+def _new_csv_summary() -> dict:
+    return {"upserted": 0, "inserted": 0, "updated": 0, "skipped": 0,
+            "rows_read": 0, "invalid_rows": 0, "chunks": 0, "encoding_fallback": False}
+
+def _fallback_encoding(f, sample_bytes: int = 64 * 1024) -> dict:
+    """
+    디코딩 오류 시 read_csv 인코딩 옵션. 깨진 바이트 앞에 UTF-8 한글 등이 있으면 UTF-8 파일로 보고
+    깨진 바이트만 치환, 아니면 엑셀에서 저장한 CSV(MS949)로 판단
+    """
+    f.seek(0)
+    head = f.read(sample_bytes)
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+        if e.start < len(head) - 3 and head[:e.start].isascii():
+            return {"encoding": "cp949"}
+    return {"encoding_errors": "replace"}
+
+def _ingest_csv_file(f, timer: StageTimer) -> dict:
+    summary = _new_csv_summary()
+    t0 = time.perf_counter()
+    try:
+        _ingest_csv_stream(f, {}, summary, timer)
+    except _CsvReadError as e:
+        # 엑셀에서 저장한 CSV(MS949) 또는 깨진 행 → 몇 번째 청크에서 실패했든 백업 파서로 처음부터 다시
+        # 포인트 ID가 질문 내용으로 결정되므로 이미 적재한 행은 skipped 로 집계됨
+        summary = _new_csv_summary()
+        summary["encoding_fallback"] = True
+        opts = {"encoding": "utf-8", "on_bad_lines": "skip"}
+        if isinstance(e.__cause__, UnicodeDecodeError):
+            opts.update(_fallback_encoding(f))
+        f.seek(0)
+        try:
+            _ingest_csv_stream(f, opts, summary, timer)
+        except _CsvReadError as e2:
+            raise HTTPException(400, f"CSV read error after {summary['rows_read']} rows were ingested: "
+                                     f"{e2.__cause__}")
+    summary["elapsed_sec"] = round(time.perf_counter() - t0, 3)
+    return summary
+
 # ---------- 엔드포인트 ----------
 @app.get("/health")
 def health():
-    return {"ok": True, "collection": COLLECTION_NAME}
+    return {"ok": True, "collection": COLLECTION_NAME,
+            "embed_cache": get_emb().cache.snapshot(), "answer_cache": answer_cache.snapshot()}
+
+@app.get("/metrics")
+def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+def _count_ingest(route: str, counts: dict):
+    for result in ("inserted", "updated", "skipped"):
+        INGEST_ITEMS.inc(counts[result], route=route, result=result)
 
 @app.post("/ingest/json")
-def ingest_json(req: IngestRequest):
-    points = []
-    for it in req.items:
-        q = it.question.strip()
-        if not q:
-            continue
-        vec = emb.embed_query(q)
-        points.append(qm.PointStruct(
-            id=str(uuid.uuid4()),
-            vector=vec,
-            payload={"question": q, "category": it.category.strip()}
-        ))
-    if not points:
-        raise HTTPException(400, "no valid items")
-    qdr.upsert(collection_name=COLLECTION_NAME, points=points)
-    return {"upserted": len(points)}
+def ingest_json(req: IngestRequest, response: Response):
+    timer = StageTimer(STAGE_SECONDS, route="ingest_json")
+    with timer.stage("total"):
+        items = [(it.question.strip(), it.category.strip()) for it in req.items if it.question.strip()]
+        if not items:
+            raise HTTPException(400, "no valid items")
+        questions, cats = zip(*items)
+        counts = upsert_questions(get_qdrant(), COLLECTION_NAME, questions, cats, get_emb(), timer=timer)
+    _count_ingest("ingest_json", counts)
+    if counts["inserted"] or counts["updated"]:
+        _invalidate()
+    response.headers["Server-Timing"] = timer.header()
+    return {"upserted": counts["inserted"] + counts["updated"], **counts}
 
 @app.post("/ingest/csv")
-async def ingest_csv(file: UploadFile = File(...)):
+async def ingest_csv(response: Response, file: UploadFile = File(...)):
     # CSV 컬럼: question, category
-    content = await file.read()
+    # 업로드 파일(SpooledTemporaryFile)을 통째로 읽지 않고 청크 단위로 스트리밍 처리
+    timer = StageTimer(STAGE_SECONDS, route="ingest_csv")
     try:
-        df = pd.read_csv(io.BytesIO(content))
+        with timer.stage("total"):
+            summary = await run_in_threadpool(_ingest_csv_file, file.file, timer)
     except Exception:
-        # 엑셀에서 저장한 CSV가 MS949일 수 있음 → 백업 파서
-        df = pd.read_csv(io.BytesIO(content), encoding="utf-8", on_bad_lines="skip")
+        _invalidate()  # 일부만 적재됐을 수 있으므로 기존 답변은 무효
+        raise
+    _count_ingest("ingest_csv", summary)
+    # 백업 파서로 다시 읽은 경우 첫 시도에서 적재한 행은 upserted 에 안 잡히므로 함께 무효화
+    if summary["upserted"] or summary["encoding_fallback"]:
+        _invalidate()
+    if not (summary["upserted"] or summary["skipped"]):
+        raise HTTPException(400, "no valid rows")
+    response.headers["Server-Timing"] = timer.header()
+    return summary
 
-    need = {"question", "category"}
-    if not need.issubset(df.columns):
-        raise HTTPException(400, f"CSV must have columns: {need}")
+async def _search(req: QueryRequest, qvec, timer: StageTimer):
+    """검색 → (MMR) 까지. 선택된 hits 반환"""
+    with timer.stage("search"):
+        hits = await get_async_qdrant().search(
+            collection_name=COLLECTION_NAME,
+            query_vector=qvec,
+            query_filter=category_filter(req.categories),
+            limit=max(req.top_k*2, req.top_k+4),
+            with_payload=True,
+            with_vectors=req.use_mmr,           # MMR 쓰면 벡터 필요
+            search_params=search_params(128),
+        )
+    SEARCH_CANDIDATES.observe(len(hits))
+    if req.use_mmr:
+        VECTOR_BYTES.observe(sum(len(h.vector) * 4 for h in hits if isinstance(h.vector, list)))
+        with timer.stage("mmr"):
+            return mmr(qvec, hits, k=req.top_k)
+    return hits[:req.top_k]
 
-    df["question"] = df["question"].astype(str).str.strip()
-    df["category"] = df["category"].astype(str).str.strip()
-    df = df[df["question"] != ""].dropna(subset=["question"])
-    if df.empty:
-        raise HTTPException(400, "no valid rows")
+def _categories(req: QueryRequest):
+    return normalize_categories(req.categories)
 
-    # 배치 임베딩으로 속도 ↑
-    questions = df["question"].tolist()
-    cats = df["category"].tolist()
-    vectors = emb.embed_documents(questions)
+def _cache_params(req: QueryRequest):
+    # 같은 답변을 재사용해도 되는 요청 파라미터 조합
+    return (req.top_k, req.use_mmr, req.with_sources, req.retrieval, _categories(req))
 
-    points = []
-    for i in range(len(questions)):
-        points.append(qm.PointStruct(
-            id=str(uuid.uuid4()),
-            vector=vectors[i],
-            payload={"question": questions[i], "category": cats[i]}
-        ))
+def _build_lexical():
+    points, offset = [], None
+    while True:
+        batch, offset = get_qdrant().scroll(COLLECTION_NAME, limit=1000, offset=offset,
+                                   with_payload=True, with_vectors=False)
+        points.extend(batch)
+        if offset is None:
+            break
+    texts = [f"{p.payload.get('category','')} {p.payload.get('question','')}" for p in points]
+    categories = np.array([str(p.payload.get('category', '')) for p in points], dtype=object)
+    return BM25Index(texts), points, categories
 
-    qdr.upsert(collection_name=COLLECTION_NAME, points=points)
-    return {"upserted": len(points)}
+async def _refresh_lexical():
+    version = _lexical["version"]
+    index, points, categories = await run_in_threadpool(_build_lexical)
+    # 세 값을 한 번에 교체 (검색 중인 요청은 이전 튜플을 그대로 사용)
+    _lexical.update(index=index, points=points, categories=categories,
+                    built_at=time.monotonic(), built_version=version)
 
-@app.post("/query", response_model=QueryResponse)
-def query(req: QueryRequest):
-    qvec = emb.embed_query(req.query)
-    hits = qdr.search(
-        collection_name=COLLECTION_NAME,
-        query_vector=qvec,
-        limit=max(req.top_k*2, req.top_k+4),
-        with_payload=True,
-        with_vectors=req.use_mmr,           # MMR 쓰면 벡터 필요
-        search_params=qm.SearchParams(hnsw_ef=128),
-    )
-    picks = _mmr(np.array(qvec), hits, k=req.top_k) if req.use_mmr else hits[:req.top_k]
-    ctx = _build_context(picks)
-
-    prompt = f"""아래 유사 질문 목록을 참고해 사용자 질문에 간결히 답하세요. 
-모르면 모른다고 하세요.
+async def _refresh_lexical_background():
+    async with _lexical_lock:
+        try:
+            await _refresh_lexical()
+        except Exception:
+            # 이전 색인을 계속 사용하고 다음 요청에서 다시 시도
+            log.exception("lexical index refresh failed")
 
-[사용자 질문]
-{req.query}
+async def _lexical_index():
+    if _lexical["index"] is None:
+        # 처음 한 번만 생성을 기다림 (대신 쓸 이전 색인이 없음)
+        async with _lexical_lock:
+            if _lexical["index"] is None:
+                await _refresh_lexical()
+    elif (_lexical["built_version"] != _lexical["version"]
+          or time.monotonic() - _lexical["built_at"] > LEXICAL_INDEX_TTL_SEC):
+        task = _lexical["task"]
+        if task is None or task.done():
+            _lexical["task"] = asyncio.create_task(_refresh_lexical_background())
+    return _lexical["index"], _lexical["points"], _lexical["categories"]
 
-[유사 질문들]
-{ctx}
-"""
-    ans = llm.invoke(prompt).content
+async def _lexical_search(req: QueryRequest):
+    """어휘 검색 hits와 (임베딩 없이 써도 될 만큼) 확실한지 여부"""
+    index, points, categories = await _lexical_index()
+    cats = _categories(req)
+    mask = np.isin(categories, list(cats)) if cats else None
+    idx, scores = index.search(req.query, req.top_k, mask=mask)
+    hits = [qm.ScoredPoint(id=points[i].id, version=0, score=float(sc), payload=points[i].payload)
+            for i, sc in zip(idx, scores)]
+    return hits, index.confident(req.query, idx, scores, LEXICAL_MIN_COVERAGE)
+
+def _fuse(vector_hits, lexical_hits, k: int):
+    by_id = {h.id: h for h in lexical_hits}
+    by_id.update({h.id: h for h in vector_hits})
+    fused = rrf([[h.id for h in vector_hits], [h.id for h in lexical_hits]])[:k]
+    # 원래 점수(코사인/BM25)는 유지하고 RRF 점수는 따로 반환
+    return [by_id[pid] for pid, _ in fused], {pid: score for pid, score in fused}
+
+async def _retrieve(req: QueryRequest, timer: StageTimer):
+    """
+    (qvec, 캐시된 답변, 캐시 세대, picks, RRF 점수 {id: score} 또는 None)
+    - 어휘 fast path: 임베딩/답변 캐시를 건너뛰므로 qvec=None
+    - 캐시 히트: picks=None
+    """
+    lexical = None
+    if req.retrieval == "hybrid":
+        with timer.stage("lexical"):
+            lexical, confident = await _lexical_search(req)
+        if confident:
+            RETRIEVAL_PATH.inc(path="lexical")
+            return None, None, None, lexical, None
+    with timer.stage("embed"):
+        qvec = await get_emb().aembed_query(req.query)
+    with timer.stage("cache"):
+        cached, gen = answer_cache.lookup(qvec, _cache_params(req))
+    ANSWER_CACHE.inc(result="miss" if cached is None else "hit")
+    if cached is not None:
+        return qvec, cached, gen, None, None
+    picks = await _search(req, qvec, timer)
+    RETRIEVAL_PATH.inc(path=req.retrieval)
+    fused = None
+    if lexical:
+        picks, fused = _fuse(picks, lexical, req.top_k)
+    return qvec, None, gen, picks, fused
+
+def _prompt(req: QueryRequest, picks, timer: StageTimer) -> str:
+    with timer.stage("context"):
+        prompt = _build_prompt(req.query, _build_context(picks))
+    PROMPT_CHARS.observe(len(prompt))
+    return prompt
+
+def _to_hits(picks, fused=None) -> List[Hit]:
+    return [Hit(score=h.score,
+                question=h.payload.get("question",""),
+                category=h.payload.get("category",""),
+                fused_score=fused.get(h.id) if fused else None)
+            for h in picks]
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/query", response_model=QueryResponse)
+async def query(req: QueryRequest, response: Response):
+    # 임베딩 → 검색 → LLM 모두 await: 워커 스레드를 점유하지 않음
+    # 단계별 시간은 /metrics 히스토그램과 Server-Timing 헤더로 노출
+    timer = StageTimer(STAGE_SECONDS, route="query")
+    t0 = time.perf_counter()
+    qvec, cached, gen, picks, fused = await _retrieve(req, timer)
+    if cached is not None:
+        timer.add("total", time.perf_counter() - t0)
+        response.headers["Server-Timing"] = timer.header()
+        return cached.model_copy(deep=True)
+
+    prompt = _prompt(req, picks, timer)
+    with timer.stage("llm"):
+        ans = (await get_llm().ainvoke(prompt)).content
     out = QueryResponse(answer=ans)
     if req.with_sources:
-        out.hits = [Hit(score=h.score,
-                        question=h.payload.get("question",""),
-                        category=h.payload.get("category",""))
-                    for h in picks]
+        out.hits = _to_hits(picks, fused)
+    if qvec is not None:
+        answer_cache.put(qvec, _cache_params(req), out, gen)
+    timer.add("total", time.perf_counter() - t0)
+    response.headers["Server-Timing"] = timer.header()
     return out
+
+@app.post("/query/stream")
+async def query_stream(req: QueryRequest):
+    """
+    SSE 스트리밍 응답
+    - event: hits  → 검색/MMR 직후 바로 전송 (with_sources=False 면 null)
+    - event: token → LLM 토큰이 도착하는 대로 전송
+    - event: done  → 전체 답변
+    Server-Timing 헤더에는 스트림 시작 전 단계(임베딩/검색)만 포함, LLM 시간은 /metrics 로 기록
+    """
+    timer = StageTimer(STAGE_SECONDS, route="query_stream")
+    t0 = time.perf_counter()
+    qvec, cached, gen, picks, fused = await _retrieve(req, timer)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Server-Timing": timer.header()}
+
+    async def events():
+        if cached is not None:
+            # 캐시 히트: LLM 호출 없이 저장된 답변을 한 번에 전송
+            yield _sse("hits", [h.model_dump() for h in cached.hits] if cached.hits is not None else None)
+            yield _sse("token", {"text": cached.answer})
+            yield _sse("done", {"answer": cached.answer})
+            return
+        hits = _to_hits(picks, fused) if req.with_sources else None
+        yield _sse("hits", [h.model_dump() for h in hits] if hits is not None else None)
+        parts = []
+        prompt = _prompt(req, picks, timer)
+        t_llm = time.perf_counter()
+        async for chunk in get_llm().astream(prompt):
+            if chunk.content:
+                if not parts:
+                    timer.add("llm_first_token", time.perf_counter() - t_llm)
+                parts.append(chunk.content)
+                yield _sse("token", {"text": chunk.content})
+        timer.add("llm", time.perf_counter() - t_llm)
+        timer.add("total", time.perf_counter() - t0)
+        answer = "".join(parts)
+        if qvec is not None:
+            answer_cache.put(qvec, _cache_params(req), QueryResponse(answer=answer, hits=hits), gen)
+        yield _sse("done", {"answer": answer})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
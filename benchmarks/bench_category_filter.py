@@ -0,0 +1,104 @@
+# bench_category_filter.py
+# 카테고리 조건 검색: Qdrant payload 색인 필터 vs 전체 검색 후 거르기(post-filter)
+#   실행: python -m benchmarks.bench_category_filter --points 200000 --queries 200
+#   기본은 실행 중인 Qdrant 서버 (QDRANT_HOST / QDRANT_PORT), --local 이면 인메모리(색인 없이 전수 비교)
+#   카테고리 빈도는 치우치게(40% ~ 1%) 만들고, 정답은 카테고리 안 전수 검색(numpy) 상위 k
+import argparse
+import time
+
+import numpy as np
+from qdrant_client.http import models as qm
+
+from app.common import category_filter, ensure_payload_indexes, get_qdrant
+from benchmarks.fakes import CATEGORIES
+
+COLLECTION = "bench_category_filter"
+FREQ = np.array([0.40, 0.20, 0.15, 0.10, 0.07, 0.05, 0.02, 0.01])
+
+
+def _unit(m):
+    return (m / np.linalg.norm(m, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def seed(client, n, dim, rng, batch=2048):
+    centroids = _unit(rng.standard_normal((len(CATEGORIES), dim)))
+    cats = rng.choice(len(CATEGORIES), n, p=FREQ)
+    vecs = _unit(0.35 * centroids[cats] + rng.standard_normal((n, dim)) / np.sqrt(dim))
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(COLLECTION, vectors_config=qm.VectorParams(size=dim, distance=qm.Distance.COSINE))
+    ensure_payload_indexes(client, COLLECTION)
+    for i in range(0, n, batch):
+        client.upload_points(COLLECTION, points=[
+            qm.PointStruct(id=j, vector=vecs[j].tolist(), payload={"question": f"질문 {j}", "category": CATEGORIES[cats[j]]})
+            for j in range(i, min(i + batch, n))
+        ], wait=True)
+    return vecs, cats, centroids
+
+
+def _exact(vecs, cats, q, cat, k):
+    ids = np.flatnonzero(cats == cat)
+    sims = vecs[ids] @ q
+    return set(ids[np.argsort(-sims)[:k]].tolist())
+
+
+def run(client, queries, targets, k, limit, filtered, truth):
+    lat, recall, returned = [], [], []
+    for q, cat, gt in zip(queries, targets, truth):
+        t0 = time.perf_counter()
+        hits = client.search(COLLECTION, query_vector=q.tolist(), limit=limit, with_payload=True,
+                             query_filter=category_filter([CATEGORIES[cat]]) if filtered else None,
+                             search_params=qm.SearchParams(hnsw_ef=128))
+        if not filtered:
+            hits = [h for h in hits if h.payload["category"] == CATEGORIES[cat]]
+        hits = hits[:k]
+        lat.append(time.perf_counter() - t0)
+        recall.append(len({h.id for h in hits} & gt) / k)
+        returned.append(len(hits))
+    return np.array(lat) * 1000, np.array(recall), np.array(returned)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--points", type=int, default=200_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--top-k", type=int, default=5)
+    ap.add_argument("--oversample", type=int, default=10, help="post-filter 후보 배수 (추가 비교용)")
+    ap.add_argument("--local", action="store_true")
+    args = ap.parse_args()
+
+    from qdrant_client import QdrantClient
+    client = QdrantClient(":memory:") if args.local else get_qdrant()
+    rng = np.random.default_rng(0)
+    t0 = time.perf_counter()
+    vecs, cats, centroids = seed(client, args.points, args.dim, rng)
+    print(f"seeded {args.points:,} points (dim {args.dim}) in {time.perf_counter() - t0:.1f}s, "
+          f"{'local (no payload index)' if args.local else 'server + keyword index on category'}")
+
+    k = args.top_k
+    targets = np.arange(args.queries) % len(CATEGORIES)  # 카테고리별 같은 수의 질의 (희귀 카테고리 포함)
+    queries = _unit(0.2 * centroids[targets] + rng.standard_normal((args.queries, args.dim)) / np.sqrt(args.dim))
+    truth = [_exact(vecs, cats, q, c, k) for q, c in zip(queries, targets)]
+    rare = FREQ[targets] <= 0.05
+
+    server_limit = max(k * 2, k + 4)  # /query 의 후보 수
+    rows = [
+        ("filtered (payload index)", k, True),
+        (f"post-filter, limit {server_limit}", server_limit, False),
+        (f"post-filter, limit {k * args.oversample}", k * args.oversample, False),
+    ]
+    print(f"\n{'method':<28} {'p50 ms':>7} {'p95 ms':>7} {'recall@%d' % k:>9} {'rare':>6} {'short':>6}")
+    for name, limit, filtered in rows:
+        run(client, queries[:5], targets[:5], k, limit, filtered, truth[:5])  # 워밍업
+        lat, recall, returned = run(client, queries, targets, k, limit, filtered, truth)
+        print(f"{name:<28} {np.percentile(lat, 50):7.2f} {np.percentile(lat, 95):7.2f} "
+              f"{recall.mean():9.3f} {recall[rare].mean():6.3f} {(returned < k).mean():6.1%}")
+    print("\nrare: 빈도 5% 이하 카테고리 질의의 recall, short: k개보다 적게 돌려준 질의 비율")
+    if args.local:
+        print("(--local: 인메모리 모드는 필터를 파이썬으로 점검하므로 filtered 지연은 서버 수치와 다름)")
+    client.delete_collection(COLLECTION)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# bench_crawler_parse.py
+# plan_summary_crawler 파싱 단계: 기존(BeautifulSoup html.parser + CSS 선택자) vs lxml XPath (직렬 / 프로세스 풀)
+#   실행: python -m benchmarks.bench_crawler_parse --cards 20000 --workers 4
+#   브라우저 없이 저장된 HTML(--html, 기본 benchmarks/fixtures/lgu_plan_all.html)의 카드를 복제해 큰 페이지를 만듦
+#   실제 페이지는 python -m lgu_plan_crawler.plan_summary_crawler --dump-html page.html 로 저장
+import argparse
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from lgu_plan_crawler.plan_summary_crawler import CARD_SELECTOR, PARSER, parse_plans
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'lgu_plan_all.html'
+LIST_PATTERN = re.compile(r'(<ul class="plan-list">)(.*?)(</ul>)', re.S)
+
+
+def legacy_parse(html):
+    """plan_summary_crawler 의 기존 파싱 구현 (비교 기준)"""
+    plans = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.select(CARD_SELECTOR):
+        plan_name, price, data_summary = None, None, None
+        try:
+            name_tag = card.select_one("button.btn-plan")
+            if name_tag:
+                plan_name = name_tag.text.strip()
+            price_tag = card.select_one("div.plan-price strong")
+            if price_tag:
+                price = int(price_tag.text.strip().replace(',', ''))
+            summary_tags = card.select("p.plan-info, dl.benefit-area dd")
+            if summary_tags:
+                data_summary = ' / '.join(tag.text.strip().replace('\n', ' ') for tag in summary_tags)
+            if plan_name and price is not None:
+                plans.append({'plan_name': plan_name, 'monthly_price': price,
+                              'data_summary': data_summary or "정보 없음"})
+        except Exception:
+            continue
+    return plans
+
+
+def inflate(html, cards):
+    """목록의 카드(li)를 복제해 cards 개 이상으로 늘린 페이지 (요금제 이름에 번호를 붙여 구분)"""
+    head, items, tail = LIST_PATTERN.search(html).groups()
+    blocks = re.findall(r'<li.*?</li>', items, re.S)
+    reps = -(-cards // len(blocks))
+    body = ''.join(
+        block.replace('</button>', f' {r}</button>', 1)
+        for r in range(reps) for block in blocks
+    )
+    return html.replace(items, '\n' + body + '\n', 1), reps * len(blocks)
+
+
+def _time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--html", default=str(FIXTURE))
+    ap.add_argument("--cards", type=int, default=20_000)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    html, n = inflate(Path(args.html).read_text(encoding='utf-8'), args.cards)
+    print(f"page: {n:,} cards, {len(html) / 1e6:.1f} MB, parser={PARSER}")
+
+    t_old, old = _time(lambda: legacy_parse(html), args.repeat)
+    print(f"legacy (html.parser, full tree)  {t_old:7.2f}s  plans={len(old):,}")
+
+    t_new, (serial, skipped) = _time(lambda: parse_plans(html), args.repeat)
+    print(f"{PARSER:<11} serial            {t_new:7.2f}s  plans={len(serial):,}  "
+          f"skipped={len(skipped):,}  identical={serial == old}")
+
+    t_par, (parallel, _) = _time(lambda: parse_plans(html, workers=args.workers), args.repeat)
+    print(f"{PARSER:<11} pool x{args.workers:<2}          {t_par:7.2f}s  identical={parallel == old}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# bench_embed_batcher.py
+# 동시 /query 임베딩: 요청별 aembed_query vs EmbedBatcher 묶음 처리
+#   실행: python -m benchmarks.bench_embed_batcher --concurrency 200 --embed-latency-ms 100 --max-wait-ms 5
+#   임베딩 API 호출 수, 전체 소요 시간, 요청별 지연 p50/p95, 배치 크기/대기 시간 분포를 출력
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.embed_batcher import BATCH_SIZE, QUEUE_DELAY, EmbedBatcher
+from benchmarks.fakes import FakeEmbeddings
+
+
+async def _run(embedder, n):
+    async def one(i):
+        t0 = time.perf_counter()
+        await embedder.aembed_query(f"요금제 문의 {i}")
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    lat = await asyncio.gather(*(one(i) for i in range(n)))
+    return time.perf_counter() - t0, np.array(lat) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--concurrency", type=int, default=200)
+    ap.add_argument("--embed-latency-ms", type=float, default=100.0)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    ap.add_argument("--max-batch", type=int, default=64)
+    args = ap.parse_args()
+
+    direct = FakeEmbeddings(latency_ms=args.embed_latency_ms)
+    wall, lat = asyncio.run(_run(direct, args.concurrency))
+    print(f"direct    calls {direct.calls:4d}  wall {wall * 1000:7.1f} ms  "
+          f"p50 {np.percentile(lat, 50):6.1f} ms  p95 {np.percentile(lat, 95):6.1f} ms")
+
+    inner = FakeEmbeddings(latency_ms=args.embed_latency_ms)
+    batcher = EmbedBatcher(inner, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    wall, lat = asyncio.run(_run(batcher, args.concurrency))
+    print(f"batched   calls {inner.calls:4d}  wall {wall * 1000:7.1f} ms  "
+          f"p50 {np.percentile(lat, 50):6.1f} ms  p95 {np.percentile(lat, 95):6.1f} ms")
+    n = BATCH_SIZE.count()
+    print(f"          mean batch {BATCH_SIZE.sum() / n:.1f} texts, "
+          f"mean queue delay {QUEUE_DELAY.sum() / QUEUE_DELAY.count() * 1000:.2f} ms")
+    print("\n(실제 API는 호출 수가 rate limit 과 연결 수를 좌우합니다. 지연은 배치 크기에 따라 조금 늘 수 있음)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# bench_import_time.py
+# app/ 진입점 import 시간 측정 (python -X importtime) + 회귀 검사
+#   실행: python -m benchmarks.bench_import_time [--repeat 3] [--budget-scale 1.0]
+#   - 각 모듈을 새 프로세스에서 import 해 누적 시간(최소값)을 출력
+#   - 예산(ms)을 넘거나 import 도중 네트워크가 필요하면(Qdrant 포트를 닫힌 포트로 지정) 종료 코드 1
+#   CI 에서 그대로 실행해 회귀 테스트로 사용합니다. (느린 머신에서는 --budget-scale 로 조정)
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 모듈별 import 예산(ms). 무거운 라이브러리(langchain_openai, openai)는 포함되면 안 됨
+BUDGETS_MS = {
+    "app.common": 150,
+    "app.query_questions": 400,
+    "app.ingest_questions": 900,
+    "app.server": 2500,
+}
+# import 시점에 로드되면 안 되는 모듈
+FORBIDDEN = {
+    "app.common": ["langchain_openai", "qdrant_client", "openai"],
+    "app.query_questions": ["langchain_openai", "qdrant_client", "openai"],
+    "app.ingest_questions": ["langchain_openai", "qdrant_client", "openai"],
+    "app.server": ["langchain_openai", "openai"],
+}
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module):
+    """(누적 import 시간 ms, 로드된 모듈 집합). 실패 시 RuntimeError"""
+    env = {**os.environ, "OPENAI_API_KEY": "sk-import-bench", "EMBED_CACHE_PATH": "",
+           # 닫힌 포트: import 중 Qdrant 에 접속하면 실패
+           "QDRANT_HOST": "127.0.0.1", "QDRANT_PORT": "9", "QDRANT_GRPC_PORT": "9"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    total, loaded = 0, set()
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        loaded.add(m.group(4))
+        if m.group(4) == module:
+            total = int(m.group(2))
+    return total / 1000, loaded
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--budget-scale", type=float, default=1.0)
+    args = ap.parse_args()
+
+    failures = []
+    for module, budget in BUDGETS_MS.items():
+        budget *= args.budget_scale
+        try:
+            runs = [import_profile(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:24s}  FAILED  {e}")
+            failures.append(module)
+            continue
+        ms = min(t for t, _ in runs)
+        heavy = [name for name in FORBIDDEN.get(module, []) if name in runs[0][1]]
+        ok = ms <= budget and not heavy
+        print(f"{module:24s} {ms:8.1f} ms  (budget {budget:6.0f} ms)  {'ok' if ok else 'REGRESSION'}"
+              + (f"  loads {', '.join(heavy)}" if heavy else ""))
+        if not ok:
+            failures.append(module)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# bench_langchain_agent.py
+# 02_chatbot_langchain.py 시작 시간 / 도구 호출당 오버헤드
+#   실행: python -m benchmarks.bench_langchain_agent [--hub] [--calls 200]
+#   - prompt    : 로컬 react_prompt.txt 로드 vs hub.pull (--hub 일 때만 네트워크 호출)
+#   - per-call  : 도구 호출마다 프롬프트/체인 생성(기존) vs 시작 시 1회 생성한 체인 재사용
+#   - cold start: 가짜 LLM/임베딩으로 모듈 import 전체 시간 (별도 프로세스, 실패하면 벤치마크도 실패)
+# LLM은 FakeListChatModel 이므로 측정값은 네트워크를 뺀 프레임워크 오버헤드입니다.
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE = ROOT / 'lgu_plan_chatbot_langchain' / '02_chatbot_langchain.py'
+PROMPT_FILE = ROOT / 'lgu_plan_chatbot_langchain' / 'react_prompt.txt'
+
+RAG_TEMPLATE = """당신은 LG U+ 요금제 전문 상담원입니다.
+[참고 정보]
+{context}
+
+[질문]
+{question}
+"""
+
+DOCS = [Document(page_content=f"요금제명 5G 요금제 {i}, 월 {30000 + i * 1000}원") for i in range(5)]
+
+# 가짜 LLM/임베딩으로 바꿔 모듈을 import 하는 하위 프로세스 스크립트
+COLD_START = r'''
+import importlib.util, sys, time
+t0 = time.perf_counter()
+import langchain_openai
+from langchain_core.embeddings import FakeEmbeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+langchain_openai.ChatOpenAI = lambda **kw: FakeListChatModel(responses=["ok"])
+langchain_openai.OpenAIEmbeddings = lambda **kw: FakeEmbeddings(size=32)
+spec = importlib.util.spec_from_file_location("chatbot_langchain", sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(f"{time.perf_counter() - t0:.3f}")
+'''
+
+
+def _format_docs(docs):
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+def bench_prompt(hub):
+    t0 = time.perf_counter()
+    PromptTemplate.from_template(PROMPT_FILE.read_text(encoding='utf-8'))
+    print(f"prompt      local file      {(time.perf_counter() - t0) * 1000:8.2f} ms")
+    if hub:
+        from langchain import hub as lc_hub
+        t0 = time.perf_counter()
+        lc_hub.pull("hwchase17/react")
+        print(f"prompt      hub.pull        {(time.perf_counter() - t0) * 1000:8.2f} ms")
+
+
+def bench_per_call(calls):
+    llm = FakeListChatModel(responses=["답변"])
+    retriever = RunnableLambda(lambda q: DOCS)
+
+    def rebuild(query):
+        prompt = ChatPromptTemplate.from_template(RAG_TEMPLATE)
+        chain = {"context": retriever | _format_docs, "question": RunnablePassthrough()} | prompt | llm | StrOutputParser()
+        return chain.invoke(query)
+
+    prebuilt = ({"context": retriever | _format_docs, "question": RunnablePassthrough()}
+                | ChatPromptTemplate.from_template(RAG_TEMPLATE) | llm | StrOutputParser())
+
+    for name, fn in [("rebuild per call", rebuild), ("prebuilt chain", prebuilt.invoke)]:
+        fn("워밍업")
+        t0 = time.perf_counter()
+        for i in range(calls):
+            fn(f"청소년 요금제 {i}")
+        print(f"per-call    {name:16s}{(time.perf_counter() - t0) / calls * 1000:8.2f} ms")
+
+
+def bench_cold_start():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, 'chroma_db_langchain'))
+        Path(tmp, 'lgu_plans_refined.csv').write_text(
+            "plan_name,monthly_price,data_gb,data_type,data_speed_limit,sharing_data,voice_call,sms,tags\n"
+            "5G 요금제,55000,31,기본제공,제한없음,제공안함,무제한,기본제공,5G\n", encoding='utf-8')
+        # cwd 가 임시 폴더이므로 패키지 import(lgu_plan_crawler, app)를 위해 레포 루트를 경로에 추가
+        env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-bench"),
+               "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+        proc = subprocess.run([sys.executable, "-c", COLD_START, str(MODULE)], cwd=tmp, env=env,
+                              capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        sys.exit(f"cold start  failed (exit {proc.returncode})")
+    print(f"cold start  module import   {float(proc.stdout.strip().splitlines()[-1]) * 1000:8.0f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--hub", action="store_true", help="hub.pull 도 측정 (네트워크 필요)")
+    ap.add_argument("--calls", type=int, default=200)
+    args = ap.parse_args()
+    bench_prompt(args.hub)
+    bench_per_call(args.calls)
+    bench_cold_start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_lexical.py
+# 문자 n-gram BM25 색인: 색인 생성 시간, 질의 지연, 어휘 fast path(임베딩 생략) 비율
+#   실행: python -m benchmarks.bench_lexical --rows 5000
+import argparse
+import time
+
+import numpy as np
+
+from app.lexical import HybridSearcher
+from benchmarks.bench_plan_refine import synthetic_catalog
+from lgu_plan_crawler.plan_refine import refine_frame
+
+QUERIES = [
+    "5G 프리미어 에센셜", "너겟 33", "LTE 청소년 요금제", "5G 키즈", "시니어 요금제",
+    "데이터무제한 5G", "청소년이 쓸만한 요금제 추천해줘", "데이터 많이 쓰는 사람한테 좋은 거",
+    "가성비 좋은 요금제 뭐 있어?", "부모님께 드릴 저렴한 요금제",
+]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    df = refine_frame(synthetic_catalog(args.rows))
+    texts = (
+        "요금제명 " + df['plan_name'] + ", 월 " + df['monthly_price'].astype(str) + "원, 데이터 "
+        + df['data_gb'].astype(str) + "GB, 특징 " + df['tags']
+    ).tolist()
+
+    vector_calls = [0]
+
+    def vector_search(query, k):
+        vector_calls[0] += 1
+        return []
+
+    t0 = time.perf_counter()
+    searcher = HybridSearcher(texts, range(len(texts)), vector_search=vector_search)
+    print(f"index build  {len(texts):>7,} docs  {time.perf_counter() - t0:7.3f}s  "
+          f"({len(searcher.index.postings):,} n-grams)")
+
+    lat = []
+    for _ in range(args.repeat):
+        for q in QUERIES:
+            t0 = time.perf_counter()
+            searcher.search(q, k=5)
+            lat.append(time.perf_counter() - t0)
+    lat = np.array(lat) * 1000
+    total = len(lat)
+    print(f"query        p50 {np.percentile(lat, 50):6.2f} ms  p95 {np.percentile(lat, 95):6.2f} ms")
+    print(f"fast path    {searcher.stats['lexical'] / total:6.1%} of queries skipped the embedding call "
+          f"({vector_calls[0]} vector searches / {total} queries)")
+    for q in QUERIES:
+        print(f"  {searcher.search(q, k=5)[1]:8s} {q}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# bench_mmr.py
+# 기존 per-pair 루프 MMR vs 벡터화 MMR(app/mmr.py) 마이크로 벤치마크
+#   실행: python -m benchmarks.bench_mmr
+import argparse
+import time
+import numpy as np
+
+from app.mmr import mmr_select, mmr_select_batch
+
+
+def legacy_mmr(qvec, vecs, k=5, lam=0.5):
+    """app/server.py::_mmr 의 기존 구현 (인덱스 반환 버전)"""
+    def cos(a, b): return float(np.dot(a, b) / (np.linalg.norm(a)*np.linalg.norm(b)+1e-12))
+    S, rest = [], list(range(len(vecs)))
+    first = max(rest, key=lambda i: cos(qvec, vecs[i]))
+    S.append(first); rest.remove(first)
+    while len(S) < min(k, len(vecs)) and rest:
+        def score(i):
+            rel = cos(qvec, vecs[i])
+            div = max(cos(vecs[i], vecs[j]) for j in S) if S else 0.0
+            return lam*rel - (1-lam)*div
+        j = max(rest, key=score)
+        S.append(j); rest.remove(j)
+    return S
+
+
+def _timeit(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dim", type=int, default=1536)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[12, 24, 50, 100, 200, 500])
+    ap.add_argument("--batch", type=int, default=16, help="배치 MMR 쿼리 수")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>5} {'k':>4} {'legacy(ms)':>11} {'vector(ms)':>11} {'speedup':>8} "
+          f"{'batch/q(ms)':>12} {'same':>5}")
+    for n in args.sizes:
+        k = min(50, max(5, n // 2))
+        q = rng.standard_normal(args.dim)
+        vecs = rng.standard_normal((n, args.dim))
+        t_old = _timeit(lambda: legacy_mmr(q, vecs, k=k), max(1, args.repeat if n <= 200 else 1))
+        t_new = _timeit(lambda: mmr_select(q, vecs, k=k), args.repeat)
+
+        qs = rng.standard_normal((args.batch, args.dim))
+        cands = rng.standard_normal((args.batch, n, args.dim)).astype(np.float32)
+        t_batch = _timeit(lambda: mmr_select_batch(qs, cands, k=k), args.repeat) / args.batch
+
+        same = legacy_mmr(q, vecs, k=k) == mmr_select(q, vecs, k=k)
+        print(f"{n:>5} {k:>4} {t_old*1e3:>11.2f} {t_new*1e3:>11.3f} {t_old/t_new:>7.0f}x "
+              f"{t_batch*1e3:>12.3f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
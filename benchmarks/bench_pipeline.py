@@ -0,0 +1,93 @@
+# bench_pipeline.py
+# 증분 파이프라인: 전체 재생성 vs 변경된 요금제만 정제/임베딩
+#   실행: python -m benchmarks.bench_pipeline --plans 5000 --changes 0 1 10 100 --embed-latency-ms 200
+#   임베딩은 FakeEmbeddings(호출당 지연 + 100개 단위 배치)로 대체. 증분 결과가 전체 재생성과 같은지도 확인
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_plan_refine import synthetic_catalog
+from benchmarks.fakes import FakeEmbeddings
+from lgu_plan_crawler.pipeline import EMBEDDINGS_FILE, PLAN_DATA_FILE, REFINED_FILE, run_pipeline
+
+
+class BatchedFake(FakeEmbeddings):
+    """OpenAI 처럼 요청당 최대 batch 개씩 나눠 호출 (호출 수 = 지연 횟수)"""
+
+    def __init__(self, batch=100, **kwargs):
+        super().__init__(**kwargs)
+        self.batch = batch
+        self.texts = 0
+
+    def embed_documents(self, texts):
+        self.texts += len(texts)
+        out = []
+        for i in range(0, len(texts), self.batch):
+            out += super().embed_documents(texts[i:i + self.batch])
+        return out
+
+
+def mutate(raw, k, seed):
+    """k개 요금제 가격 변경 (+ 1개 삭제, 1개 추가)"""
+    rng = np.random.default_rng(seed)
+    raw = raw.copy()
+    if k:
+        idx = rng.choice(len(raw), k, replace=False)
+        raw.loc[idx, 'monthly_price'] += 1000
+        raw = pd.concat([raw.drop(index=raw.index[-1]),
+                         pd.DataFrame([{'plan_name': f'5G 신규 요금제 {seed}', 'monthly_price': 49000,
+                                        'data_summary': '데이터 30GB / 기본제공'}])], ignore_index=True)
+    return raw
+
+
+def _outputs(out_dir):
+    d = Path(out_dir)
+    return (pd.read_csv(d / REFINED_FILE), pd.read_json(d / PLAN_DATA_FILE, orient='records', lines=True),
+            np.load(d / EMBEDDINGS_FILE))
+
+
+def _same(a, b):
+    return a[0].equals(b[0]) and a[1].equals(b[1]) and np.allclose(a[2], b[2])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plans", type=int, default=5000)
+    ap.add_argument("--changes", type=int, nargs="+", default=[0, 1, 10, 100])
+    ap.add_argument("--embed-latency-ms", type=float, default=200.0)
+    args = ap.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="bench_pipeline_"))
+    try:
+        raw = synthetic_catalog(args.plans)
+        emb = BatchedFake(latency_ms=args.embed_latency_ms)
+        t0 = time.perf_counter()
+        run_pipeline(raw, out_dir=work / 'inc', emb=emb)
+        print(f"initial build   {args.plans:,} plans  {time.perf_counter() - t0:7.2f}s  "
+              f"embedded {emb.texts:,} texts in {emb.calls} calls\n")
+
+        print(f"{'changes':>8} {'incremental':>12} {'embedded':>9} {'calls':>6} {'full':>9} {'identical':>10}")
+        for seed, k in enumerate(args.changes, start=1):
+            raw = mutate(raw, k, seed)
+            emb = BatchedFake(latency_ms=args.embed_latency_ms)
+            t0 = time.perf_counter()
+            run_pipeline(raw, out_dir=work / 'inc', emb=emb)
+            t_inc = time.perf_counter() - t0
+            inc_texts, inc_calls = emb.texts, emb.calls
+
+            t0 = time.perf_counter()
+            run_pipeline(raw, out_dir=work / 'full', emb=BatchedFake(latency_ms=args.embed_latency_ms), full=True)
+            t_full = time.perf_counter() - t0
+            same = _same(_outputs(work / 'inc'), _outputs(work / 'full'))
+            print(f"{k:>8} {t_inc:>11.2f}s {inc_texts:>9,} {inc_calls:>6} {t_full:>8.2f}s {str(same):>10}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
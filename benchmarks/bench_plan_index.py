@@ -0,0 +1,115 @@
+# bench_plan_index.py
+# build_retriever: 기존(매 호출 np.load + read_json + cosine_similarity + argsort)
+#                  vs PlanIndex(상주 + mmap + float32/float16/int8 + argpartition)
+# 로드 시간 / RSS 증가량 / 쿼리 지연시간 / top-k 일치율 비교
+#   실행: python -m benchmarks.bench_plan_index --plans 20000
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from lgu_plan_crawler.plan_index import PlanIndex
+
+
+def _rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _cosine(q, m):
+    try:
+        from sklearn.metrics.pairwise import cosine_similarity
+        return cosine_similarity(q, m)[0]
+    except ImportError:
+        m = m / np.linalg.norm(m, axis=1, keepdims=True)
+        q = q / np.linalg.norm(q, axis=1, keepdims=True)
+        return (q @ m.T)[0]
+
+
+def make_fixture(workdir, n, dim, rng):
+    emb = rng.standard_normal((n, dim)).astype(np.float64)
+    df = pd.DataFrame({
+        "plan_name": [f"요금제 {i}" for i in range(n)],
+        "monthly_price": rng.integers(10_000, 130_000, n),
+        "data_gb": rng.choice([1.5, 7.0, 31.0, 150.0, 9999.0], n),
+        "data_type": rng.choice(["기본제공", "무제한", "기본제공후속도제어"], n),
+        "tags": rng.choice(["5G", "LTE,알뜰/가성비", "5G,데이터무제한", "청소년/키즈"], n),
+    })
+    np.save(os.path.join(workdir, "plan_embeddings_openai.npy"), emb)
+    df.to_json(os.path.join(workdir, "plan_data.json"), orient="records", lines=True, force_ascii=False)
+    for dtype in ("float32", "float16", "int8"):
+        PlanIndex.build(emb, df, os.path.join(workdir, f"index_{dtype}"), dtype=dtype)
+
+
+def _run(variant, workdir, queries, top_k, out):
+    rss0 = _rss_mb()
+    t0 = time.perf_counter()
+    if variant == "legacy":
+        # 로드가 매 호출마다 일어나므로 로드 시간 = 1회 로드 비용
+        plan_embeddings = np.load(os.path.join(workdir, "plan_embeddings_openai.npy"))
+        pd.read_json(os.path.join(workdir, "plan_data.json"), orient="records", lines=True)
+        load = time.perf_counter() - t0
+        rss = _rss_mb() - rss0
+        lat, tops = [], []
+        for q in queries:
+            t = time.perf_counter()
+            pe = np.load(os.path.join(workdir, "plan_embeddings_openai.npy"))
+            plans_df = pd.read_json(os.path.join(workdir, "plan_data.json"), orient="records", lines=True)
+            sims = _cosine(q[None, :], pe)
+            top = sims.argsort()[-top_k:][::-1]
+            plans_df.iloc[top]
+            lat.append(time.perf_counter() - t)
+            tops.append(top.tolist())
+        del plan_embeddings
+    else:
+        index = PlanIndex.load(os.path.join(workdir, f"index_{variant}"))
+        index.scores(queries[:1])  # 첫 접근(페이지 로드) 포함
+        load = time.perf_counter() - t0
+        rss = _rss_mb() - rss0
+        lat, tops = [], []
+        for q in queries:
+            t = time.perf_counter()
+            rows, _ = index.search(q, top_k=top_k)
+            lat.append(time.perf_counter() - t)
+            tops.append(index.top_k(index.scores(q)[0], top_k).tolist())
+    out.put((variant, load, rss, np.percentile(np.array(lat) * 1e3, [50, 95]), tops))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plans", type=int, default=20000)
+    ap.add_argument("--dim", type=int, default=1536)
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--top-k", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((args.queries, args.dim))
+    ctx = mp.get_context("spawn")  # 변형마다 새 프로세스 → RSS 독립 측정
+    with tempfile.TemporaryDirectory() as workdir:
+        make_fixture(workdir, args.plans, args.dim, rng)
+        results = {}
+        for variant in ("legacy", "float32", "float16", "int8"):
+            q = ctx.Queue()
+            p = ctx.Process(target=_run, args=(variant, workdir, queries, args.top_k, q))
+            p.start()
+            results[variant] = q.get()
+            p.join()
+
+    base = results["legacy"][4]
+    print(f"plans={args.plans} dim={args.dim} top_k={args.top_k}")
+    print(f"{'variant':>8} {'load(ms)':>9} {'RSS(MB)':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'recall':>7}")
+    for variant, load, rss, (p50, p95), tops in results.values():
+        recall = np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(base, tops)])
+        print(f"{variant:>8} {load*1e3:>9.1f} {rss:>8.1f} {p50:>9.3f} {p95:>9.3f} {recall:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# bench_plan_query.py
+# 조건 검색: 매 호출 sort_values vs PlanCatalog(로드 시 정렬 인덱스 1회 생성)
+#   실행: python -m benchmarks.bench_plan_query --plans 100000
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from lgu_plan_crawler.plan_query import PlanCatalog
+
+
+def _best(fn, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plans", type=int, default=100_000)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.plans
+    df = pd.DataFrame({
+        "plan_name": [f"요금제 {i}" for i in range(n)],
+        "monthly_price": rng.integers(10_000, 130_000, n),
+        "data_gb": rng.choice([1.5, 7.0, 31.0, 150.0, 9999.0], n),
+        "data_type": rng.choice(["기본제공", "무제한"], n),
+        "tags": rng.choice(["5G", "LTE,알뜰/가성비", "5G,데이터무제한", "청소년/키즈", ""], n),
+    })
+
+    t0 = time.perf_counter()
+    catalog = PlanCatalog(df)
+    build_ms = (time.perf_counter() - t0) * 1e3
+
+    legacy_top = lambda: json.loads(df.sort_values(by="monthly_price", ascending=False).head(3).to_json(orient="records"))
+    legacy_filter = lambda: json.loads(
+        df[(df.monthly_price <= 40000) & (df.data_gb >= 10) & df.tags.str.contains("5G")]
+        .sort_values(by="monthly_price").head(5).to_json(orient="records"))
+
+    print(f"plans={n}  catalog build {build_ms:.1f}ms (1회)")
+    print(f"{'query':<28} {'sort_values(ms)':>16} {'catalog(ms)':>12}")
+    print(f"{'top-3 max price':<28} {_best(legacy_top):>16.3f} "
+          f"{_best(lambda: catalog.top('max', 'monthly_price', 3)):>12.3f}")
+    print(f"{'price<=40000,data>=10,5G':<28} {_best(legacy_filter):>16.3f} "
+          f"{_best(lambda: catalog.filter(max_price=40000, min_data_gb=10, tags=['5G'], k=5)):>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# bench_plan_refine.py
+# plan_refine: 기존 iterrows + df.loc 구현 vs 컬럼 단위 구현(직렬 / 프로세스 풀)
+#   실행: python -m benchmarks.bench_plan_refine --rows 1000000 --workers 4
+#   기존 구현은 --legacy-rows 행에서만 측정하고 1M행 기준으로 환산합니다.
+import argparse
+import io
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from lgu_plan_crawler.plan_refine import refine_frame, REFINED_COLUMNS
+
+
+def legacy_refine(df):
+    """plan_refine.refine_plan_data 의 기존 행 단위 구현 (비교 기준)"""
+    df = df.copy()
+    df['data_gb'] = 0
+    df['data_type'] = '기본제공'
+    df['data_speed_limit'] = '제한없음'
+    df['sharing_data'] = '제공안함'
+    df['voice_call'] = '기본제공'
+    df['sms'] = '기본제공'
+    df['tags'] = ''
+    for index, row in df.iterrows():
+        summary = row['data_summary']
+        plan_name = row['plan_name']
+        if '데이터 무제한' in summary:
+            df.loc[index, 'data_gb'] = 9999
+            df.loc[index, 'data_type'] = '무제한'
+        else:
+            gb_match = re.search(r'데이터 (\d+\.?\d*)\s?GB', summary)
+            mb_match = re.search(r'데이터 (\d+\.?\d*)\s?MB', summary)
+            if gb_match:
+                df.loc[index, 'data_gb'] = float(gb_match.group(1))
+            elif mb_match:
+                df.loc[index, 'data_gb'] = float(mb_match.group(1)) / 1024
+        speed_match = re.search(r'최대 (\d+)\s?(Mbps|Kbps)', summary)
+        if speed_match:
+            df.loc[index, 'data_speed_limit'] = f"{speed_match.group(1)}{speed_match.group(2)}"
+            df.loc[index, 'data_type'] = '기본제공후속도제어'
+        sharing_match = re.search(r'(테더링|쉐어링)\s?\+?\s?(\d+GB)', summary)
+        if sharing_match:
+            df.loc[index, 'sharing_data'] = sharing_match.group(2)
+        if '집/이동전화 무제한' in summary:
+            df.loc[index, 'voice_call'] = '무제한'
+        else:
+            voice_match = re.search(r'(\d+)분', summary)
+            if voice_match:
+                df.loc[index, 'voice_call'] = f"{voice_match.group(1)}분"
+        if '기본제공' in summary:
+            df.loc[index, 'sms'] = '기본제공'
+        else:
+            sms_match = re.search(r'(\d+)건', summary)
+            if sms_match:
+                df.loc[index, 'sms'] = f"{sms_match.group(1)}건"
+        tags = []
+        if '5G' in plan_name:
+            tags.append('5G')
+        if 'LTE' in plan_name:
+            tags.append('LTE')
+        if '청소년' in plan_name or '키즈' in plan_name or '주니어' in plan_name:
+            tags.append('청소년/키즈')
+        if '시니어' in plan_name:
+            tags.append('시니어')
+        if df.loc[index, 'data_type'] == '무제한':
+            tags.append('데이터무제한')
+        elif df.loc[index, 'data_gb'] >= 100:
+            tags.append('데이터많이')
+        if row['monthly_price'] <= 40000:
+            tags.append('알뜰/가성비')
+        df.loc[index, 'tags'] = ','.join(tags)
+    return df[REFINED_COLUMNS]
+
+
+def synthetic_catalog(n, seed=0):
+    rng = np.random.default_rng(seed)
+    names = np.array(['5G 프리미어 에센셜', 'LTE 청소년 요금제', '5G 시니어 A형', '5G 키즈 29',
+                      '너겟 33', 'LTE 데이터 33', '5G 다이렉트 65', '주니어 LTE'])
+    parts = np.array(['데이터 무제한', '데이터 5GB', '데이터 31GB', '데이터 150GB', '데이터 1.5GB',
+                      '데이터 300MB', '최대 1Mbps 속도 제어', '최대 400Kbps', '테더링+쉐어링 40GB',
+                      '집/이동전화 무제한', '부가통화 300분', '기본제공', '250건', '정보 없음'])
+    picks = rng.integers(0, len(parts), (n, 3))
+    summary = pd.Series(parts[picks[:, 0]]) + ' / ' + parts[picks[:, 1]] + ' / ' + parts[picks[:, 2]]
+    return pd.DataFrame({
+        'plan_name': pd.Series(names[rng.integers(0, len(names), n)]) + ' ' + pd.Series(np.arange(n)).astype(str),
+        'monthly_price': rng.choice([22000, 33000, 40000, 55000, 85000, 130000], n),
+        'data_summary': summary,
+    })
+
+
+def _csv_bytes(df):
+    buf = io.StringIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--legacy-rows", type=int, default=20_000)
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    import warnings
+    warnings.simplefilter("ignore", FutureWarning)  # 기존 구현의 dtype 업캐스트 경고
+
+    small = synthetic_catalog(args.legacy_rows, seed=1)
+    t0 = time.perf_counter()
+    old = legacy_refine(small)
+    t_legacy = time.perf_counter() - t0
+    same = _csv_bytes(old) == _csv_bytes(refine_frame(small))
+    print(f"legacy      {args.legacy_rows:>9,} rows  {t_legacy:8.2f}s  "
+          f"(→ {args.rows:,} rows ≈ {t_legacy * args.rows / args.legacy_rows:,.0f}s)  identical={same}")
+
+    df = synthetic_catalog(args.rows)
+    t0 = time.perf_counter()
+    serial = refine_frame(df)
+    t_serial = time.perf_counter() - t0
+    print(f"vectorized  {args.rows:>9,} rows  {t_serial:8.2f}s")
+
+    t0 = time.perf_counter()
+    parallel = refine_frame(df, workers=args.workers)
+    t_par = time.perf_counter() - t0
+    print(f"pool x{args.workers:<4} {args.rows:>9,} rows  {t_par:8.2f}s  "
+          f"identical={serial.reset_index(drop=True).equals(parallel.reset_index(drop=True))}")
+
+
+if __name__ == "__main__":
+    main()
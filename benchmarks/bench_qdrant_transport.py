@@ -0,0 +1,103 @@
+# bench_qdrant_transport.py
+# REST(6333) vs gRPC(6334) 검색 지연시간 / 응답 크기 비교 (with_vectors=True)
+#   실행: python -m benchmarks.bench_qdrant_transport --points 5000 --queries 200
+#   실행 중인 Qdrant 서버가 필요합니다 (QDRANT_HOST / QDRANT_PORT / QDRANT_GRPC_PORT).
+import argparse
+import json
+import time
+import uuid
+
+import httpx
+import numpy as np
+from qdrant_client import grpc
+from qdrant_client.http import models as qm
+
+from app.common import get_qdrant, EMBED_DIM, QDRANT_HOST, QDRANT_PORT
+
+
+def _percentiles(xs):
+    a = np.asarray(xs) * 1e3
+    return np.percentile(a, 50), np.percentile(a, 95), np.percentile(a, 99)
+
+
+def seed(collection: str, n: int, dim: int, rng):
+    client = get_qdrant(prefer_grpc=True)
+    client.recreate_collection(
+        collection_name=collection,
+        vectors_config=qm.VectorParams(size=dim, distance=qm.Distance.COSINE),
+    )
+    for i in range(0, n, 512):
+        m = min(512, n - i)
+        vecs = rng.standard_normal((m, dim)).astype(np.float32)
+        client.upsert(collection_name=collection, points=[
+            qm.PointStruct(id=str(uuid.uuid4()), vector=v.tolist(),
+                           payload={"question": f"질문 {i + j}", "category": "bench"})
+            for j, v in enumerate(vecs)
+        ])
+
+
+def bench_client(collection, queries, top_k, prefer_grpc):
+    client = get_qdrant(prefer_grpc=prefer_grpc)
+    lat = []
+    for q in queries:
+        t0 = time.perf_counter()
+        client.search(collection_name=collection, query_vector=q.tolist(), limit=top_k,
+                      with_payload=True, with_vectors=True,
+                      search_params=qm.SearchParams(hnsw_ef=128))
+        lat.append(time.perf_counter() - t0)
+    return lat
+
+
+def rest_payload_bytes(collection, q, top_k):
+    body = {"vector": q.tolist(), "limit": top_k, "with_payload": True, "with_vector": True,
+            "params": {"hnsw_ef": 128}}
+    url = f"http://{QDRANT_HOST}:{QDRANT_PORT}/collections/{collection}/points/search"
+    req_bytes = len(json.dumps(body).encode())
+    resp = httpx.post(url, json=body)
+    resp.raise_for_status()
+    return req_bytes, len(resp.content)
+
+
+def grpc_payload_bytes(collection, q, top_k):
+    req = grpc.SearchPoints(
+        collection_name=collection, vector=q.tolist(), limit=top_k,
+        with_payload=grpc.WithPayloadSelector(enable=True),
+        with_vectors=grpc.WithVectorsSelector(enable=True),
+        params=grpc.SearchParams(hnsw_ef=128),
+    )
+    resp = get_qdrant(prefer_grpc=True).grpc_points.Search(req)
+    return req.ByteSize(), resp.ByteSize()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--collection", default="bench_transport")
+    ap.add_argument("--points", type=int, default=5000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--top-k", type=int, nargs="+", default=[10, 50, 100])
+    ap.add_argument("--dim", type=int, default=EMBED_DIM)
+    ap.add_argument("--keep", action="store_true", help="벤치 후 컬렉션 유지")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"seeding {args.points} x {args.dim} vectors into '{args.collection}' ...")
+    seed(args.collection, args.points, args.dim, rng)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    print(f"{'top_k':>5} {'transport':>9} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} "
+          f"{'req(B)':>9} {'resp(B)':>10}")
+    try:
+        for k in args.top_k:
+            for name, prefer_grpc, sizer in (("rest", False, rest_payload_bytes),
+                                             ("grpc", True, grpc_payload_bytes)):
+                bench_client(args.collection, queries[:10], k, prefer_grpc)  # warm-up
+                p50, p95, p99 = _percentiles(bench_client(args.collection, queries, k, prefer_grpc))
+                req_b, resp_b = sizer(args.collection, queries[0], k)
+                print(f"{k:>5} {name:>9} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {req_b:>9} {resp_b:>10}")
+    finally:
+        if not args.keep:
+            get_qdrant().delete_collection(args.collection)
+
+
+if __name__ == "__main__":
+    main()
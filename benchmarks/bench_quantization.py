@@ -0,0 +1,145 @@
+# bench_quantization.py
+# questions 컬렉션 저장 옵션별 recall / 지연 / 메모리 리포트 (정답: numpy 전수 비교 상위 k)
+#   실행: python -m benchmarks.bench_quantization --points 100000 --queries 200 --report quantization_report.md
+#   실행 중인 Qdrant 서버가 필요합니다 (QDRANT_HOST / QDRANT_PORT). --local 은 코드 경로 확인용
+#   (인메모리 모드는 HNSW/양자화 없이 전수 비교하므로 recall 은 항상 1.0)
+#   메모리는 설정으로 계산한 추정치: 원본 벡터(RAM 또는 디스크) + 양자화 벡터 + HNSW 0층 링크
+import argparse
+import time
+
+import numpy as np
+from qdrant_client.http import models as qm
+
+from app.common import EMBED_DIM, collection_config, get_qdrant, search_params
+
+COLLECTION = "bench_quantization"
+
+# (이름, collection_config 인자, search_params 인자)
+CONFIGS = [
+    ("float32 m16/ef100", {}, {}),
+    ("float32 m32/ef256", {"m": 32, "ef_construct": 256}, {}),
+    ("scalar int8 + rescore", {"quantization": "scalar"}, {"rescore": True}),
+    ("scalar int8, no rescore", {"quantization": "scalar"}, {"rescore": False}),
+    ("scalar int8 + on_disk + rescore", {"quantization": "scalar", "on_disk": True}, {"rescore": True}),
+    ("product x16 + rescore", {"quantization": "product", "compression": "x16"}, {"rescore": True}),
+    ("product x32 + rescore x4", {"quantization": "product", "compression": "x32"},
+     {"rescore": True, "oversampling": 4.0}),
+]
+
+
+def synthetic(n, dim, rng, clusters=64):
+    """임베딩처럼 군집이 있는 단위 벡터"""
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    x = centers[rng.integers(0, clusters, n)] + 1.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def exact_topk(vecs, queries, k, block=256):
+    out = []
+    for s in range(0, len(queries), block):
+        sims = queries[s:s + block] @ vecs.T
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        out.extend(set(row.tolist()) for row in top)
+    return out
+
+
+def estimate_bytes(n, dim, opts):
+    """(RAM, 디스크) 추정"""
+    m = opts.get("m", 16)
+    raw = n * dim * 4
+    quant = {"scalar": n * dim, "product": n * dim * 4 // int(opts.get("compression", "x16")[1:])}.get(
+        opts.get("quantization"), 0)
+    graph = n * m * 2 * 4
+    ram = (0 if opts.get("on_disk") else raw) + quant + graph
+    return ram, raw + quant + graph
+
+
+def build(client, vecs, opts, batch=1024, timeout=1800):
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    # 적재 중에는 색인을 미루고 끝난 뒤 한 번에 생성
+    client.create_collection(COLLECTION, optimizers_config=qm.OptimizersConfigDiff(indexing_threshold=0),
+                             **collection_config(dim=vecs.shape[1], **opts))
+    for s in range(0, len(vecs), batch):
+        client.upload_points(COLLECTION, points=[
+            qm.PointStruct(id=i, vector=vecs[i].tolist()) for i in range(s, min(s + batch, len(vecs)))
+        ], wait=True)
+    client.update_collection(COLLECTION, optimizer_config=qm.OptimizersConfigDiff(indexing_threshold=20000))
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < timeout:
+        info = client.get_collection(COLLECTION)
+        if info.status == qm.CollectionStatus.GREEN:
+            break
+        time.sleep(1)
+
+
+def measure(client, queries, truth, k, ef, params):
+    lat, recall = [], []
+    sp = search_params(ef, **params)
+    for q, gt in zip(queries, truth):
+        t0 = time.perf_counter()
+        hits = client.search(COLLECTION, query_vector=q.tolist(), limit=k, search_params=sp)
+        lat.append(time.perf_counter() - t0)
+        recall.append(len({h.id for h in hits} & gt) / k)
+    lat = np.array(lat) * 1000
+    return np.percentile(lat, 50), np.percentile(lat, 95), float(np.mean(recall))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--points", type=int, default=100_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--dim", type=int, default=EMBED_DIM)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--ef", type=int, default=128)
+    ap.add_argument("--report", help="마크다운 리포트 저장 경로")
+    ap.add_argument("--local", action="store_true")
+    args = ap.parse_args()
+
+    from qdrant_client import QdrantClient
+    client = QdrantClient(":memory:") if args.local else get_qdrant()
+    rng = np.random.default_rng(0)
+    vecs = synthetic(args.points, args.dim, rng)
+    queries = synthetic(args.queries, args.dim, np.random.default_rng(1))
+    truth = exact_topk(vecs, queries, args.top_k)
+    lat = []
+    for q in queries:  # 전수 비교 지연도 질의 1건 단위로 측정
+        t0 = time.perf_counter()
+        sims = vecs @ q
+        np.argpartition(-sims, args.top_k - 1)[:args.top_k]
+        lat.append(time.perf_counter() - t0)
+    exact_p50, exact_p95 = np.percentile(lat, 50) * 1000, np.percentile(lat, 95) * 1000
+
+    header = (f"| config | recall@{args.top_k} | p50 ms | p95 ms | RAM (est.) | disk (est.) | build s |\n"
+              f"|---|---:|---:|---:|---:|---:|---:|")
+    rows = [f"| exact (numpy brute force) | 1.000 | {exact_p50:.2f} | {exact_p95:.2f} | "
+            f"{args.points * args.dim * 4 / 2**20:,.0f} MB | - | - |"]
+    print(header + "\n" + rows[0])
+    built = None
+    for name, opts, params in CONFIGS:
+        if built != opts:
+            t0 = time.perf_counter()
+            build(client, vecs, opts)
+            t_build = time.perf_counter() - t0
+            built = opts
+        measure(client, queries[:10], truth[:10], args.top_k, args.ef, params)  # 워밍업
+        p50, p95, recall = measure(client, queries, truth, args.top_k, args.ef, params)
+        ram, disk = estimate_bytes(args.points, args.dim, opts)
+        rows.append(f"| {name} | {recall:.3f} | {p50:.2f} | {p95:.2f} | {ram / 2**20:,.0f} MB | "
+                    f"{disk / 2**20:,.0f} MB | {t_build:.1f} |")
+        print(rows[-1])
+    client.delete_collection(COLLECTION)
+
+    if args.report:
+        mode = "local (in-memory, no HNSW/quantization)" if args.local else "Qdrant server"
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(f"# questions 컬렉션 저장 옵션 비교\n\n"
+                    f"- {args.points:,} points x {args.dim} dim, {args.queries} queries, top-{args.top_k}, "
+                    f"hnsw_ef={args.ef}, {mode}\n"
+                    f"- 정답: numpy 전수 비교 상위 {args.top_k}, RAM/디스크는 설정 기반 추정치\n\n")
+            f.write(header + "\n" + "\n".join(rows) + "\n")
+        print(f"\nreport: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# bench_query_pipeline.py
+# /query 파이프라인 오프라인 벤치마크 (OpenAI/Qdrant 없이 benchmarks/fakes.py 대역 사용)
+#   실행: python -m benchmarks.bench_query_pipeline --sizes 1000 10000 --top-k 5 10 20 \
+#             --embed-latency-ms 80 --llm-latency-ms 600
+#   - stages: 단계별(embed / search / mmr / context / llm) p50·p95·p99 (app.server 의 함수와 같은 인자로 호출)
+#   - e2e   : ASGI 로 POST /query 를 직접 호출한 전체 지연 (의미 캐시는 끔)
+#   인메모리 Qdrant 는 HNSW 없이 전수 검색이므로 search 수치는 실서버와 다릅니다. (상대 비교용)
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+
+os.environ["SEMANTIC_CACHE_THRESHOLD"] = "2"  # 캐시 히트 없음 (import 전에 설정)
+
+from benchmarks.fakes import install, seed_async, synthetic_questions
+
+STAGES = ["embed", "search", "mmr", "context", "llm"]
+
+
+def _pct(values):
+    a = np.asarray(values) * 1000
+    return np.percentile(a, 50), np.percentile(a, 95), np.percentile(a, 99)
+
+
+async def staged_query(server, query, top_k, use_mmr=True, categories=None):
+    """server._search / query 와 같은 순서·인자로 단계별 시간 측정 (필터/검색 파라미터도 같은 헬퍼 사용)"""
+    from app.common import COLLECTION_NAME, category_filter, get_async_qdrant, get_emb, get_llm, search_params
+    from app.mmr import mmr
+
+    t = {}
+    t0 = time.perf_counter()
+    qvec = await get_emb().aembed_query(query)
+    t1 = time.perf_counter()
+    hits = await get_async_qdrant().search(
+        collection_name=COLLECTION_NAME, query_vector=qvec, query_filter=category_filter(categories),
+        limit=max(top_k * 2, top_k + 4), with_payload=True, with_vectors=use_mmr, search_params=search_params(128))
+    t2 = time.perf_counter()
+    picks = mmr(qvec, hits, k=top_k) if use_mmr else hits[:top_k]
+    t3 = time.perf_counter()
+    prompt = server._build_prompt(query, server._build_context(picks))
+    t4 = time.perf_counter()
+    await get_llm().ainvoke(prompt)
+    t5 = time.perf_counter()
+    t.update(embed=t1 - t0, search=t2 - t1, mmr=t3 - t2, context=t4 - t3, llm=t5 - t4)
+    return t
+
+
+async def run(args):
+    import httpx
+    emb, llm, aqdr = install(args.embed_latency_ms, args.llm_latency_ms)
+    import app.server as server
+    from app.common import COLLECTION_NAME
+
+    transport = httpx.ASGITransport(app=server.app)  # lifespan 없이 호출 (컬렉션은 직접 적재)
+    print(f"embed latency {args.embed_latency_ms} ms, llm latency {args.llm_latency_ms} ms, "
+          f"{args.queries} queries per cell\n")
+    header = f"{'size':>7} {'top_k':>5} " + " ".join(f"{s + ' p50/p95/p99':>24}" for s in STAGES + ["e2e"])
+    print(header)
+    for size in args.sizes:
+        t0 = time.perf_counter()
+        await seed_async(aqdr, COLLECTION_NAME, size)
+        print(f"-- seeded {size:,} questions in {time.perf_counter() - t0:.1f}s")
+        # 적재 질문을 조금 바꾼 질의 (매번 다른 텍스트 → 임베딩 캐시 미적중)
+        base, _ = synthetic_questions(args.queries, seed=size + 1)
+        for top_k in args.top_k:
+            stage_times = {s: [] for s in STAGES}
+            e2e = []
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for i, q in enumerate(base):
+                    for s, v in (await staged_query(server, f"{q} s{top_k}", top_k)).items():
+                        stage_times[s].append(v)
+                    t0 = time.perf_counter()
+                    r = await client.post("/query", json={"query": f"{q} e{top_k}", "top_k": top_k})
+                    e2e.append(time.perf_counter() - t0)
+                    r.raise_for_status()
+            cells = [_pct(stage_times[s]) for s in STAGES] + [_pct(e2e)]
+            print(f"{size:>7,} {top_k:>5} " + " ".join(f"{a:7.2f}/{b:7.2f}/{c:7.2f}" for a, b, c in cells))
+    print("\n(ms)  e2e 는 HTTP/직렬화/Pydantic 포함")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--top-k", type=int, nargs="+", default=[5, 10, 20])
+    ap.add_argument("--queries", type=int, default=50)
+    ap.add_argument("--embed-latency-ms", type=float, default=0.0)
+    ap.add_argument("--llm-latency-ms", type=float, default=0.0)
+    asyncio.run(run(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
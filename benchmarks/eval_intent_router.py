@@ -0,0 +1,54 @@
+# eval_intent_router.py
+# 로컬 의도 분류기 오프라인 평가 (lgu_plan_crawler/intent_eval.jsonl)
+#   실행: python -m benchmarks.eval_intent_router            # 규칙 + 예시 임베딩 중심 (OPENAI_API_KEY 필요, 임베딩은 캐시됨)
+#         python -m benchmarks.eval_intent_router --rules-only
+# LLM fallback은 호출하지 않고 'llm'으로 집계만 합니다. (로컬에서 판단한 질문만 정확도 계산)
+import argparse
+import os
+import time
+
+from lgu_plan_crawler.intent_router import EVAL_FILE, IntentRouter, load_examples
+
+TAGS = ['5G', 'LTE', '청소년/키즈', '시니어', '데이터무제한', '데이터많이', '알뜰/가성비']
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rules-only", action="store_true")
+    ap.add_argument("--min-margin", type=float, default=float(os.getenv("INTENT_MIN_MARGIN", "0.05")))
+    args = ap.parse_args()
+
+    embeddings = None
+    if not args.rules_only:
+        from langchain_openai import OpenAIEmbeddings
+        from app.embedding_cache import CachedEmbeddings
+        embeddings = CachedEmbeddings(OpenAIEmbeddings(model="text-embedding-3-small"), model="text-embedding-3-small")
+
+    router = IntentRouter(embeddings=embeddings, llm_fallback=lambda q: {'search_type': None},
+                          tags=TAGS, min_margin=args.min_margin)
+    examples = load_examples(EVAL_FILE)
+    correct, decided, lat = 0, 0, []
+    for ex in examples:
+        t0 = time.perf_counter()
+        got = router.route(ex['query'])
+        lat.append(time.perf_counter() - t0)
+        if got['source'] == 'llm':
+            print(f"  llm      {ex['query']}")
+            continue
+        decided += 1
+        ok = (got['search_type'] == ex['search_type']
+              and got.get('operation') == ex.get('operation') and got.get('column') == ex.get('column'))
+        correct += ok
+        if not ok:
+            print(f"  WRONG    {ex['query']}  expected={ex['search_type']}/{ex.get('operation')}/{ex.get('column')}"
+                  f"  got={got['search_type']}/{got.get('operation')}/{got.get('column')} ({got['source']})")
+
+    lat.sort()
+    print(f"\nexamples       {len(examples)}")
+    print(f"decided local  {decided} ({decided / len(examples):.0%})  accuracy {correct / max(decided, 1):.1%}")
+    print(f"LLM fallback   {router.fallback_rate():.1%}  {router.stats}")
+    print(f"latency        p50 {lat[len(lat) // 2] * 1000:.2f} ms  max {lat[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
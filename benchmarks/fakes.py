@@ -0,0 +1,137 @@
+# fakes.py
+# 오프라인 벤치마크용 대역(stand-in): OpenAI 임베딩/챗 모델 + 인메모리 Qdrant
+#  - FakeEmbeddings: 문자 2-gram 해싱 벡터 (같은 텍스트 → 같은 벡터, 비슷한 텍스트 → 높은 유사도)
+#  - FakeChatModel: 고정 답변, 지연(latency_ms)과 스트리밍 토큰 수 설정 가능
+#  - install(): app.common.set_clients 로 서버/스크립트가 대역을 쓰도록 교체
+import asyncio
+import hashlib
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+CATEGORIES = ["요금", "로밍", "가입", "해지", "데이터", "부가서비스", "결합할인", "단말기"]
+TEMPLATES = [
+    "{c} 관련해서 문의드립니다", "{c} 변경은 어떻게 하나요", "{c} 신청 방법 알려주세요",
+    "{c} 비용이 궁금해요", "{c} 조건이 어떻게 되나요", "{c} 취소하고 싶어요",
+    "{c} 적용 시점이 언제인가요", "{c} 확인은 어디서 하나요",
+]
+
+
+class FakeEmbeddings(Embeddings):
+    """결정적(deterministic) 가짜 임베딩. latency_ms: 호출(배치)당 지연"""
+
+    def __init__(self, dim: int = 1536, latency_ms: float = 0.0):
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def _vector(self, text: str) -> List[float]:
+        v = np.zeros(self.dim, dtype=np.float32)
+        text = str(text)
+        for i in range(len(text) - 1):
+            h = int.from_bytes(hashlib.md5(text[i:i + 2].encode()).digest()[:4], "little")
+            v[h % self.dim] += 1.0
+        seed = int.from_bytes(hashlib.md5(text.encode()).digest()[:4], "little")
+        v += np.random.default_rng(seed).normal(0, 0.05, self.dim).astype(np.float32)
+        return (v / (np.linalg.norm(v) + 1e-12)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return [self._vector(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class FakeChatModel:
+    """ChatOpenAI 대역: invoke/ainvoke/astream 만 지원. latency_ms: 첫 토큰까지 지연"""
+
+    def __init__(self, answer: str = "가짜 답변입니다. 유사 질문을 참고하세요.", latency_ms: float = 0.0,
+                 tokens: int = 8, token_latency_ms: float = 0.0):
+        self.answer = answer
+        self.latency_ms = latency_ms
+        self.tokens = tokens
+        self.token_latency_ms = token_latency_ms
+        self.prompt_chars = 0
+
+    def _chunks(self):
+        step = max(1, len(self.answer) // self.tokens)
+        return [self.answer[i:i + step] for i in range(0, len(self.answer), step)]
+
+    def invoke(self, prompt, **kwargs):
+        self.prompt_chars += len(str(prompt))
+        time.sleep((self.latency_ms + self.token_latency_ms * self.tokens) / 1000)
+        return AIMessage(content=self.answer)
+
+    async def ainvoke(self, prompt, **kwargs):
+        self.prompt_chars += len(str(prompt))
+        await asyncio.sleep((self.latency_ms + self.token_latency_ms * self.tokens) / 1000)
+        return AIMessage(content=self.answer)
+
+    async def astream(self, prompt, **kwargs):
+        self.prompt_chars += len(str(prompt))
+        await asyncio.sleep(self.latency_ms / 1000)
+        for chunk in self._chunks():
+            if self.token_latency_ms:
+                await asyncio.sleep(self.token_latency_ms / 1000)
+            yield AIMessageChunk(content=chunk)
+
+
+def synthetic_questions(n: int, seed: int = 0):
+    """(questions, categories) n개. 같은 템플릿이 반복되지 않도록 번호를 붙임"""
+    rng = np.random.default_rng(seed)
+    cats = rng.choice(CATEGORIES, n)
+    tmpl = rng.integers(0, len(TEMPLATES), n)
+    questions = [TEMPLATES[t].format(c=c) + f" ({i})" for i, (c, t) in enumerate(zip(cats, tmpl))]
+    return questions, cats.tolist()
+
+
+def install(embed_latency_ms: float = 0.0, llm_latency_ms: float = 0.0, token_latency_ms: float = 0.0):
+    """
+    app.common 의 공용 클라이언트를 대역으로 교체합니다. 반환: (emb, llm, aqdr)
+    /query 경로는 비동기 클라이언트를 쓰므로 데이터는 seed_async(aqdr, ...) 로 적재합니다.
+    """
+    from qdrant_client import AsyncQdrantClient, QdrantClient
+    from app.common import set_clients
+    from app.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+    emb = CachedEmbeddings(FakeEmbeddings(latency_ms=embed_latency_ms), model="fake",
+                           cache=EmbeddingCache(path=None))
+    llm = FakeChatModel(latency_ms=llm_latency_ms, token_latency_ms=token_latency_ms)
+    aqdr = AsyncQdrantClient(":memory:")
+    set_clients(emb=emb, llm=llm, qdr=QdrantClient(":memory:"), aqdr=aqdr)
+    return emb, llm, aqdr
+
+
+async def seed_async(aqdr, collection: str, n: int, batch: int = 1000, dim: int = 1536):
+    """가짜 임베딩으로 n개 질문을 인메모리 컬렉션에 적재 (app.ingest.point_id 로 ID 생성)"""
+    from qdrant_client.http import models as qm
+    from app.ingest import point_id
+
+    if await aqdr.collection_exists(collection):
+        await aqdr.delete_collection(collection)
+    await aqdr.create_collection(collection, vectors_config=qm.VectorParams(size=dim, distance=qm.Distance.COSINE))
+    questions, cats = synthetic_questions(n)
+    fake = FakeEmbeddings(dim=dim)
+    for i in range(0, n, batch):
+        qs, cs = questions[i:i + batch], cats[i:i + batch]
+        vecs = fake.embed_documents(qs)
+        await aqdr.upsert(collection, points=[
+            qm.PointStruct(id=point_id(q, c), vector=v, payload={"question": q, "category": c})
+            for q, c, v in zip(qs, cs, vecs)
+        ])
+    return questions, cats
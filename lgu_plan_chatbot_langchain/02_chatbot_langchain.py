@@ -1,17 +1,22 @@
 # lgu_plan_chatbot_langchain/02_chatbot_langchain.py
+#   실행: 레포 루트에서 python -m lgu_plan_chatbot_langchain.02_chatbot_langchain
 
 import pandas as pd
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_community.vectorstores import Chroma
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
+from langchain_core.documents import Document
 from langchain.agents import tool, AgentExecutor, create_react_agent
-from langchain import hub
 import os
 import json
+from pathlib import Path
 from dotenv import load_dotenv
 
+from lgu_plan_crawler.plan_query import PlanCatalog
+from app.lexical import HybridSearcher
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -20,6 +25,11 @@ CHROMA_DB_PATH = "chroma_db_langchain"
 REFINED_CSV_PATH = 'lgu_plans_refined.csv'
 EMBEDDING_MODEL = "text-embedding-3-small"
 LLM_MODEL = "gpt-4o"
+# 리트리버 검색 방식: hybrid(기본, 어휘 결과가 확실하면 임베딩 생략) | vector | lexical
+RETRIEVER_MODE = os.getenv("RETRIEVER_MODE", "hybrid")
+# ReAct 프롬프트는 레포에 포함된 파일을 사용 (REACT_PROMPT_REFRESH=1 이면 hub에서 받아 파일 갱신)
+REACT_PROMPT_FILE = Path(__file__).with_name('react_prompt.txt')
+REACT_PROMPT_REFRESH = os.getenv("REACT_PROMPT_REFRESH", "0") == "1"
 
 # --- API 키 및 DB/데이터 파일 확인 ---
 try:
@@ -44,14 +54,78 @@ print("🔗 LangChain 컴포넌트를 초기화합니다...")
 llm = ChatOpenAI(model=LLM_MODEL, temperature=0, api_key=api_key)
 embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=api_key)
 vector_store = Chroma(persist_directory=CHROMA_DB_PATH, embedding_function=embeddings)
-retriever = vector_store.as_retriever(search_kwargs={'k': 5})
 
-# 전체 데이터 로드 (조건 검색용)
-full_df = pd.read_csv(REFINED_CSV_PATH)
+
+def _vector_search(query, k):
+    return [doc.page_content for doc in vector_store.similarity_search(query, k=k)]
+
+
+# 저장된 문서로 문자 n-gram BM25 색인 생성 → 어휘 결과가 확실하면 임베딩 호출 없이 반환
+_stored = vector_store.get()
+_documents = {text: Document(page_content=text, metadata=meta or {})
+              for text, meta in zip(_stored['documents'], _stored['metadatas']) if text}
+doc_searcher = HybridSearcher(list(_documents), list(_documents), vector_search=_vector_search)
+
+
+def _hybrid_retrieve(query):
+    keys, _ = doc_searcher.search(query, k=5, mode=RETRIEVER_MODE)
+    return [_documents[key] for key in keys]
+
+
+retriever = RunnableLambda(_hybrid_retrieve)
+
+# 전체 데이터 로드 (조건 검색용, 정렬 인덱스는 로드 시 1회 생성)
+catalog = PlanCatalog.from_csv(REFINED_CSV_PATH)
 print("✅ 컴포넌트 초기화 완료.")
 
 
-# --- 3. 에이전트가 사용할 도구(Tool) 정의 ---
+# --- 3. 체인 정의 (시작 시 1회 생성, 도구 호출마다 재사용) ---
+
+# RAG Chain 정의 (LCEL - LangChain Expression Language)
+rag_prompt = ChatPromptTemplate.from_template(
+    """당신은 LG U+ 요금제 전문 상담원입니다.
+    주어진 [참고 정보]를 바탕으로 사용자의 [질문]에 대해 친절하고 명확하게 답변해주세요.
+    - 항상 [참고 정보]에 있는 내용만을 기반으로 답변해야 합니다. 정보를 지어내지 마세요.
+    - 가격 정보는 '월 x,xxx원' 형식으로 표기해주세요.
+    - 각 요금제의 핵심 특징을 잘 요약해서 설명해주세요.
+    - 만약 참고 정보가 질문과 관련이 없거나 부족하다면, "죄송하지만 요청하신 정보를 찾을 수 없습니다." 라고 솔직하게 답변해주세요.
+
+    [참고 정보]
+    {context}
+
+    [질문]
+    {question}
+    """
+)
+
+
+def format_docs(docs):
+    # 검색된 Document 객체들을 하나의 문자열로 합칩니다.
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+rag_chain = (
+    {"context": retriever | format_docs, "question": RunnablePassthrough()}
+    | rag_prompt
+    | llm
+    | StrOutputParser()
+)
+
+structured_prompt = ChatPromptTemplate.from_template(
+    """당신은 LG U+ 요금제 데이터 분석가입니다.
+    주어진 [요금제 데이터]를 보고, 사용자의 [질문] 의도에 맞게 결과를 요약하고 친절하게 설명해주세요.
+
+    [요금제 데이터]
+    {context}
+
+    [질문]
+    {question}
+    """
+)
+structured_chain = structured_prompt | llm | StrOutputParser()
+
+
+# --- 4. 에이전트가 사용할 도구(Tool) 정의 ---
 
 @tool
 def semantic_search(query: str):
@@ -60,37 +134,8 @@ def semantic_search(query: str):
     """
     print(f"\n>> 도구 실행: semantic_search(query='{query}')")
 
-    # RAG Chain 정의 (LCEL - LangChain Expression Language)
-    prompt = ChatPromptTemplate.from_template(
-        """당신은 LG U+ 요금제 전문 상담원입니다.
-        주어진 [참고 정보]를 바탕으로 사용자의 [질문]에 대해 친절하고 명확하게 답변해주세요.
-        - 항상 [참고 정보]에 있는 내용만을 기반으로 답변해야 합니다. 정보를 지어내지 마세요.
-        - 가격 정보는 '월 x,xxx원' 형식으로 표기해주세요.
-        - 각 요금제의 핵심 특징을 잘 요약해서 설명해주세요.
-        - 만약 참고 정보가 질문과 관련이 없거나 부족하다면, "죄송하지만 요청하신 정보를 찾을 수 없습니다." 라고 솔직하게 답변해주세요.
-
-        [참고 정보]
-        {context}
-
-        [질문]
-        {question}
-        """
-    )
-
-    def format_docs(docs):
-        # 검색된 Document 객체들을 하나의 문자열로 합칩니다.
-        return "\n\n".join(doc.page_content for doc in docs)
-
-    rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
-
     # RAG 체인 실행
-    result = rag_chain.invoke(query)
-    return result
+    return rag_chain.invoke(query)
 
 
 @tool
@@ -104,38 +149,37 @@ def structured_search(operation: str, column: str):
     if column not in ['monthly_price', 'data_gb'] or operation not in ['max', 'min']:
         return "잘못된 인자입니다. column은 'monthly_price' 또는 'data_gb', operation은 'max' 또는 'min' 이어야 합니다."
 
-    ascending = True if operation == 'min' else False
-    result_df = full_df.sort_values(by=column, ascending=ascending).head(3)
+    result = catalog.top(operation, column, k=3)
 
     # 결과를 JSON 문자열로 변환하여 LLM이 이해하기 쉽게 만듦
-    result_json = result_df.to_json(orient='records', force_ascii=False)
+    result_json = json.dumps(result, ensure_ascii=False, separators=(',', ':'))
 
-    # 최종 답변 생성을 위해 LLM 호출
-    prompt = ChatPromptTemplate.from_template(
-        """당신은 LG U+ 요금제 데이터 분석가입니다.
-        주어진 [요금제 데이터]를 보고, 사용자의 [질문] 의도에 맞게 결과를 요약하고 친절하게 설명해주세요.
-
-        [요금제 데이터]
-        {context}
-
-        [질문]
-        {question}
-        """
-    )
-    chain = prompt | llm | StrOutputParser()
     # 원래 질문을 함께 전달하여 더 자연스러운 답변 생성
     original_query = f"{column}을 기준으로 {operation} 값을 가지는 요금제 찾아줘"
-    result = chain.invoke({"context": result_json, "question": original_query})
-    return result
+    return structured_chain.invoke({"context": result_json, "question": original_query})
 
 
-# --- 4. 에이전트(Agent) 생성 및 실행 ---
+# --- 5. 에이전트(Agent) 생성 및 실행 ---
 
 tools = [semantic_search, structured_search]
 
-# ReAct 프롬프트 가져오기 (Agent가 어떤 방식으로 생각하고 행동할지 정의한 템플릿)
-# https://smith.langchain.com/hub/hwchase17/react
-prompt = hub.pull("hwchase17/react")
+
+def load_react_prompt(refresh=REACT_PROMPT_REFRESH):
+    """
+    ReAct 프롬프트 (Agent가 어떤 방식으로 생각하고 행동할지 정의한 템플릿)
+    https://smith.langchain.com/hub/hwchase17/react 를 react_prompt.txt 로 포함해 두어 시작 시 네트워크 호출이 없음
+    refresh=True 면 hub에서 최신본을 받아 파일을 갱신 (실패 시 로컬 파일 사용)
+    """
+    if refresh:
+        try:
+            from langchain import hub
+            REACT_PROMPT_FILE.write_text(hub.pull("hwchase17/react").template, encoding='utf-8')
+        except Exception as e:
+            print(f"⚠️ hub 프롬프트 갱신에 실패해 로컬 프롬프트를 사용합니다: {e}")
+    return PromptTemplate.from_template(REACT_PROMPT_FILE.read_text(encoding='utf-8'))
+
+
+prompt = load_react_prompt()
 
 # 에이전트 생성
 agent = create_react_agent(llm, tools, prompt)
@@ -144,7 +188,7 @@ agent = create_react_agent(llm, tools, prompt)
 agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
 
 
-# --- 5. 메인 실행 루프 ---
+# --- 6. 메인 실행 루프 ---
 if __name__ == "__main__":
     print("\n==================================================")
     print("🤖 LG U+ 요금제 상담 챗봇을 시작합니다. (v3. LangChain Agent)")
@@ -1,11 +1,15 @@
 # RAG retriever 생성 기능
+#   실행: 레포 루트에서 python -m lgu_plan_crawler.build_retriever
 
 import pandas as pd
 import numpy as np
 from openai import OpenAI
-from sklearn.metrics.pairwise import cosine_similarity
 import os
 
+from langchain_openai import OpenAIEmbeddings
+from app.embedding_cache import CachedEmbeddings
+from lgu_plan_crawler.plan_index import PlanIndex, search_texts
+
 try:
     client = OpenAI(api_key="API_KEY")
     print("✅ OpenAI API 키가 성공적으로 로드되었습니다.")
@@ -16,40 +20,65 @@ except KeyError:
 
 # OpenAI의 최신 임베딩 모델을 지정합니다.
 EMBEDDING_MODEL = "text-embedding-3-small"
+# (모델, 텍스트) 단위 캐시: 이미 임베딩한 문장은 API를 다시 호출하지 않음
+emb = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=client.api_key), model=EMBEDDING_MODEL)
 
-# --- 2. 정제된 데이터 로드 및 검색용 텍스트 생성 ---
-print("📄 정제된 CSV 파일을 로드하고 검색용 텍스트를 생성합니다.")
-try:
-    df = pd.read_csv('lgu_plans_refined.csv')
-except FileNotFoundError:
-    print("❌ 'lgu_plans_refined.csv' 파일을 찾을 수 없습니다. 이전 단계의 파일이 있는지 확인해주세요.")
-    exit()
+EMBEDDINGS_FILE = 'plan_embeddings_openai.npy'
+PLAN_DATA_FILE = 'plan_data.json'
+INDEX_DIR = 'plan_index'
+# 인덱스 저장 형식: float32 | float16 | int8
+INDEX_DTYPE = os.getenv("PLAN_INDEX_DTYPE", "float32")
 
-# 검색의 효율성을 위해 각 요금제의 주요 정보를 하나의 문장으로 결합합니다.
-df['search_text'] = df.apply(
-    lambda row: f"요금제명 {row['plan_name']}, 월 {row['monthly_price']}원, 데이터 {row['data_gb']}GB, 특징 {row['tags']}",
-    axis=1
-)
 
-# --- 3. 각 요금제 텍스트를 OpenAI 모델로 임베딩 ---
-print(f"🧠 OpenAI '{EMBEDDING_MODEL}' 모델로 임베딩을 시작합니다. (시간이 소요될 수 있습니다)")
-try:
-    # OpenAI API를 호출하여 임베딩을 생성합니다.
-    response = client.embeddings.create(
-        input=df['search_text'].tolist(),
-        model=EMBEDDING_MODEL
-    )
-    plan_embeddings = np.array([item.embedding for item in response.data])
-    print(f"✅ 총 {len(plan_embeddings)}개의 요금제에 대한 임베딩을 완료했습니다.")
-
-    # 4. 생성된 벡터와 원본 데이터를 파일로 저장
-    np.save('plan_embeddings_openai.npy', plan_embeddings)
-    df.to_json('plan_data.json', orient='records', lines=True, force_ascii=False)
-    print("💾 임베딩 벡터와 요금제 데이터를 파일로 저장했습니다. ('plan_embeddings_openai.npy', 'plan_data.json')")
-
-except Exception as e:
-    print(f"❌ OpenAI API 호출 중 오류가 발생했습니다: {e}")
-    exit()
+def build_embeddings(csv_file='lgu_plans_refined.csv', index_dtype=INDEX_DTYPE):
+    """정제된 CSV → 임베딩 → (npy/json 파일 + 검색 인덱스) 저장"""
+    # --- 2. 정제된 데이터 로드 및 검색용 텍스트 생성 ---
+    print("📄 정제된 CSV 파일을 로드하고 검색용 텍스트를 생성합니다.")
+    try:
+        df = pd.read_csv(csv_file)
+    except FileNotFoundError:
+        print(f"❌ '{csv_file}' 파일을 찾을 수 없습니다. 이전 단계의 파일이 있는지 확인해주세요.")
+        return
+
+    # 검색의 효율성을 위해 각 요금제의 주요 정보를 하나의 문장으로 결합합니다.
+    df['search_text'] = search_texts(df)
+
+    # --- 3. 각 요금제 텍스트를 OpenAI 모델로 임베딩 ---
+    print(f"🧠 OpenAI '{EMBEDDING_MODEL}' 모델로 임베딩을 시작합니다. (시간이 소요될 수 있습니다)")
+    try:
+        # OpenAI API를 호출하여 임베딩을 생성합니다.
+        plan_embeddings = np.array(emb.embed_documents(df['search_text'].tolist()))
+        print(f"✅ 총 {len(plan_embeddings)}개의 요금제에 대한 임베딩을 완료했습니다.")
+    except Exception as e:
+        print(f"❌ OpenAI API 호출 중 오류가 발생했습니다: {e}")
+        return
+
+    # 4. 생성된 벡터와 원본 데이터를 파일로 저장 + 검색 인덱스 생성
+    np.save(EMBEDDINGS_FILE, plan_embeddings)
+    df.to_json(PLAN_DATA_FILE, orient='records', lines=True, force_ascii=False)
+    PlanIndex.build(plan_embeddings, df, INDEX_DIR, dtype=index_dtype)
+    print(f"💾 임베딩 벡터와 요금제 데이터를 파일로 저장했습니다. ('{EMBEDDINGS_FILE}', '{PLAN_DATA_FILE}', '{INDEX_DIR}/')")
+    reset_index()
+
+
+# ------------------- 상주형 인덱스 -------------------
+_index = None
+
+
+def get_index():
+    """검색 인덱스를 최초 1회만 로드해 재사용합니다. (없으면 기존 npy/json으로 생성)"""
+    global _index
+    if _index is None:
+        if not os.path.exists(os.path.join(INDEX_DIR, 'index.json')):
+            plans_df = pd.read_json(PLAN_DATA_FILE, orient='records', lines=True)
+            PlanIndex.build(np.load(EMBEDDINGS_FILE), plans_df, INDEX_DIR, dtype=INDEX_DTYPE)
+        _index = PlanIndex.load(INDEX_DIR)
+    return _index
+
+
+def reset_index():
+    global _index
+    _index = None
 
 
 # ------------------- OpenAI 기반 검색 테스트 함수 -------------------
@@ -60,25 +89,19 @@ def find_similar_plans_openai(query, top_k=3):
     print(f"\n🔍 '{query}'와(과) 가장 유사한 요금제를 검색합니다...")
 
     try:
-        plan_embeddings = np.load('plan_embeddings_openai.npy')
-        plans_df = pd.read_json('plan_data.json', orient='records', lines=True)
+        index = get_index()
     except FileNotFoundError:
         print("❌ 저장된 임베딩 파일을 찾을 수 없습니다. 먼저 스크립트를 실행하여 파일을 생성해주세요.")
         return
 
     # 사용자 질문을 OpenAI 모델로 임베딩
-    query_embedding = client.embeddings.create(input=[query], model=EMBEDDING_MODEL).data[0].embedding
+    query_embedding = emb.embed_query(query)
 
-    # 코사인 유사도 계산
-    cos_similarities = cosine_similarity([query_embedding], plan_embeddings)[0]
-
-    # 유사도가 높은 순으로 정렬하고 상위 top_k개 인덱스 추출
-    top_indices = cos_similarities.argsort()[-top_k:][::-1]
+    # 코사인 유사도 상위 top_k개 (argpartition)
+    plans, similarities = index.search(query_embedding, top_k=top_k)
 
     print("\n---------- 검색 결과 ----------")
-    for i, index in enumerate(top_indices):
-        plan = plans_df.iloc[index]
-        similarity = cos_similarities[index]
+    for i, (plan, similarity) in enumerate(zip(plans.to_dict('records'), similarities)):
         print(f"🏅 {i + 1}순위 (유사도: {similarity:.4f})")
         print(f"  - 요금제명: {plan['plan_name']}")
         print(f"  - 월정액: {plan['monthly_price']}원")
@@ -86,11 +109,23 @@ def find_similar_plans_openai(query, top_k=3):
         print(f"  - 태그: {plan['tags']}")
         print("-" * 20)
 
-    return plans_df.iloc[top_indices]
+    return plans
+
+
+def find_similar_plans_batch(queries, top_k=3):
+    """
+    여러 질문을 한 번에 검색합니다. (오프라인 평가/리포트용)
+    임베딩 요청 1회 + 요금제 행렬과의 행렬곱 1회로 처리하며, 질문별 상위 top_k DataFrame 리스트를 반환합니다.
+    """
+    index = get_index()
+    query_embeddings = emb.embed_documents(list(queries))
+    return [plans for plans, _ in index.search_batch(query_embeddings, top_k=top_k)]
 
 
 # --- 메인 코드 실행 ---
 if __name__ == "__main__":
+    build_embeddings()
+
     # --- 검색 테스트 ---
     find_similar_plans_openai("데이터 무제한 요금제 중에 제일 싼거")
-    find_similar_plans_openai("청소년이 쓸만한 요금제 추천해줘")
\ No newline at end of file
+    find_similar_plans_openai("청소년이 쓸만한 요금제 추천해줘")
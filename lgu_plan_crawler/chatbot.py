@@ -1,10 +1,17 @@
 # LG U+ 요금제 질의 챗봇 V1
+#   실행: 레포 루트에서 python -m lgu_plan_crawler.chatbot
 import pandas as pd
 import chromadb
 from openai import OpenAI
 import os
 import json
 
+from langchain_openai import OpenAIEmbeddings
+from app.embedding_cache import CachedEmbeddings
+from app.lexical import HybridSearcher
+from lgu_plan_crawler.plan_query import PlanCatalog
+from lgu_plan_crawler.intent_router import IntentRouter
+
 # --- (이전과 동일한 설정 부분) ---
 try:
     client = OpenAI(api_key="API_KEY")
@@ -23,16 +30,23 @@ except ValueError:
     print(f"❌ '{collection_name}' 컬렉션을 찾을 수 없습니다. DB 셋업을 먼저 실행해주세요.")
     exit()
 
-# 전체 데이터를 메모리에 로드 (Pandas 조건 검색용)
+# 전체 데이터를 메모리에 로드 (조건 검색용, 정렬 인덱스는 로드 시 1회 생성)
 try:
-    full_df = pd.read_csv('lgu_plans_refined.csv')
+    catalog = PlanCatalog.from_csv('lgu_plans_refined.csv')
     print("✅ 조건 검색을 위해 전체 요금제 데이터를 메모리에 로드했습니다.")
 except FileNotFoundError:
     print("❌ 'lgu_plans_refined.csv' 파일을 찾을 수 없습니다.")
     exit()
 
 EMBEDDING_MODEL = "text-embedding-3-small"
+# (모델, 텍스트) 단위 캐시: 반복 질문은 임베딩 API를 다시 호출하지 않음
+emb = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=client.api_key), model=EMBEDDING_MODEL)
 LLM_MODEL = "gpt-4o"
+# 의미 검색 방식: hybrid(기본, 어휘 결과가 확실하면 임베딩 생략) | vector | lexical
+PLAN_SEARCH_MODE = os.getenv("PLAN_SEARCH_MODE", "hybrid")
+# 의도 분류: local(규칙 + 예시 임베딩 중심, 확신 없을 때만 LLM) | llm(매번 LLM)
+INTENT_ROUTER = os.getenv("INTENT_ROUTER", "local")
+INTENT_MIN_MARGIN = float(os.getenv("INTENT_MIN_MARGIN", "0.05"))
 
 
 # --- (generate_final_answer, setup_database 함수는 이전과 동일) ---
@@ -61,42 +75,71 @@ def generate_final_answer(query, retrieved_info):
 
 # --- 검색 도구들 정의 ---
 
-def search_plans_from_db(query, top_k=5):
-    """[도구 1: 의미 검색] ChromaDB에서 의미적으로 유사한 요금제를 검색합니다."""
-    print(f"\n🔍 (의미 검색) '{query}' 관련 정보를 ChromaDB에서 검색합니다...")
-    query_embedding = client.embeddings.create(input=[query], model=EMBEDDING_MODEL).data[0].embedding
+def _vector_search(query, top_k):
+    query_embedding = emb.embed_query(query)
     results = collection.query(query_embeddings=[query_embedding], n_results=top_k)
-    print(f"✅ {len(results['metadatas'][0])}개의 관련 요금제 정보를 찾았습니다.")
-    return results['metadatas'][0]
+    return results['ids'][0]
 
 
-def search_plans_with_pandas(operation, column, top_k=3):
-    """[도구 2: 조건 검색] Pandas로 데이터를 정렬/필터링합니다."""
-    print(f"\n⚙️ (조건 검색) Pandas를 사용하여 '{column}' 컬럼을 기준으로 '{operation}' 작업을 수행합니다.")
+# 컬렉션 문서로 문자 n-gram BM25 색인 생성 ('5G', '청소년', 요금제명 등 정확 토큰은 임베딩 없이 검색)
+_plans = collection.get(include=['documents', 'metadatas'])
+# 변경 감지용 content_hash 는 프롬프트에 넣지 않음
+plan_metadata = {i: {k: v for k, v in (m or {}).items() if k != 'content_hash'}
+                 for i, m in zip(_plans['ids'], _plans['metadatas'])}
+plan_searcher = HybridSearcher([doc or '' for doc in _plans['documents']], _plans['ids'], vector_search=_vector_search)
 
-    if operation == 'max':
-        result_df = full_df.sort_values(by=column, ascending=False).head(top_k)
-    elif operation == 'min':
-        result_df = full_df.sort_values(by=column, ascending=True).head(top_k)
-    else:
-        return []
 
-    return json.loads(result_df.to_json(orient='records'))
+def search_plans_from_db(query, top_k=5):
+    """[도구 1: 의미 검색] 어휘(BM25) + ChromaDB 벡터 검색으로 유사한 요금제를 검색합니다."""
+    print(f"\n🔍 (의미 검색) '{query}' 관련 정보를 검색합니다...")
+    ids, path = plan_searcher.search(query, k=top_k, mode=PLAN_SEARCH_MODE)
+    print(f"✅ {len(ids)}개의 관련 요금제 정보를 찾았습니다. (검색 경로: {path})")
+    return [plan_metadata[i] for i in ids]
 
 
-# --- 매니저 함수 정의 ---
+def search_plans_with_pandas(operation, column, top_k=3, filters=None):
+    """[도구 2: 조건 검색] 미리 만든 정렬 인덱스로 최대/최소 및 범위 조건을 검색합니다."""
+    print(f"\n⚙️ (조건 검색) '{column}' 컬럼을 기준으로 '{operation}' 작업을 수행합니다.")
 
-def chatbot_manager(query):
-    """사용자 질문의 의도를 파악하고 적절한 도구를 선택하는 매니저 역할을 합니다."""
-    print(f"\n🧠 매니저가 '{query}' 질문의 의도를 파악합니다...")
+    if filters:
+        # 예: {"max_price": 40000, "min_data_gb": 10, "tags": ["5G"]}
+        return catalog.filter(**filters, sort_by=column, ascending=(operation != 'max'), k=top_k)
+    return catalog.top(operation, column, k=top_k)
+
+
+FILTER_KEYS = {'min_price', 'max_price', 'min_data_gb', 'max_data_gb', 'tags'}
+
+
+def _valid_filters(filters):
+    """LLM이 돌려준 filters 중 지원하는 키만 남기고 타입을 맞춥니다."""
+    if not isinstance(filters, dict):
+        return None
+    valid = {}
+    for key, value in filters.items():
+        if key not in FILTER_KEYS or value is None:
+            continue
+        try:
+            if key == 'tags':
+                valid[key] = [value] if isinstance(value, str) else [str(v) for v in value]
+            else:
+                valid[key] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return valid or None
+
+
+# --- 의도 분류 ---
 
-    # LLM을 이용한 의도 파악 프롬프트
+def _llm_intent(query):
+    """LLM(JSON 모드)으로 의도를 파악합니다. 로컬 분류가 확신이 없을 때만 호출됩니다."""
     intent_prompt = f"""
     사용자의 질문을 분석하여 어떤 검색 유형에 해당하는지 결정하고, 필요한 정보를 JSON 형식으로 반환해줘.
     검색 유형은 'semantic' (의미 기반 검색) 또는 'structured' (조건 기반 검색) 중 하나야.
 
     - "제일 비싼", "가장 저렴한", "최고가" 등의 질문은 'structured' 검색이야. 'operation'은 'max' 또는 'min'으로, 'column'은 'monthly_price'로 설정해줘.
     - "데이터 제일 많은" 등의 질문도 'structured' 검색이야. 'operation'은 'max'로, 'column'은 'data_gb'로 설정해줘.
+    - 가격/데이터 범위나 태그 조건이 있으면 'filters'에 담아줘. 사용 가능한 키: 'min_price', 'max_price', 'min_data_gb', 'max_data_gb', 'tags'(목록: {', '.join(catalog.tags)})
+      예: "4만원 이하 5G 요금제 중 데이터 제일 많은" → operation 'max', column 'data_gb', filters {{"max_price": 40000, "tags": ["5G"]}}
     - 그 외 "야무진", "쓸만한", "청소년용" 등 추상적인 추천 요청은 모두 'semantic' 검색이야.
 
     사용자 질문: "{query}"
@@ -110,18 +153,35 @@ def chatbot_manager(query):
         response_format={"type": "json_object"},
         temperature=0.0
     )
+    return json.loads(response.choices[0].message.content)
+
+
+if INTENT_ROUTER == "llm":
+    router = IntentRouter(llm_fallback=_llm_intent, rules=False)
+else:
+    # 예시 문장 임베딩은 캐시되므로 두 번째 실행부터는 API 호출 없음
+    router = IntentRouter(embeddings=emb, llm_fallback=_llm_intent, tags=catalog.tags,
+                          min_margin=INTENT_MIN_MARGIN)
+
+
+# --- 매니저 함수 정의 ---
+
+def chatbot_manager(query):
+    """사용자 질문의 의도를 파악하고 적절한 도구를 선택하는 매니저 역할을 합니다."""
+    print(f"\n🧠 매니저가 '{query}' 질문의 의도를 파악합니다...")
 
     try:
-        intent_result = json.loads(response.choices[0].message.content)
+        intent_result = router.route(query)
         search_type = intent_result.get('search_type')
-        print(f"✅ 의도 파악 완료: {search_type}")
+        print(f"✅ 의도 파악 완료: {search_type} (판단: {intent_result['source']}, "
+              f"LLM 호출 비율: {router.fallback_rate():.0%})")
 
         retrieved_plans = []
         if search_type == 'structured':
             # 조건 검색 도구 사용
             operation = intent_result.get('operation')
             column = intent_result.get('column')
-            retrieved_plans = search_plans_with_pandas(operation, column)
+            retrieved_plans = search_plans_with_pandas(operation, column, filters=_valid_filters(intent_result.get('filters')))
         else:  # 'semantic' 또는 미분류
             # 의미 검색 도구 사용
             retrieved_plans = search_plans_from_db(query)
@@ -0,0 +1,141 @@
+# 질문 의도(semantic / structured) 로컬 분류기
+#  1) 규칙: "제일 비싼", "데이터 가장 많은", "4만원 이하", "10GB 이상" 등 → structured (+ operation/column/filters)
+#  2) 예시 문장 임베딩의 클래스별 중심(centroid)과의 코사인 유사도 → semantic / structured
+#  3) 둘 다 확신이 없을 때만 LLM(fallback) 호출
+#  chatbot.py 의 chatbot_manager 에서 사용
+
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+EXAMPLES_FILE = Path(__file__).with_name('intent_examples.jsonl')
+EVAL_FILE = Path(__file__).with_name('intent_eval.jsonl')
+
+SUPERLATIVE = re.compile(r'제일|가장|최고|최저|최대|최소|젤')
+PRICE_MAX = re.compile(r'비싼|비싸|최고가|고가|높은')
+PRICE_MIN = re.compile(r'저렴|싼|싸|최저가|저가|낮은')
+DATA = re.compile(r'데이터|용량')
+DATA_MAX = re.compile(r'많은|많이|큰|최대')
+DATA_MIN = re.compile(r'적은|작은|최소')
+PRICE_RANGE = re.compile(r'(\d+(?:\.\d+)?)\s?(만\s?원|만|원)\s?(이하|이내|미만|아래|까지|이상|넘는|초과|부터)')
+DATA_RANGE = re.compile(r'(\d+(?:\.\d+)?)\s?(GB|기가|MB)\s?(이하|이내|미만|아래|까지|이상|넘는|초과|부터)', re.IGNORECASE)
+UPPER = ('이하', '이내', '미만', '아래', '까지')
+
+
+def load_examples(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _amount(value, unit):
+    value = float(value)
+    if unit.startswith('만'):
+        return value * 10000
+    if unit.upper() == 'MB':
+        return value / 1024
+    return value
+
+
+def extract_filters(query, tags=()):
+    """가격/데이터 범위와 태그 조건 추출 (chatbot._valid_filters 와 같은 키)"""
+    filters = {}
+    for value, unit, bound in PRICE_RANGE.findall(query):
+        filters['max_price' if bound in UPPER else 'min_price'] = _amount(value, unit)
+    for value, unit, bound in DATA_RANGE.findall(query):
+        filters['max_data_gb' if bound in UPPER else 'min_data_gb'] = _amount(value, unit)
+    upper = query.upper()
+    found = [tag for tag in tags if tag and tag.upper() in upper]
+    if found:
+        filters['tags'] = found
+    return filters
+
+
+def match_rules(query, tags=()):
+    """규칙으로 structured 의도를 확정할 수 있으면 intent dict, 아니면 None"""
+    filters = extract_filters(query, tags)
+    has_range = any(key != 'tags' for key in filters)
+    operation = column = None
+    if SUPERLATIVE.search(query):
+        if DATA.search(query) and (DATA_MAX.search(query) or DATA_MIN.search(query)):
+            column = 'data_gb'
+            operation = 'min' if DATA_MIN.search(query) else 'max'
+        elif PRICE_MAX.search(query):
+            column, operation = 'monthly_price', 'max'
+        elif PRICE_MIN.search(query):
+            column, operation = 'monthly_price', 'min'
+    if operation is None and has_range:
+        # 범위 조건만 있으면 싼 순서로 보여줌
+        column, operation = 'monthly_price', 'min'
+    if operation is None:
+        return None
+    return {'search_type': 'structured', 'operation': operation, 'column': column,
+            'filters': filters or None}
+
+
+class IntentRouter:
+    """
+    사용 예:
+        router = IntentRouter(embeddings=emb, llm_fallback=llm_intent, tags=catalog.tags)
+        router.route("4만원 이하 5G 요금제 중 데이터 제일 많은 거")
+        # → {'search_type': 'structured', 'operation': 'max', 'column': 'data_gb',
+        #    'filters': {'max_price': 40000.0, 'tags': ['5G']}, 'source': 'rule', 'confidence': 1.0}
+    embeddings: embed_documents/embed_query 를 가진 객체 (None이면 규칙 + LLM만 사용)
+    llm_fallback: query → intent dict. None이면 확신이 없을 때 semantic으로 처리
+    rules=False, embeddings=None 이면 매 질문 LLM 호출 (기존 방식)
+    """
+
+    def __init__(self, embeddings=None, llm_fallback=None, tags=(), examples=None,
+                 min_margin=0.05, rules=True):
+        self.rules = rules
+        self.embeddings = embeddings
+        self.llm_fallback = llm_fallback
+        self.tags = list(tags)
+        self.min_margin = min_margin
+        self.stats = {'rule': 0, 'centroid': 0, 'llm': 0, 'default': 0}
+        self.labels = []
+        self.centroids = None
+        if embeddings is not None:
+            examples = load_examples(EXAMPLES_FILE) if examples is None else examples
+            self._fit(examples)
+
+    def _fit(self, examples):
+        # 예시 문장 임베딩은 캐시(CachedEmbeddings)를 거치므로 두 번째 실행부터는 API 호출 없음
+        vectors = np.asarray(self.embeddings.embed_documents([ex['query'] for ex in examples]), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        labels = np.array([ex['search_type'] for ex in examples])
+        self.labels = sorted(set(labels))
+        centroids = np.stack([vectors[labels == label].mean(axis=0) for label in self.labels])
+        self.centroids = centroids / (np.linalg.norm(centroids, axis=1, keepdims=True) + 1e-12)
+
+    def classify(self, query):
+        """(label, margin): 가장 가까운 중심과 두 번째 중심의 코사인 유사도 차이"""
+        qvec = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        sims = self.centroids @ (qvec / (np.linalg.norm(qvec) + 1e-12))
+        order = np.argsort(-sims)
+        margin = float(sims[order[0]] - sims[order[1]]) if len(order) > 1 else 1.0
+        return self.labels[order[0]], margin
+
+    def route(self, query):
+        intent = match_rules(query, self.tags) if self.rules else None
+        if intent is not None:
+            self.stats['rule'] += 1
+            return {**intent, 'source': 'rule', 'confidence': 1.0}
+
+        if self.centroids is not None:
+            label, margin = self.classify(query)
+            # structured는 operation/column을 규칙으로 못 찾았으므로 LLM에 맡김
+            if label == 'semantic' and margin >= self.min_margin:
+                self.stats['centroid'] += 1
+                return {'search_type': 'semantic', 'source': 'centroid', 'confidence': margin}
+
+        if self.llm_fallback is not None:
+            self.stats['llm'] += 1
+            return {**self.llm_fallback(query), 'source': 'llm', 'confidence': None}
+        self.stats['default'] += 1
+        return {'search_type': 'semantic', 'source': 'default', 'confidence': 0.0}
+
+    def fallback_rate(self):
+        total = sum(self.stats.values())
+        return self.stats['llm'] / total if total else 0.0
@@ -0,0 +1,204 @@
+# 크롤링 → 정제 → 임베딩 → 저장 증분 파이프라인
+#  - 크롤링한 카드마다 지문(fingerprint: 이름/가격/요약 해시)을 계산해 manifest 와 비교
+#  - 신규/변경 요금제만 정제(refine_frame)하고, 검색 텍스트가 바뀐 요금제만 임베딩
+#  - 변경 없는 요금제는 이전 실행의 정제 결과(plan_data.json)와 벡터(npy)를 그대로 재사용
+#  - 결과: lgu_all_plans_final.csv / lgu_plans_refined.csv / plan_data.json / npy / plan_index/ + manifest
+#  - --chroma: rag_with_chromadb.setup_database 로 ChromaDB 도 변경분만 동기화
+#   실행: python -m lgu_plan_crawler.pipeline [--html page.html | --raw-csv lgu_all_plans_final.csv] [--full]
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lgu_plan_crawler.plan_index import PlanIndex, search_texts
+from lgu_plan_crawler.plan_refine import REFINED_COLUMNS, normalize_data_gb, refine_frame
+
+RAW_FILE = 'lgu_all_plans_final.csv'
+REFINED_FILE = 'lgu_plans_refined.csv'
+PLAN_DATA_FILE = 'plan_data.json'
+EMBEDDINGS_FILE = 'plan_embeddings_openai.npy'
+INDEX_DIR = 'plan_index'
+MANIFEST_FILE = 'pipeline_manifest.json'
+MANIFEST_VERSION = 1
+RAW_COLUMNS = ['plan_name', 'monthly_price', 'data_summary']
+INDEX_DTYPE = os.getenv("PLAN_INDEX_DTYPE", "float32")
+
+
+def plan_keys(names):
+    """요금제명 기반의 안정적인 ID (rag_with_chromadb.plan_id 와 같은 규칙). 같은 이름은 순번을 붙임"""
+    seen, keys = {}, []
+    for name in names:
+        base = "plan_" + hashlib.sha1(str(name).encode('utf-8')).hexdigest()[:16]
+        seen[base] = seen.get(base, 0) + 1
+        keys.append(base if seen[base] == 1 else f"{base}_{seen[base]}")
+    return keys
+
+
+def _hash(*parts):
+    return hashlib.sha256('\x1f'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:32]
+
+
+def fingerprints(raw):
+    """크롤링 원본 카드별 지문 (정제 결과를 바꿀 수 있는 입력만 포함)"""
+    return [_hash(n, p, s) for n, p, s in zip(raw['plan_name'], raw['monthly_price'], raw['data_summary'])]
+
+
+def load_manifest(out_dir):
+    path = Path(out_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def _load_previous(out_dir, manifest):
+    """이전 실행 결과: (정제 DataFrame[plan_key 인덱스], {plan_key: 벡터}). 없거나 어긋나면 (None, {})"""
+    data_path, vec_path = Path(out_dir) / PLAN_DATA_FILE, Path(out_dir) / EMBEDDINGS_FILE
+    if manifest is None or not data_path.exists() or not vec_path.exists():
+        return None, {}
+    prev = pd.read_json(data_path, orient='records', lines=True, dtype=False)
+    vectors = np.load(vec_path)
+    if 'plan_key' not in prev.columns or len(prev) != len(vectors):
+        return None, {}
+    prev = prev.set_index('plan_key')
+    return prev, dict(zip(prev.index, vectors))
+
+
+def diff(keys, prints, manifest):
+    """manifest 대비 변경 집합: {'added', 'changed', 'removed', 'unchanged'} (plan_key 목록)"""
+    old = (manifest or {}).get('plans', {})
+    changes = {'added': [], 'changed': [], 'removed': [], 'unchanged': []}
+    for key, fp in zip(keys, prints):
+        if key not in old:
+            changes['added'].append(key)
+        elif old[key]['fingerprint'] != fp:
+            changes['changed'].append(key)
+        else:
+            changes['unchanged'].append(key)
+    current = set(keys)
+    changes['removed'] = [key for key in old if key not in current]
+    return changes
+
+
+def run_pipeline(raw, out_dir='.', emb=None, full=False, index_dtype=INDEX_DTYPE):
+    """
+    크롤링 원본 DataFrame(plan_name, monthly_price, data_summary) → 하위 저장소 증분 갱신
+    emb: embed_documents 를 가진 임베딩 객체 (None이면 app.common.get_emb())
+    full: manifest 를 무시하고 전체 재생성
+    반환: 변경 요약 dict (added/changed/removed/unchanged/refined/embedded 개수, 단계별 시간)
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    timings = {}
+    t0 = time.perf_counter()
+
+    raw = raw[RAW_COLUMNS].reset_index(drop=True)
+    keys = plan_keys(raw['plan_name'])
+    prints = fingerprints(raw)
+    manifest = None if full else load_manifest(out)
+    prev, prev_vectors = (None, {}) if full else _load_previous(out, manifest)
+    if prev is None:
+        manifest = None  # 이전 결과가 없으면 manifest 가 있어도 전체를 새로 만듦
+    changes = diff(keys, prints, manifest)
+    # manifest 에는 있지만 이전 결과 파일에 없는 요금제는 변경으로 처리
+    missing = [key for key in changes['unchanged'] if key not in prev_vectors]
+    if missing:
+        changes['changed'] += missing
+        changes['unchanged'] = [key for key in changes['unchanged'] if key in prev_vectors]
+    timings['diff'] = time.perf_counter() - t0
+
+    summary = {name: len(v) for name, v in changes.items()}
+    dirty = set(changes['added']) | set(changes['changed'])
+    if not dirty and not changes['removed']:
+        summary.update(refined=0, embedded=0, timings=timings)
+        print(f"✅ 변경된 요금제가 없습니다. (총 {len(keys)}개)")
+        return summary
+
+    # 1. 신규/변경 카드만 정제
+    t0 = time.perf_counter()
+    positions = [i for i, key in enumerate(keys) if key in dirty]
+    fresh = refine_frame(raw.iloc[positions]) if positions else pd.DataFrame(columns=REFINED_COLUMNS)
+    fresh.index = [keys[i] for i in positions]
+    kept = prev.loc[[key for key in keys if key not in dirty], REFINED_COLUMNS] if prev is not None else None
+    # 크롤링 순서대로 합침 (전체 재생성과 같은 행 순서)
+    refined = pd.concat([part for part in (kept, fresh) if part is not None and len(part)]).reindex(keys)
+    refined = normalize_data_gb(refined)
+    summary['refined'] = len(positions)
+    timings['refine'] = time.perf_counter() - t0
+
+    # 2. 검색 텍스트가 바뀐 요금제만 임베딩 (data_gb 표기가 바뀐 경우 등도 포함)
+    t0 = time.perf_counter()
+    texts = search_texts(refined)
+    text_hashes = [_hash(text) for text in texts]
+    old_plans = (manifest or {}).get('plans', {})
+    stale = [i for i, (key, th) in enumerate(zip(keys, text_hashes))
+             if key not in prev_vectors or old_plans.get(key, {}).get('text_hash') != th]
+    if stale:
+        if emb is None:
+            from app.common import get_emb
+            emb = get_emb()
+        new_vectors = emb.embed_documents([texts[i] for i in stale])
+        for i, vec in zip(stale, new_vectors):
+            prev_vectors[keys[i]] = vec
+    vectors = np.asarray([prev_vectors[key] for key in keys], dtype=np.float32)
+    summary['embedded'] = len(stale)
+    timings['embed'] = time.perf_counter() - t0
+
+    # 3. 하위 저장소 갱신
+    t0 = time.perf_counter()
+    raw.to_csv(out / RAW_FILE, index=False, encoding='utf-8-sig')
+    refined.to_csv(out / REFINED_FILE, index=False, encoding='utf-8-sig')
+    data = refined.assign(search_text=texts).rename_axis('plan_key').reset_index()
+    data.to_json(out / PLAN_DATA_FILE, orient='records', lines=True, force_ascii=False)
+    np.save(out / EMBEDDINGS_FILE, vectors)
+    PlanIndex.build(vectors, refined, str(out / INDEX_DIR), dtype=index_dtype)
+    timings['store'] = time.perf_counter() - t0
+
+    new_manifest = {
+        'version': MANIFEST_VERSION,
+        'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'plans': {key: {'fingerprint': fp, 'text_hash': th} for key, fp, th in zip(keys, prints, text_hashes)},
+        # 마지막 실행의 변경 집합 (다른 저장소가 변경분만 반영할 때 사용)
+        'last_run': changes,
+    }
+    tmp = out / (MANIFEST_FILE + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(new_manifest, f, ensure_ascii=False)
+    os.replace(tmp, out / MANIFEST_FILE)
+
+    summary['timings'] = timings
+    print(f"✅ 파이프라인 완료: 추가 {summary['added']}, 변경 {summary['changed']}, 삭제 {summary['removed']}, "
+          f"유지 {summary['unchanged']} / 정제 {summary['refined']}, 임베딩 {summary['embedded']}")
+    return summary
+
+
+# --- 메인 코드 실행 ---
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--html", help="브라우저 대신 저장된 요금제 페이지 HTML 사용")
+    src.add_argument("--raw-csv", help="크롤링 결과 CSV 사용 (plan_name, monthly_price, data_summary)")
+    ap.add_argument("--out-dir", default=".")
+    ap.add_argument("--full", action="store_true", help="manifest 를 무시하고 전체 재생성")
+    ap.add_argument("--chroma", action="store_true", help="ChromaDB(rag_with_chromadb)도 변경분만 동기화")
+    args = ap.parse_args()
+
+    from lgu_plan_crawler import plan_summary_crawler as crawler
+    if args.raw_csv:
+        raw_df = pd.read_csv(args.raw_csv)
+    elif args.html:
+        with open(args.html, encoding='utf-8') as f:
+            raw_df = crawler.parse_html(f.read())
+    else:
+        raw_df = crawler.crawl()
+
+    result = run_pipeline(raw_df, out_dir=args.out_dir, full=args.full)
+    if args.chroma and (result['added'] or result['changed'] or result['removed']):
+        from lgu_plan_crawler import rag_with_chromadb  # import 시 ChromaDB 클라이언트 생성
+        rag_with_chromadb.setup_database(str(Path(args.out_dir) / REFINED_FILE))
@@ -0,0 +1,122 @@
+# 요금제 임베딩 검색 인덱스 (상주형)
+#  - 정규화된 임베딩을 한 번만 로드 (np.load mmap_mode='r')
+#  - float32 / float16 / int8(벡터별 scale) 저장 지원
+#  - 상위 k개는 argpartition으로 선택
+#  - 요금제 메타데이터는 컬럼별 numpy 배열(npz)로 보관
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+META_COLUMNS = ['plan_name', 'monthly_price', 'data_gb', 'data_type', 'tags']
+DTYPES = ('float32', 'float16', 'int8')
+
+
+def search_texts(df):
+    """요금제 행 → 임베딩용 검색 텍스트 (build_retriever / pipeline 공용)"""
+    return [f"요금제명 {name}, 월 {price}원, 데이터 {gb}GB, 특징 {tags}"
+            for name, price, gb, tags in zip(df['plan_name'], df['monthly_price'], df['data_gb'], df['tags'])]
+
+
+def _normalize(mat):
+    mat = np.asarray(mat, dtype=np.float32)
+    return mat / (np.linalg.norm(mat, axis=-1, keepdims=True) + 1e-12)
+
+
+class PlanIndex:
+    """
+    사용 예:
+        PlanIndex.build(embeddings, plans_df, 'plan_index', dtype='int8')
+        index = PlanIndex.load('plan_index')
+        rows, scores = index.search(query_vec, top_k=3)
+    """
+
+    BLOCK_ROWS = 8192  # float16/int8 → float32 변환 단위(행)
+
+    def __init__(self, vectors, scales, meta, dtype):
+        self.vectors = vectors      # (n, d) float32 | float16 | int8
+        self.scales = scales        # int8일 때 (n,) float32, 그 외 None
+        self.meta = meta            # {컬럼명: np.ndarray}
+        self.dtype = dtype
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    # ---------- 생성/저장 ----------
+    @classmethod
+    def build(cls, embeddings, plans_df, index_dir, dtype='float32'):
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}")
+        os.makedirs(index_dir, exist_ok=True)
+        vecs = _normalize(embeddings)
+        scales = None
+        if dtype == 'int8':
+            # 벡터별 scale: 최대 절댓값을 127에 맞춤
+            scales = (np.abs(vecs).max(axis=1) / 127.0).astype(np.float32) + 1e-12
+            stored = np.round(vecs / scales[:, None]).astype(np.int8)
+            np.save(os.path.join(index_dir, 'scales.npy'), scales)
+        else:
+            stored = vecs.astype(dtype)
+        np.save(os.path.join(index_dir, 'vectors.npy'), stored)
+
+        cols = [c for c in META_COLUMNS if c in plans_df.columns]
+        meta = {c: plans_df[c].to_numpy() for c in cols}
+        # 문자열 컬럼은 고정폭 유니코드 배열로 저장 (pickle 없이 로드 가능)
+        meta = {c: (v.astype(str) if v.dtype == object else v) for c, v in meta.items()}
+        np.savez(os.path.join(index_dir, 'meta.npz'), **meta)
+        with open(os.path.join(index_dir, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump({'dtype': dtype, 'count': int(stored.shape[0]), 'dim': int(stored.shape[1])}, f)
+        return cls(stored, scales, meta, dtype)
+
+    @classmethod
+    def load(cls, index_dir, mmap=True):
+        with open(os.path.join(index_dir, 'index.json'), encoding='utf-8') as f:
+            info = json.load(f)
+        mode = 'r' if mmap else None
+        vectors = np.load(os.path.join(index_dir, 'vectors.npy'), mmap_mode=mode)
+        scales = None
+        if info['dtype'] == 'int8':
+            scales = np.load(os.path.join(index_dir, 'scales.npy'))
+        with np.load(os.path.join(index_dir, 'meta.npz')) as npz:
+            meta = {k: npz[k] for k in npz.files}
+        return cls(vectors, scales, meta, info['dtype'])
+
+    # ---------- 검색 ----------
+    def scores(self, query_vecs):
+        """(B, d) 쿼리 → (B, n) 코사인 유사도"""
+        q = _normalize(np.atleast_2d(query_vecs))
+        if self.dtype == 'float32':
+            return q @ np.asarray(self.vectors).T
+        # float16/int8는 블록 단위로만 float32로 풀어 메모리 절감 효과를 유지
+        n = len(self)
+        sims = np.empty((q.shape[0], n), dtype=np.float32)
+        for s in range(0, n, self.BLOCK_ROWS):
+            sims[:, s:s + self.BLOCK_ROWS] = q @ self.vectors[s:s + self.BLOCK_ROWS].astype(np.float32).T
+        if self.scales is not None:
+            sims *= self.scales
+        return sims
+
+    def search(self, query_vec, top_k=3):
+        """(상위 top_k 요금제 DataFrame, 유사도 배열) 반환"""
+        sims = self.scores(query_vec)[0]
+        top = self.top_k(sims, top_k)
+        return self.rows(top), sims[top]
+
+    def search_batch(self, query_vecs, top_k=3):
+        """여러 쿼리를 행렬곱 한 번으로 점수화. 쿼리별 (DataFrame, 유사도) 리스트 반환"""
+        sims = self.scores(query_vecs)
+        tops = self.top_k(sims, top_k)
+        return [(self.rows(top), row[top]) for top, row in zip(tops, sims)]
+
+    @staticmethod
+    def top_k(sims, k):
+        """argpartition으로 상위 k개만 고른 뒤 그 안에서만 정렬"""
+        k = min(k, sims.shape[-1])
+        part = np.argpartition(-sims, k - 1, axis=-1)[..., :k]
+        order = np.take_along_axis(sims, part, axis=-1).argsort(axis=-1)[..., ::-1]
+        return np.take_along_axis(part, order, axis=-1)
+
+    def rows(self, indices):
+        return pd.DataFrame({c: v[indices] for c, v in self.meta.items()})
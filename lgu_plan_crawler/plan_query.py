@@ -0,0 +1,95 @@
+# 정제된 요금제 카탈로그에 대한 조건 검색 엔진
+#  - 로드 시 숫자 컬럼별 정렬 순서(argsort)를 한 번만 계산
+#  - 최대/최소 top-k, 범위 필터(가격 ≤ X, 데이터 ≥ Y 등), 태그 포함 조건을 정렬 없이 처리
+#  - chatbot.py / 02_chatbot_langchain.py 에서 함께 사용
+
+import json
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLUMNS = ['monthly_price', 'data_gb']
+
+
+class PlanCatalog:
+    """
+    사용 예:
+        catalog = PlanCatalog.from_csv('lgu_plans_refined.csv')
+        catalog.top('min', 'monthly_price', k=3)
+        catalog.filter(max_price=40000, min_data_gb=10, tags=['5G'], sort_by='monthly_price')
+    """
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        # 결과는 JSON 호환 dict로 반환 (numpy 타입 없이)
+        self.records = json.loads(self.df.to_json(orient='records', force_ascii=False))
+
+        # 숫자 컬럼: 오름차순 정렬 인덱스/값 (NaN은 제외하고 따로 보관)
+        self._order = {}
+        self._sorted = {}
+        self._nan = {}
+        for col in NUMERIC_COLUMNS:
+            if col not in self.df.columns:
+                continue
+            values = pd.to_numeric(self.df[col], errors='coerce').to_numpy(dtype=float)
+            nan = np.isnan(values)
+            order = np.flatnonzero(~nan)[np.argsort(values[~nan], kind='stable')]
+            self._order[col] = order
+            self._sorted[col] = values[order]
+            self._nan[col] = np.flatnonzero(nan)
+
+        # 태그별 불리언 마스크
+        self._tags = {}
+        if 'tags' in self.df.columns:
+            dummies = self.df['tags'].fillna('').astype(str).str.get_dummies(sep=',')
+            self._tags = {tag: dummies[tag].to_numpy(dtype=bool) for tag in dummies.columns if tag}
+
+    @classmethod
+    def from_csv(cls, csv_file):
+        return cls(pd.read_csv(csv_file))
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def tags(self):
+        return sorted(self._tags)
+
+    # ---------- 조회 ----------
+    def top(self, operation, column, k=3):
+        """operation: 'max' | 'min'. 값이 없는(NaN) 요금제는 맨 뒤 (sort_values와 동일)"""
+        if column not in self._order or operation not in ('max', 'min'):
+            return []
+        order = self._order[column]
+        head = order[::-1][:k] if operation == 'max' else order[:k]
+        if len(head) < k:
+            head = np.concatenate([head, self._nan[column][:k - len(head)]])
+        return [self.records[i] for i in head]
+
+    def _range_mask(self, column, low=None, high=None):
+        """low ≤ 값 ≤ high 인 행 마스크 (정렬된 값에서 이진 탐색)"""
+        sorted_vals = self._sorted[column]
+        lo = 0 if low is None else np.searchsorted(sorted_vals, low, side='left')
+        hi = len(sorted_vals) if high is None else np.searchsorted(sorted_vals, high, side='right')
+        mask = np.zeros(len(self.df), dtype=bool)
+        mask[self._order[column][lo:hi]] = True
+        return mask
+
+    def filter(self, min_price=None, max_price=None, min_data_gb=None, max_data_gb=None,
+               tags=None, sort_by='monthly_price', ascending=True, k=5):
+        """범위/태그 조건을 모두 만족하는 요금제를 sort_by 기준으로 최대 k개 반환"""
+        mask = np.ones(len(self.df), dtype=bool)
+        if min_price is not None or max_price is not None:
+            mask &= self._range_mask('monthly_price', min_price, max_price)
+        if min_data_gb is not None or max_data_gb is not None:
+            mask &= self._range_mask('data_gb', min_data_gb, max_data_gb)
+        for tag in tags or []:
+            mask &= self._tags.get(tag, np.zeros(len(self.df), dtype=bool))
+
+        if sort_by in self._order:
+            order = self._order[sort_by]
+            order = np.concatenate([order if ascending else order[::-1], self._nan[sort_by]])
+            picked = order[mask[order]][:k]
+        else:
+            picked = np.flatnonzero(mask)[:k]
+        return [self.records[i] for i in picked]
@@ -1,12 +1,118 @@
 # 수집된 LG U+ 모바일 요금제 정제 기능
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 import re
 
+# 정규표현식은 모듈 로드 시 한 번만 컴파일합니다.
+GB_PATTERN = re.compile(r'데이터 (\d+\.?\d*)\s?GB')
+MB_PATTERN = re.compile(r'데이터 (\d+\.?\d*)\s?MB')
+SPEED_PATTERN = re.compile(r'최대 (\d+)\s?(Mbps|Kbps)')
+SHARING_PATTERN = re.compile(r'(테더링|쉐어링)\s?\+?\s?(\d+GB)')
+VOICE_PATTERN = re.compile(r'(\d+)분')
+SMS_PATTERN = re.compile(r'(\d+)건')
+
+REFINED_COLUMNS = ['plan_name', 'monthly_price', 'data_gb', 'data_type', 'data_speed_limit', 'sharing_data',
+                   'voice_call', 'sms', 'tags']
+
+# 이 행 수 이상일 때만 프로세스 풀로 나눠 처리 (작은 입력은 직렬이 더 빠름)
+PARALLEL_MIN_ROWS = 200_000
 
-def refine_plan_data(input_file='lgu_all_plans_final.csv', output_file='lgu_plans_refined.csv'):
+
+def _extract(df):
+    """
+    data_summary / plan_name 컬럼에서 정보를 컬럼 단위(str.extract/str.contains)로 추출합니다.
+    추출한 컬럼만 담은 DataFrame을 반환하며, data_gb의 최종 dtype은 _finalize에서 결정합니다.
+    """
+    summary = df['data_summary']
+    plan_name = df['plan_name']
+    out = pd.DataFrame(index=df.index)
+
+    # --- 데이터 제공량 (GB) 추출 ---
+    # "데이터 무제한"은 9999(무제한을 나타내는 임의의 큰 숫자), 그 외 'GB' → 'MB'(GB로 변환) 순으로 확인
+    unlimited = summary.str.contains('데이터 무제한', regex=False, na=False).to_numpy()
+    gb = summary.str.extract(GB_PATTERN)[0].astype(float).to_numpy()
+    mb = summary.str.extract(MB_PATTERN)[0].astype(float).to_numpy()
+    data_gb = np.where(unlimited, 9999.0,
+                       np.where(~np.isnan(gb), gb,
+                                np.where(~np.isnan(mb), mb / 1024, 0.0)))
+    data_type = np.where(unlimited, '무제한', '기본제공').astype(object)
+
+    # --- 소진 후 속도 제한(Mbps/Kbps) 추출 ---
+    speed = summary.str.extract(SPEED_PATTERN)
+    has_speed = speed[0].notna().to_numpy()
+    out['data_speed_limit'] = (speed[0] + speed[1]).where(has_speed, '제한없음')
+    data_type[has_speed] = '기본제공후속도제어'
+
+    # --- 공유 데이터(테더링/쉐어링) 추출 ---
+    out['sharing_data'] = summary.str.extract(SHARING_PATTERN)[1].fillna('제공안함')
+
+    # --- 음성통화 정보 추출 ---
+    voice = summary.str.extract(VOICE_PATTERN)[0]
+    voice = (voice + '분').fillna('기본제공')
+    out['voice_call'] = voice.where(~summary.str.contains('집/이동전화 무제한', regex=False, na=False), '무제한')
+
+    # --- 문자 정보 추출 ---
+    sms = summary.str.extract(SMS_PATTERN)[0]
+    sms = (sms + '건').fillna('기본제공')
+    out['sms'] = sms.where(~summary.str.contains('기본제공', regex=False, na=False), '기본제공')
+
+    out['data_gb'] = data_gb
+    out['data_type'] = data_type
+
+    # 3. 추출된 데이터를 기반으로 태그(Tags) 생성 (조건별 마스크를 순서대로 이어 붙임)
+    rules = [
+        ('5G', plan_name.str.contains('5G', regex=False, na=False)),
+        ('LTE', plan_name.str.contains('LTE', regex=False, na=False)),
+        ('청소년/키즈', plan_name.str.contains('청소년|키즈|주니어', regex=True, na=False)),
+        ('시니어', plan_name.str.contains('시니어', regex=False, na=False)),
+        ('데이터무제한', pd.Series(data_type == '무제한', index=df.index)),
+        ('데이터많이', pd.Series((data_type != '무제한') & (data_gb >= 100), index=df.index)),
+        ('알뜰/가성비', df['monthly_price'] <= 40000),
+    ]
+    tags = pd.Series('', index=df.index, dtype=object)
+    for tag, mask in rules:
+        tags = tags + np.where(mask.to_numpy(dtype=bool), tag + ',', '')
+    out['tags'] = tags.str.rstrip(',')
+    return out
+
+
+def normalize_data_gb(df):
+    # data_gb: 값이 모두 정수면 int, 하나라도 소수가 있으면 float (기존 행 단위 대입 결과와 동일)
+    gb = df['data_gb'].to_numpy(dtype=float)
+    df['data_gb'] = gb.astype(np.int64) if np.all(gb == np.floor(gb)) else gb
+    return df
+
+
+def _finalize(df, extracted):
+    df = df.drop(columns=extracted.columns, errors='ignore').join(extracted)
+    return normalize_data_gb(df)[REFINED_COLUMNS]
+
+
+def refine_frame(df, workers=None):
+    """
+    크롤링 원본 DataFrame → 정제된 DataFrame
+    workers > 1 이고 입력이 충분히 크면 프로세스 풀로 나눠 처리합니다.
+    """
+    if workers and workers > 1 and len(df) >= PARALLEL_MIN_ROWS:
+        # 워커에는 필요한 컬럼만 보내 직렬화 비용을 줄임
+        src = df[['plan_name', 'monthly_price', 'data_summary']]
+        bounds = np.linspace(0, len(df), workers + 1).astype(int)
+        parts = [src.iloc[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            extracted = pd.concat(pool.map(_extract, parts))
+    else:
+        extracted = _extract(df)
+    return _finalize(df, extracted)
+
+
+def refine_plan_data(input_file='lgu_all_plans_final.csv', output_file='lgu_plans_refined.csv', workers=None):
     """
     크롤링된 LG U+ 요금제 CSV 파일을 읽어와 데이터를 정제하고 강화합니다.
+    workers: 대용량 입력일 때 사용할 프로세스 수 (None이면 직렬 처리)
     """
     print(f"🔄 '{input_file}' 파일을 불러와 데이터 정제를 시작합니다.")
 
@@ -16,86 +122,9 @@ def refine_plan_data(input_file='lgu_all_plans_final.csv', output_file='lgu_plan
         print(f"❌ 파일 '{input_file}'을 찾을 수 없습니다. 파일이 현재 폴더에 있는지 확인해주세요.")
         return
 
-    # 1. 새로운 컬럼들을 미리 생성하고 기본값으로 초기화합니다.
-    df['data_gb'] = 0
-    df['data_type'] = '기본제공'
-    df['data_speed_limit'] = '제한없음'
-    df['sharing_data'] = '제공안함'
-    df['voice_call'] = '기본제공'
-    df['sms'] = '기본제공'
-    df['tags'] = ''
-
-    # 2. 각 요금제(행)를 순회하며 data_summary 컬럼을 분석하고 정보 추출
-    for index, row in df.iterrows():
-        summary = row['data_summary']
-        plan_name = row['plan_name']
-
-        # --- 데이터 제공량 (GB) 추출 ---
-        # "데이터 무제한" 처리
-        if '데이터 무제한' in summary:
-            df.loc[index, 'data_gb'] = 9999  # 무제한을 나타내는 임의의 큰 숫자
-            df.loc[index, 'data_type'] = '무제한'
-        else:
-            # 정규표현식을 사용하여 '숫자GB' 또는 '숫자MB' 패턴을 찾습니다.
-            gb_match = re.search(r'데이터 (\d+\.?\d*)\s?GB', summary)
-            mb_match = re.search(r'데이터 (\d+\.?\d*)\s?MB', summary)
-            if gb_match:
-                df.loc[index, 'data_gb'] = float(gb_match.group(1))
-            elif mb_match:
-                df.loc[index, 'data_gb'] = float(mb_match.group(1)) / 1024  # MB를 GB로 변환
-
-        # --- 소진 후 속도 제한(Mbps/Kbps) 추출 ---
-        speed_match = re.search(r'최대 (\d+)\s?(Mbps|Kbps)', summary)
-        if speed_match:
-            df.loc[index, 'data_speed_limit'] = f"{speed_match.group(1)}{speed_match.group(2)}"
-            df.loc[index, 'data_type'] = '기본제공후속도제어'
-
-        # --- 공유 데이터(테더링/쉐어링) 추출 ---
-        sharing_match = re.search(r'(테더링|쉐어링)\s?\+?\s?(\d+GB)', summary)
-        if sharing_match:
-            df.loc[index, 'sharing_data'] = sharing_match.group(2)
-
-        # --- 음성통화 정보 추출 ---
-        if '집/이동전화 무제한' in summary:
-            df.loc[index, 'voice_call'] = '무제한'
-        else:
-            voice_match = re.search(r'(\d+)분', summary)
-            if voice_match:
-                df.loc[index, 'voice_call'] = f"{voice_match.group(1)}분"
-
-        # --- 문자 정보 추출 ---
-        if '기본제공' in summary:
-            df.loc[index, 'sms'] = '기본제공'
-        else:
-            sms_match = re.search(r'(\d+)건', summary)
-            if sms_match:
-                df.loc[index, 'sms'] = f"{sms_match.group(1)}건"
-
-        # 3. 추출된 데이터를 기반으로 태그(Tags) 생성
-        tags = []
-        if '5G' in plan_name:
-            tags.append('5G')
-        if 'LTE' in plan_name:
-            tags.append('LTE')
-        if '청소년' in plan_name or '키즈' in plan_name or '주니어' in plan_name:
-            tags.append('청소년/키즈')
-        if '시니어' in plan_name:
-            tags.append('시니어')
-
-        if df.loc[index, 'data_type'] == '무제한':
-            tags.append('데이터무제한')
-        elif df.loc[index, 'data_gb'] >= 100:
-            tags.append('데이터많이')
-
-        if row['monthly_price'] <= 40000:
-            tags.append('알뜰/가성비')
-
-        df.loc[index, 'tags'] = ','.join(tags)
-
+    # 1~3. data_summary 컬럼을 분석하여 정보 추출 + 태그 생성
     # 4. 원본 data_summary 컬럼은 삭제하고 필요한 컬럼만 선택
-    df_refined = df[
-        ['plan_name', 'monthly_price', 'data_gb', 'data_type', 'data_speed_limit', 'sharing_data', 'voice_call', 'sms',
-         'tags']]
+    df_refined = refine_frame(df, workers=workers)
 
     # 5. 정제된 데이터를 새로운 CSV 파일로 저장
     df_refined.to_csv(output_file, index=False, encoding='utf-8-sig')
@@ -107,4 +136,4 @@ def refine_plan_data(input_file='lgu_all_plans_final.csv', output_file='lgu_plan
 
 # --- 메인 코드 실행 ---
 if __name__ == "__main__":
-    refine_plan_data()
\ No newline at end of file
+    refine_plan_data(workers=int(os.getenv("REFINE_WORKERS", "0")) or None)
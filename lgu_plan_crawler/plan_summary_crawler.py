@@ -1,105 +1,238 @@
 # LG U+ 모바일 요금제 요약 크롤러
-import time
+#  - crawl(): 페이지 로드 → '더보기' 반복 클릭 → HTML 캡처 → 카드 파싱 → DataFrame
+#  - 고정 sleep 대신 조건 대기(WebDriverWait): 카드 수가 늘거나 버튼이 사라질 때까지
+#  - 파서: lxml.html + XPath (없으면 BeautifulSoup html.parser)
+#  - 카드 수가 많으면 프로세스 풀로 나눠 파싱
+#  - 저장한 HTML(--html)로 브라우저 없이 파싱만 재실행 가능 (benchmarks/bench_crawler_parse.py)
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 
-# 최종적으로 크롤링한 데이터를 저장할 리스트
-plan_data_list = []
+URL = "https://www.lguplus.com/mobile/plan/mplan/plan-all"
+LOAD_MORE_SELECTOR = "button.btn-more"
+CARD_SELECTOR = "ul.plan-list > li"
+OUTPUT_FILE = 'lgu_all_plans_final.csv'
 
-print("🚀 크롤링을 시작합니다...")
+# 이 카드 수 이상일 때만 프로세스 풀 사용 (작은 페이지는 직렬이 더 빠름)
+PARALLEL_MIN_CARDS = 5_000
 
 try:
-    # 1. Selenium 설정
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service)
-
-    URL = "https://www.lguplus.com/mobile/plan/mplan/plan-all"
-    driver.get(URL)
-    time.sleep(3)
-
-    # 2. '요금제 더보기' 버튼 클릭
-    print("📜 '요금제 더보기' 버튼을 클릭하여 모든 요금제를 로드합니다...")
+    import lxml.html
+    from lxml import etree
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# CARD_SELECTOR 및 카드 내부 선택자와 같은 XPath (lxml 사용 시)
+CARD_XPATH = f"//ul[{_has_class('plan-list')}]/li"
+NAME_XPATH = f".//button[{_has_class('btn-plan')}]"
+PRICE_XPATH = f".//div[{_has_class('plan-price')}]//strong"
+SUMMARY_XPATH = f".//p[{_has_class('plan-info')}] | .//dl[{_has_class('benefit-area')}]//dd"
+
+if PARSER == 'lxml':
+    # 카드마다 XPath 문자열을 다시 컴파일하지 않도록 미리 컴파일
+    _find_name, _find_price, _find_summary = (etree.XPath(x) for x in (NAME_XPATH, PRICE_XPATH, SUMMARY_XPATH))
+
+
+def _fields_lxml(card):
+    names = _find_name(card)
+    prices = _find_price(card)
+    return (names[0].text_content() if names else None,
+            prices[0].text_content() if prices else None,
+            [tag.text_content() for tag in _find_summary(card)])
+
+
+def _fields_bs4(card):
+    name_tag = card.select_one("button.btn-plan")
+    price_tag = card.select_one("div.plan-price strong")
+    return (name_tag.text if name_tag else None,
+            price_tag.text if price_tag else None,
+            [tag.text for tag in card.select("p.plan-info, dl.benefit-area dd")])
+
+
+def _find_cards(html):
+    """HTML → (카드 목록, 필드 추출 함수, 카드 → HTML 문자열 함수)"""
+    if PARSER == 'lxml':
+        cards = lxml.html.fromstring(html).xpath(CARD_XPATH)
+        return cards, _fields_lxml, lambda card: lxml.html.tostring(card, encoding='unicode', with_tail=False)
+    from bs4 import BeautifulSoup, SoupStrainer
+    # 요금제 목록(ul.plan-list)만 트리로 만듦
+    soup = BeautifulSoup(html, PARSER, parse_only=SoupStrainer('ul', class_='plan-list'))
+    return soup.select(CARD_SELECTOR), _fields_bs4, str
+
+
+def _parse_card(name, price_text, summaries):
+    """카드 하나의 추출 결과 → 요금제 dict. 필수 정보(이름, 가격)가 없으면 None"""
+    plan_name = name.strip() if name else None
+    price = int(price_text.strip().replace(',', '')) if price_text is not None else None
+    data_summary = ' / '.join(text.strip().replace('\n', ' ') for text in summaries)
+
+    if plan_name and price is not None:
+        return {
+            'plan_name': plan_name,
+            'monthly_price': price,
+            'data_summary': data_summary or "정보 없음",  # 데이터 정보가 없는 경우 대비
+        }
+    return None
+
+
+def _parse_cards(cards, fields, offset=0):
+    """카드 목록 파싱. 반환: (요금제 목록, 건너뛴 카드 번호 목록[(번호, 사유)])"""
+    plans, skipped = [], []
+    for i, card in enumerate(cards, start=offset + 1):
+        try:
+            plan = _parse_card(*fields(card))
+        except Exception as e:
+            skipped.append((i, f"예상치 못한 오류: {e}"))
+            continue
+        if plan is None:
+            skipped.append((i, "필수 정보(이름 또는 가격) 없음"))
+        else:
+            plans.append(plan)
+    return plans, skipped
+
+
+def _parse_chunk(args):
+    # 워커: 카드 HTML 조각을 하나의 목록으로 묶어 한 번에 파싱
+    offset, card_htmls = args
+    cards, fields, _ = _find_cards('<ul class="plan-list">' + ''.join(card_htmls) + '</ul>')
+    return _parse_cards(cards, fields, offset)
+
+
+def parse_plans(html, workers=None):
+    """
+    요금제 전체 페이지 HTML → (요금제 dict 목록, 건너뛴 카드 목록)
+    workers > 1 이고 카드가 충분히 많으면 프로세스 풀로 나눠 파싱합니다.
+    """
+    cards, fields, to_html = _find_cards(html)
+    if not (workers and workers > 1 and len(cards) >= PARALLEL_MIN_CARDS):
+        return _parse_cards(cards, fields)
+
+    # 워커에는 트리 대신 카드 HTML 문자열을 보냄 (pickle 가능)
+    bounds = np.linspace(0, len(cards), workers + 1).astype(int)
+    chunks = [(a, [to_html(card) for card in cards[a:b]]) for a, b in zip(bounds[:-1], bounds[1:])]
+    plans, skipped = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part_plans, part_skipped in pool.map(_parse_chunk, chunks):
+            plans.extend(part_plans)
+            skipped.extend(part_skipped)
+    return plans, skipped
+
+
+def to_frame(plans):
+    if not plans:
+        return pd.DataFrame(columns=['plan_name', 'monthly_price', 'data_summary'])
+    return pd.DataFrame(plans).sort_values(by='monthly_price').reset_index(drop=True)
+
+
+def _new_driver(headless=True):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    # 이미지는 파싱에 필요 없으므로 로드하지 않음
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+
+def load_all_plans(driver, url=URL, timeout=10.0):
+    """페이지를 열고 '더보기' 버튼이 없어질 때까지 클릭한 뒤 최종 HTML을 반환합니다."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.get(url)
+    wait = WebDriverWait(driver, timeout, poll_frequency=0.1)
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, CARD_SELECTOR)))
+
+    def card_count(d):
+        return len(d.find_elements(By.CSS_SELECTOR, CARD_SELECTOR))
+
+    clicks = 0
     while True:
+        buttons = [b for b in driver.find_elements(By.CSS_SELECTOR, LOAD_MORE_SELECTOR) if b.is_displayed()]
+        if not buttons:
+            break
+        before = card_count(driver)
+        # 스크롤/클릭을 스크립트로 처리 → 버튼이 가려져도 클릭되고 스크롤 대기가 필요 없음
+        driver.execute_script("arguments[0].scrollIntoView(); arguments[0].click();", buttons[0])
+        clicks += 1
         try:
-            load_more_button = driver.find_element(By.CSS_SELECTOR, "button.btn-more")
-            driver.execute_script("arguments[0].scrollIntoView();", load_more_button)
-            time.sleep(0.5)
-            load_more_button.click()
-            print("... '더보기' 클릭")
-            time.sleep(1)
-        except Exception:
-            print("✅ '더보기' 버튼을 모두 클릭했거나, 더 이상 없습니다.")
+            # 카드가 추가되거나 버튼이 사라질 때까지만 대기
+            wait.until(lambda d: card_count(d) > before or not any(
+                b.is_displayed() for b in d.find_elements(By.CSS_SELECTOR, LOAD_MORE_SELECTOR)))
+        except TimeoutException:
+            print(f"⚠️ '더보기' 클릭 후 {timeout}초 동안 카드가 늘지 않아 중단합니다.")
             break
+    print(f"✅ '더보기' {clicks}회 클릭, 카드 {card_count(driver)}개 로드")
+    return driver.page_source
+
+
+def crawl(url=URL, headless=True, timeout=10.0, workers=None, html_dump=None):
+    """
+    요금제 페이지를 크롤링해 DataFrame(plan_name, monthly_price, data_summary)을 반환합니다.
+    html_dump: 캡처한 HTML을 저장할 경로 (파싱 재실행/벤치마크용)
+    """
+    print("🚀 크롤링을 시작합니다...")
+    driver = _new_driver(headless=headless)
+    try:
+        html = load_all_plans(driver, url=url, timeout=timeout)
+    finally:
+        driver.quit()
+        print("🚪 브라우저를 닫았습니다.")
 
-    # 3. 모든 정보가 로드된 최종 페이지의 HTML 소스를 가져옵니다.
-    print("📄 모든 요금제가 로드된 페이지의 HTML을 가져옵니다.")
-    html = driver.page_source
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # 4. BeautifulSoup으로 각 요금제 정보 파싱하기
-    plan_cards = soup.select("ul.plan-list > li")
-
-    print(f"📊 총 {len(plan_cards)}개의 요금제를 찾았습니다. 개별 정보 추출을 시작합니다.")
-
-    for i, card in enumerate(plan_cards):
-        plan_name, price, data_summary = None, None, None
-
-        try:
-            # ✅ [수정 완료] 이름, 가격, 데이터를 각각 추출하고 실패 시 None으로 처리
-
-            # 요금제 이름 찾기
-            name_tag = card.select_one("button.btn-plan")
-            if name_tag:
-                plan_name = name_tag.text.strip()
-
-            # 월정액 찾기
-            price_tag = card.select_one("div.plan-price strong")
-            if price_tag:
-                price_text = price_tag.text.strip()
-                price = int(price_text.replace(',', ''))
-
-            # 데이터 요약 정보 찾기
-            summary_tags = card.select("p.plan-info, dl.benefit-area dd")
-            if summary_tags:
-                summary_texts = [tag.text.strip().replace('\n', ' ') for tag in summary_tags]
-                data_summary = ' / '.join(summary_texts)
-
-            # 필수 정보인 이름과 가격이 모두 있을 때만 리스트에 추가
-            if plan_name and price is not None:
-                plan_info = {
-                    'plan_name': plan_name,
-                    'monthly_price': price,
-                    'data_summary': data_summary or "정보 없음",  # 데이터 정보가 없는 경우 대비
-                }
-                plan_data_list.append(plan_info)
-            else:
-                print(f"⚠️ {i + 1}번째 카드에서 필수 정보(이름 또는 가격)를 찾지 못해 건너뜁니다.")
+    if html_dump:
+        with open(html_dump, 'w', encoding='utf-8') as f:
+            f.write(html)
+    return parse_html(html, workers=workers)
 
-        except Exception as e:
-            # 예상치 못한 오류 발생 시 로그 출력
-            print(f"🚨 {i + 1}번째 카드 처리 중 예상치 못한 오류 발생: {e}")
-            continue
 
-finally:
-    # 5. 작업이 끝나면 브라우저를 닫습니다.
-    if 'driver' in locals() and driver:
-        driver.quit()
-        print("🚪 브라우저를 닫았습니다.")
+def parse_html(html, workers=None):
+    plans, skipped = parse_plans(html, workers=workers)
+    for i, reason in skipped:
+        print(f"⚠️ {i}번째 카드를 건너뜁니다: {reason}")
+    print(f"📊 총 {len(plans) + len(skipped)}개의 카드 중 {len(plans)}개의 요금제를 추출했습니다.")
+    return to_frame(plans)
 
-# 6. Pandas DataFrame으로 변환 후 CSV 파일로 저장
-if plan_data_list:
-    df = pd.DataFrame(plan_data_list)
-    df_sorted = df.sort_values(by='monthly_price').reset_index(drop=True)
 
-    file_name = 'lgu_all_plans_final.csv'
-    df_sorted.to_csv(file_name, index=False, encoding='utf-8-sig')
-    print(f"\n✅ 총 {len(df_sorted)}개의 요금제 정보를 '{file_name}' 파일로 성공적으로 저장했습니다.")
+def save(df, file_name=OUTPUT_FILE):
+    if df.empty:
+        print("\n❌ 크롤링된 데이터가 없습니다. 사이트 구조가 변경되었거나 선택자가 여전히 일치하지 않을 수 있습니다.")
+        return
+    df.to_csv(file_name, index=False, encoding='utf-8-sig')
+    print(f"\n✅ 총 {len(df)}개의 요금제 정보를 '{file_name}' 파일로 성공적으로 저장했습니다.")
     print("\n---------- 미리보기 ----------")
-    print(df_sorted.head())
+    print(df.head())
     print("--------------------------")
-else:
-    print("\n❌ 크롤링된 데이터가 없습니다. 사이트 구조가 변경되었거나 선택자가 여전히 일치하지 않을 수 있습니다.")
\ No newline at end of file
+
+
+# --- 메인 코드 실행 ---
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--html", help="브라우저 대신 저장된 HTML 파일을 파싱")
+    ap.add_argument("--dump-html", help="캡처한 HTML을 저장할 경로")
+    ap.add_argument("--output", default=OUTPUT_FILE)
+    ap.add_argument("--timeout", type=float, default=float(os.getenv("CRAWLER_TIMEOUT_SEC", "10")))
+    ap.add_argument("--workers", type=int, default=int(os.getenv("CRAWLER_WORKERS", "0")) or None)
+    ap.add_argument("--show-browser", action="store_true", help="headless 끄기")
+    args = ap.parse_args()
+
+    if args.html:
+        with open(args.html, encoding='utf-8') as f:
+            result = parse_html(f.read(), workers=args.workers)
+    else:
+        result = crawl(headless=not args.show_browser, timeout=args.timeout,
+                       workers=args.workers, html_dump=args.dump_html)
+    save(result, args.output)
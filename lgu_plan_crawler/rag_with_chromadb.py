@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
+#   실행: 레포 루트에서 python -m lgu_plan_crawler.rag_with_chromadb
 
 import pandas as pd
 import chromadb
 from openai import OpenAI
 import os
 import json
+import hashlib
+
+from langchain_openai import OpenAIEmbeddings
+from app.embedding_cache import CachedEmbeddings
 
 # --- 1. OpenAI API 키 및 ChromaDB 클라이언트 설정 ---
 try:
@@ -25,18 +30,35 @@ collection = persistent_client.get_or_create_collection(name=collection_name)
 print(f"✅ ChromaDB 클라이언트가 준비되었고, '{collection_name}' 컬렉션을 사용합니다.")
 
 EMBEDDING_MODEL = "text-embedding-3-small"
+# (모델, 텍스트) 단위 캐시: 반복 질문은 임베딩 API를 다시 호출하지 않음
+emb = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=client.api_key), model=EMBEDDING_MODEL)
+
+
+def plan_id(plan_name, seen):
+    """요금제명 기반의 안정적인 ID (행 순서가 바뀌어도 유지). 같은 이름이 또 나오면 순번을 붙임"""
+    base = "plan_" + hashlib.sha1(plan_name.encode('utf-8')).hexdigest()[:16]
+    seen[base] = seen.get(base, 0) + 1
+    return base if seen[base] == 1 else f"{base}_{seen[base]}"
+
+
+def content_hash(document, metadata):
+    """문서 + 메타데이터 내용 해시 (변경 감지용)"""
+    raw = document + json.dumps(metadata, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
 
+def public_metadata(metadata):
+    """호출자(LLM 프롬프트 등)에게 넘길 메타데이터 (내부용 content_hash 제외)"""
+    return {k: v for k, v in (metadata or {}).items() if k != 'content_hash'}
 
-def setup_database(csv_file='lgu_plans_refined.csv'):
+
+def setup_database(csv_file='lgu_plans_refined.csv', batch_size=100):
     """
-    정제된 CSV 데이터를 읽어와 ChromaDB에 저장(임베딩)합니다.
-    이미 데이터가 있다면 이 함수는 건너뛸 수 있습니다.
+    정제된 CSV 데이터를 ChromaDB와 동기화합니다. (변경분만 반영)
+    - 내용 해시가 같은 요금제는 건너뛰고, 신규/변경된 요금제만 batch_size개씩 임베딩
+    - CSV에서 사라진 요금제(및 예전 plan_{i} 형식 ID)는 삭제
     """
-    if collection.count() > 0:
-        print(f"ℹ️ 데이터베이스에 이미 {collection.count()}개의 요금제 정보가 있습니다. 셋업을 건너뜁니다.")
-        return
-
-    print(f"🚚 '{csv_file}'에서 데이터를 로드하여 데이터베이스 셋업을 시작합니다.")
+    print(f"🚚 '{csv_file}'에서 데이터를 로드하여 데이터베이스 동기화를 시작합니다.")
     df = pd.read_csv(csv_file)
     df = df.astype(str)  # 모든 데이터를 문자열로 변환 (메타데이터 저장용)
 
@@ -47,26 +69,48 @@ def setup_database(csv_file='lgu_plans_refined.csv'):
         axis=1
     ).tolist()
 
-    # 검색 결과와 함께 반환될 메타데이터 생성
+    # 검색 결과와 함께 반환될 메타데이터 생성 (+ 변경 감지용 content_hash)
     metadatas = df.to_dict('records')
+    for doc, meta in zip(documents, metadatas):
+        meta['content_hash'] = content_hash(doc, meta)
 
     # 각 요금제를 구분할 고유 ID 생성
-    ids = [f"plan_{i}" for i in range(len(df))]
-
-    print(f"🧠 OpenAI '{EMBEDDING_MODEL}' 모델로 임베딩 및 DB 저장을 시작합니다...")
-
-    # OpenAI 임베딩 생성
-    response = client.embeddings.create(input=documents, model=EMBEDDING_MODEL)
-    embeddings = [item.embedding for item in response.data]
-
-    # ChromaDB에 데이터 추가!
-    collection.add(
-        embeddings=embeddings,
-        documents=documents,
-        metadatas=metadatas,
-        ids=ids
-    )
-    print(f"✅ 총 {len(ids)}개의 요금제 정보를 ChromaDB에 성공적으로 저장했습니다.")
+    seen = {}
+    ids = [plan_id(name, seen) for name in df['plan_name']]
+
+    # 저장된 문서의 해시와 비교
+    stored = collection.get(include=['metadatas'])
+    stored_hash = {i: (m or {}).get('content_hash') for i, m in zip(stored['ids'], stored['metadatas'])}
+    changed = [i for i, pid in enumerate(ids) if stored_hash.get(pid) != metadatas[i]['content_hash']]
+    current = set(ids)
+    vanished = [pid for pid in stored_hash if pid not in current]
+
+    if vanished:
+        collection.delete(ids=vanished)
+
+    if changed:
+        print(f"🧠 OpenAI '{EMBEDDING_MODEL}' 모델로 {len(changed)}개 요금제 임베딩 및 DB 저장을 시작합니다...")
+    for start in range(0, len(changed), batch_size):
+        part = changed[start:start + batch_size]
+        # OpenAI 임베딩 생성 (배치 단위)
+        embeddings = emb.embed_documents([documents[i] for i in part])
+        # ChromaDB에 데이터 추가/갱신
+        collection.upsert(
+            embeddings=embeddings,
+            documents=[documents[i] for i in part],
+            metadatas=[metadatas[i] for i in part],
+            ids=[ids[i] for i in part]
+        )
+
+    summary = {
+        'added': sum(1 for i in changed if ids[i] not in stored_hash),
+        'updated': sum(1 for i in changed if ids[i] in stored_hash),
+        'deleted': len(vanished),
+        'unchanged': len(ids) - len(changed),
+    }
+    print(f"✅ 동기화 완료: 추가 {summary['added']}, 변경 {summary['updated']}, "
+          f"삭제 {summary['deleted']}, 유지 {summary['unchanged']} (총 {collection.count()}개)")
+    return summary
 
 
 def search_plans_in_db(query, top_k=3):
@@ -76,7 +120,7 @@ def search_plans_in_db(query, top_k=3):
     print(f"\n🔍 ChromaDB에서 '{query}'와(과) 가장 유사한 요금제를 검색합니다...")
 
     # 사용자 질문을 OpenAI 모델로 임베딩
-    query_embedding = client.embeddings.create(input=[query], model=EMBEDDING_MODEL).data[0].embedding
+    query_embedding = emb.embed_query(query)
 
     # ChromaDB에 쿼리 실행
     results = collection.query(
@@ -98,12 +142,12 @@ def search_plans_in_db(query, top_k=3):
         print(f"  - 태그: {metadata['tags']}")
         print("-" * 20)
 
-    return results['metadatas'][0]
+    return [public_metadata(m) for m in results['metadatas'][0]]
 
 
 # --- 메인 코드 실행 ---
 if __name__ == "__main__":
-    # 1. 데이터베이스 셋업 (최초 1회 또는 데이터 변경 시 실행)
+    # 1. 데이터베이스 동기화 (변경된 요금제만 임베딩)
     setup_database()
 
     # 2. 검색 테스트